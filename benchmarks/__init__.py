@@ -0,0 +1,5 @@
+"""Benchmarks for the performance sensitive parts of Watch Do.
+
+Each module can be run on its own, i.e. ``python3 -m benchmarks.glob_walk``,
+and prints a table of its results.
+"""
@@ -0,0 +1,47 @@
+"""Compare the time taken to run a command with the :class:`.Shell` and
+:class:`.Exec` doers.
+
+The number of runs can be passed as an argument, i.e.
+``python3 -m benchmarks.doer_spawn 500``.
+"""
+
+import sys
+import time
+
+from watch_do.doers import Shell
+from watch_do.doers import Exec
+
+
+def time_per_run(doer, runs):
+    """Measure the average time taken to run a doer.
+
+    Parameters:
+        doer (:class:`.Doer`): The doer to run.
+        runs (int): The number of times to run the doer.
+
+    Returns:
+        float: The average time (in milliseconds) taken by each run.
+    """
+    start_time = time.perf_counter()
+    for _ in range(runs):
+        for _ in doer.run('file name.txt'):
+            pass
+
+    return (time.perf_counter() - start_time) / runs * 1000
+
+
+def main():
+    """Run the benchmark and print the results.
+    """
+    runs = int(sys.argv[1] if len(sys.argv) > 1 else 200)
+
+    print('Running `env true %f` {} times\n'.format(runs))
+    print('{:>6}  {:>12}'.format('Doer', 'ms per run'))
+    for doer_class in [Shell, Exec]:
+        print('{:>6}  {:>12.2f}'.format(
+            doer_class.__name__,
+            time_per_run(doer_class('env true %f'), runs)))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,123 @@
+"""Compare the time taken to expand a number of overlapping globs.
+
+The previous implementation walked the tree once per glob using
+:meth:`pathlib.Path.glob`, the :class:`.GlobManager` walks it once using a
+single compiled matcher.
+"""
+
+import os
+import time
+import tempfile
+from pathlib import Path
+
+from watch_do import GlobManager
+
+
+EXTENSIONS = ['py', 'pyx', 'pyi', 'c', 'h', 'txt', 'md', 'json']
+
+
+def create_tree(directory, breadth=10, depth=3, files_per_directory=12):
+    """Create a synthetic directory tree to expand the globs in.
+
+    Parameters:
+        directory (str): The directory to create the tree inside of.
+        breadth (int): The number of sub-directories in each directory.
+        depth (int): The number of levels of sub-directories.
+        files_per_directory (int): The number of files in each directory.
+
+    Returns:
+        int: The number of files that were created.
+    """
+    created = 0
+    directories = [os.path.join(directory, 'src')]
+    for _ in range(depth):
+        directories = [os.path.join(parent, 'dir{}'.format(index))
+                       for parent in directories for index in range(breadth)]
+
+    for leaf in directories:
+        os.makedirs(leaf, exist_ok=True)
+
+    for root, _, _ in os.walk(directory):
+        for index in range(files_per_directory):
+            extension = EXTENSIONS[index % len(EXTENSIONS)]
+            file_name = os.path.join(
+                root, 'file{}.{}'.format(index, extension))
+            with open(file_name, 'w'):
+                created += 1
+
+    # Age the directories, so they aren't considered to be racy
+    for root, _, _ in os.walk(directory):
+        os.utime(root, (0, 0))
+
+    return created
+
+
+def pathlib_glob(globs):
+    """Expand the globs one at a time, as the original implementation did.
+
+    Parameters:
+        globs (list): The globs to expand.
+
+    Returns:
+        set: The matching files.
+    """
+    files = set()
+    for glob_pattern in globs:
+        for item in Path().glob(glob_pattern):
+            if item.is_file():
+                files.add(item.as_posix())
+
+    return files
+
+
+def best_of(function, repeat=3):
+    """Time a function, returning the fastest of a number of runs.
+
+    Parameters:
+        function (callable): The function to time.
+        repeat (int): The number of times to run the function.
+
+    Returns:
+        float: The fastest run time (in seconds).
+    """
+    times = []
+    for _ in range(repeat):
+        start_time = time.perf_counter()
+        function()
+        times.append(time.perf_counter() - start_time)
+
+    return min(times)
+
+
+def main():
+    """Run the benchmark and print the results.
+    """
+    with tempfile.TemporaryDirectory() as directory:
+        number_of_files = create_tree(directory)
+
+        cwd = os.getcwd()
+        os.chdir(directory)
+        try:
+            print('Expanding N overlapping globs over {} files\n'.format(
+                number_of_files))
+            print('{:>3}  {:>12}  {:>12}  {:>12}'.format(
+                'N', 'pathlib (s)', 'walk (s)', 'reglob (s)'))
+
+            for count in [1, 2, 4, 8]:
+                globs = ['src/**/*.' + extension
+                         for extension in EXTENSIONS[:count]]
+
+                manager = GlobManager(globs)
+                assert manager.get_files() == pathlib_glob(globs)
+
+                print('{:>3}  {:>12.4f}  {:>12.4f}  {:>12.4f}'.format(
+                    count,
+                    best_of(lambda: pathlib_glob(globs)),
+                    best_of(lambda: GlobManager(globs).get_files()),
+                    best_of(manager.get_changes)))
+        finally:
+            os.chdir(cwd)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,87 @@
+"""Compare the throughput of the hashing engine against the original MD5
+implementation, which read files in 4096 byte chunks.
+
+The size of the file (in MiB) can be passed as an argument, i.e.
+``python3 -m benchmarks.hashing 512``.
+"""
+
+import os
+import sys
+import time
+import hashlib
+import tempfile
+
+from watch_do import Hasher
+
+
+def original_md5(file_name):
+    """Hash a file as the original MD5 watcher did.
+
+    Parameters:
+        file_name (str): The file to hash.
+
+    Returns:
+        str: The MD5 hash of the file.
+    """
+    md5_hash = hashlib.md5()
+
+    with open(file_name, 'rb') as file_handle:
+        chunk = file_handle.read(4096)
+        while chunk:
+            md5_hash.update(chunk)
+            chunk = file_handle.read(4096)
+
+    return md5_hash.hexdigest()
+
+
+def throughput(function, file_name, size, repeat=3):
+    """Measure the throughput of a hashing function.
+
+    Parameters:
+        function (callable): The function to hash the file with.
+        file_name (str): The file to hash.
+        size (int): The size of the file in bytes.
+        repeat (int): The number of times to hash the file.
+
+    Returns:
+        float: The best throughput in MiB per second.
+    """
+    best = None
+    for _ in range(repeat):
+        start_time = time.perf_counter()
+        function(file_name)
+        duration = time.perf_counter() - start_time
+        best = duration if best is None else min(best, duration)
+
+    return size / best / (1024 * 1024)
+
+
+def main():
+    """Run the benchmark and print the results.
+    """
+    size = int(sys.argv[1] if len(sys.argv) > 1 else 128) * 1024 * 1024
+
+    with tempfile.NamedTemporaryFile() as temporary_file:
+        chunk = os.urandom(1024 * 1024)
+        for _ in range(size // len(chunk)):
+            temporary_file.write(chunk)
+        temporary_file.flush()
+
+        file_name = temporary_file.name
+
+        print('Hashing a {} MiB file (warm page cache)\n'.format(
+            size // (1024 * 1024)))
+        print('{:>10}  {:>8}  {:>12}'.format('Algorithm', 'Method', 'MiB/s'))
+        print('{:>10}  {:>8}  {:>12.0f}'.format(
+            'md5', '4 KiB', throughput(original_md5, file_name, size)))
+
+        for algorithm in ['md5', 'sha1', 'blake2b', 'crc32']:
+            for method, threshold in [('readinto', size + 1), ('mmap', 0)]:
+                hasher = Hasher(algorithm, mmap_threshold=threshold)
+                print('{:>10}  {:>8}  {:>12.0f}'.format(
+                    algorithm, method,
+                    throughput(hasher.hash_file, file_name, size)))
+
+
+if __name__ == '__main__':
+    main()
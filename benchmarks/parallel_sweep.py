@@ -0,0 +1,52 @@
+"""Compare the time taken to check a synthetic tree of files for changes
+using different numbers of worker threads.
+
+The benefit of more workers depends on how long each check blocks for; on a
+local disk with a warm cache there is little to gain, on network file systems
+each ``os.stat`` is a round trip and the checks overlap. Pass a directory to
+run the benchmark on another file system, i.e.
+``python3 -m benchmarks.parallel_sweep /mnt/nfs/scratch``.
+"""
+
+import os
+import sys
+import tempfile
+
+from watch_do import GlobManager
+from watch_do import WatcherManager
+from watch_do.watchers import MD5
+from watch_do.watchers import ModificationTime
+
+from benchmarks.glob_walk import best_of
+from benchmarks.glob_walk import create_tree
+
+
+def main():
+    """Run the benchmark and print the results.
+    """
+    parent = sys.argv[1] if len(sys.argv) > 1 else None
+    with tempfile.TemporaryDirectory(dir=parent) as directory:
+        number_of_files = create_tree(directory, files_per_directory=20)
+
+        cwd = os.getcwd()
+        os.chdir(directory)
+        try:
+            print('Checking {} files for changes\n'.format(number_of_files))
+            print('{:>16}  {:>7}  {:>12}'.format(
+                'Watcher', 'Workers', 'Sweep (s)'))
+
+            for watcher in [ModificationTime, MD5]:
+                for workers in [1, 4, 16]:
+                    manager = WatcherManager(
+                        watcher, GlobManager(['**/*']), False, False, workers)
+                    manager.get_changed_files()
+
+                    print('{:>16}  {:>7}  {:>12.4f}'.format(
+                        watcher.__name__, workers,
+                        best_of(manager.get_changed_files)))
+        finally:
+            os.chdir(cwd)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,123 @@
+"""Measure the memory used to store the state of each watched file.
+
+The state is stored as objects without ``__slots__`` (as the watchers
+originally were), as :class:`.ModificationTime` objects and in a
+:class:`.WatcherTable`. The file names are shared with the
+:class:`.GlobManager`, so they're created before measuring and aren't
+counted.
+
+The numbers of files can be passed as arguments, i.e.
+``python3 -m benchmarks.watcher_memory 10000 100000``.
+"""
+
+import sys
+import time
+import tracemalloc
+
+from watch_do import WatcherTable
+from watch_do.watchers import ModificationTime
+
+
+# pylint: disable=too-few-public-methods
+class OriginalWatcher:
+    """A watcher with the attributes of the original, without ``__slots__``.
+    """
+
+    def __init__(self, file_name):
+        """Initialise the watcher.
+
+        Parameters:
+            file_name (str): The file being watched.
+        """
+        self._file_name = file_name
+        self._last_value = None
+        self._first_call_to_has_changed = True
+
+
+def store_objects(watcher_class, file_names, mtimes):
+    """Store the state of the files as watcher objects.
+
+    Parameters:
+        watcher_class (class): The class of the watchers.
+        file_names (list): The names of the files.
+        mtimes (list): The modification time of each file.
+
+    Returns:
+        dict: The watchers, by file name.
+    """
+    watchers = {}
+    for file_name, mtime in zip(file_names, mtimes):
+        watcher = watcher_class(file_name)
+        watcher._last_value = str(mtime)
+        watcher._first_call_to_has_changed = False
+        watchers[file_name] = watcher
+
+    return watchers
+
+
+def store_table(file_names, mtimes):
+    """Store the state of the files in a table.
+
+    Parameters:
+        file_names (list): The names of the files.
+        mtimes (list): The modification time of each file.
+
+    Returns:
+        :class:`.WatcherTable`: The table.
+    """
+    table = WatcherTable(ModificationTime.stat_fields)
+    for file_name, mtime in zip(file_names, mtimes):
+        table.add(file_name)
+        table.restore(file_name, (mtime,))
+
+    return table
+
+
+def bytes_per_file(function, *args):
+    """Measure the memory allocated by a function that stores the state.
+
+    Parameters:
+        function (callable): The function storing the state.
+        *args: The arguments to pass to the function.
+
+    Returns:
+        float: The number of bytes allocated per file.
+    """
+    tracemalloc.start()
+    try:
+        stored = function(*args)
+        size, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    del stored
+    return size / len(args[-1])
+
+
+def main():
+    """Run the benchmark and print the results.
+    """
+    counts = [int(count) for count in sys.argv[1:]] or [
+        10000, 100000, 1000000]
+
+    print('Bytes per watched file (excluding the file name)\n')
+    print('{:>10}  {:>10}  {:>10}  {:>10}'.format(
+        'Files', 'Original', 'Slots', 'Table'))
+
+    for count in counts:
+        file_names = ['src/module_{}/file_{}.py'.format(index // 100, index)
+                      for index in range(count)]
+        now = time.time()
+        mtimes = [now - index for index in range(count)]
+
+        print('{:>10}  {:>10.0f}  {:>10.0f}  {:>10.0f}'.format(
+            count,
+            bytes_per_file(store_objects, OriginalWatcher, file_names,
+                           mtimes),
+            bytes_per_file(store_objects, ModificationTime, file_names,
+                           mtimes),
+            bytes_per_file(store_table, file_names, mtimes)))
+
+
+if __name__ == '__main__':
+    main()
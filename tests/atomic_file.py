@@ -0,0 +1,57 @@
+"""Test the `atomic_write` function.
+"""
+
+import os
+import tempfile
+from unittest import TestCase
+
+from watch_do.atomic_file import atomic_write
+
+
+class TestAtomicWrite(TestCase):
+    """Test the `atomic_write` function.
+    """
+
+    def setUp(self):
+        """Create a temporary directory to write the files in.
+        """
+        self.temporary_directory = tempfile.TemporaryDirectory()
+        self.file_name = os.path.join(
+            self.temporary_directory.name, 'cache', 'file')
+
+    def tearDown(self):
+        """Clear up the temporary directory.
+        """
+        self.temporary_directory.cleanup()
+
+    def test_write(self):
+        """Check that the file is replaced, creating its directory.
+        """
+        with atomic_write(self.file_name) as handle:
+            handle.write('first')
+
+        with atomic_write(self.file_name, 'wb') as handle:
+            handle.write(b'second')
+
+        with open(self.file_name, encoding='UTF-8') as handle:
+            self.assertEqual(handle.read(), 'second')
+
+        self.assertEqual(os.listdir(os.path.dirname(self.file_name)),
+                         ['file'])
+
+    def test_failure(self):
+        """Check that the file is left untouched if writing it fails.
+        """
+        with atomic_write(self.file_name) as handle:
+            handle.write('first')
+
+        with self.assertRaises(ValueError):
+            with atomic_write(self.file_name) as handle:
+                handle.write('second')
+                raise ValueError()
+
+        with open(self.file_name, encoding='UTF-8') as handle:
+            self.assertEqual(handle.read(), 'first')
+
+        self.assertEqual(os.listdir(os.path.dirname(self.file_name)),
+                         ['file'])
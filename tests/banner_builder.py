@@ -59,3 +59,14 @@ class TestBannerBuilder(TestCase):
             '\n\nDoers triggered at {} from: '
             'file_a, file_b and file_e\n'
             'Ran doers in 5.13 seconds.'.format(hms))
+
+        # The time taken for each job is listed when given
+        self.assertEqual(
+            BannerBuilder.build_footer(trigger_time, changed_files, doer_time,
+                                       files_set, MD5,
+                                       [('file_a', 1), ('file_b', 2.345)]),
+            '\n\nDoers triggered at {} from: '
+            'file_a, file_b and file_e\n'
+            'Ran doers in 5.13 seconds.\n'
+            '  file_a: 1.00 seconds\n'
+            '  file_b: 2.35 seconds'.format(hms))
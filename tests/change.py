@@ -0,0 +1,56 @@
+"""Test the `Change` class.
+"""
+
+import pickle
+from unittest import TestCase
+
+from watch_do import Change
+from watch_do.change import get_type
+from watch_do.change import merge_changes
+
+
+class TestChange(TestCase):
+    """Test the `Change` class.
+    """
+
+    def test__new__(self):
+        """Check that a change is the file name, with its type attached.
+        """
+        change = Change('b.py', 'renamed', 'a.py')
+        self.assertEqual(change, 'b.py')
+        self.assertEqual(change.file_name, 'b.py')
+        self.assertEqual(change.type, 'renamed')
+        self.assertEqual(change.old_file_name, 'a.py')
+        self.assertEqual(repr(change), "Change('b.py', 'renamed', 'a.py')")
+        self.assertEqual(repr(Change('a.py')), "Change('a.py', 'modified')")
+
+        self.assertEqual(pickle.loads(pickle.dumps(change)).old_file_name,
+                         'a.py')
+
+    def test_merge(self):
+        """Check that consecutive changes to a file are combined.
+        """
+        def merge(first, second):
+            return Change('a.py', first).merge(Change('a.py', second)).type
+
+        self.assertEqual(merge('created', 'modified'), 'created')
+        self.assertEqual(merge('renamed', 'modified'), 'renamed')
+        self.assertEqual(merge('removed', 'created'), 'modified')
+        self.assertEqual(merge('modified', 'removed'), 'removed')
+        self.assertEqual(merge('created', 'removed'), 'removed')
+
+    def test_get_type(self):
+        """Check that plain file names are considered to have been modified.
+        """
+        self.assertEqual(get_type('a.py'), 'modified')
+        self.assertEqual(get_type(Change('a.py', 'created')), 'created')
+
+    def test_merge_changes(self):
+        """Check that plain file names are replaced by the later change.
+        """
+        later = Change('a.py', 'removed')
+        self.assertIs(merge_changes('a.py', later), later)
+        self.assertEqual(merge_changes(Change('a.py', 'created'), 'a.py'),
+                         'a.py')
+        self.assertEqual(
+            merge_changes(Change('a.py', 'created'), later).type, 'removed')
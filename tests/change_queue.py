@@ -0,0 +1,80 @@
+"""Test the `ChangeQueue` class.
+"""
+
+import time
+import threading
+from unittest import TestCase
+
+from watch_do import ChangeQueue
+from watch_do import Change
+
+
+class TestChangeQueue(TestCase):
+    """Test the `ChangeQueue` class.
+    """
+
+    def setUp(self):
+        self.change_queue = ChangeQueue()
+
+    def test_put_and_get(self):
+        """Check that files are only queued once.
+        """
+        self.change_queue.put(set())
+        self.assertEqual(len(self.change_queue), 0)
+
+        self.change_queue.put({'dave.txt', 'bob.py'}, 10)
+        self.change_queue.put({'dave.txt'}, 20)
+        self.assertEqual(len(self.change_queue), 2)
+
+        self.assertEqual(self.change_queue.get(),
+                         ({'dave.txt', 'bob.py'}, 10))
+        self.assertEqual(self.change_queue.get(0), (set(), None))
+
+        before = time.time()
+        self.change_queue.put({'dave.txt'})
+        self.assertGreaterEqual(self.change_queue.get()[1], before)
+
+    def test_put_merges_changes(self):
+        """Check that changes to a queued file are combined.
+        """
+        self.change_queue.put({Change('dave.txt', 'created')})
+        self.change_queue.put({Change('dave.txt', 'modified'),
+                               Change('bob.py', 'removed')})
+        self.change_queue.put({Change('bob.py', 'created')})
+
+        files = self.change_queue.get(0)[0]
+        self.assertEqual(files, {'dave.txt', 'bob.py'})
+        self.assertEqual({file_name: file_name.type for file_name in files},
+                         {'dave.txt': 'created', 'bob.py': 'modified'})
+
+    def test_get_blocks(self):
+        """Check that getting waits for files to be queued.
+        """
+        timer = threading.Timer(
+            0.05, self.change_queue.put, [{'dave.txt'}])
+        timer.start()
+        self.addCleanup(timer.join)
+
+        self.assertEqual(self.change_queue.get(5)[0], {'dave.txt'})
+
+    def test_close(self):
+        """Check that closing the queue raises the exception.
+        """
+        self.change_queue.put({'dave.txt'})
+        self.change_queue.close(ValueError('failed'))
+
+        self.assertEqual(self.change_queue.get()[0], {'dave.txt'})
+        with self.assertRaises(ValueError):
+            self.change_queue.get()
+
+    def test_wait(self):
+        """Check that waiting doesn't take the queued files.
+        """
+        self.assertFalse(self.change_queue.wait(0))
+
+        self.change_queue.put({'dave.txt'})
+        self.assertTrue(self.change_queue.wait(0))
+        self.assertEqual(self.change_queue.get(0)[0], {'dave.txt'})
+
+        self.change_queue.close(ValueError('failed'))
+        self.assertTrue(self.change_queue.wait(0))
@@ -2,10 +2,18 @@
 """
 
 from unittest import TestCase
+from unittest.mock import Mock
 from unittest.mock import patch
 
+from watch_do import EventWriter
+from watch_do import DoerManager
+from watch_do.doers import Shell
+from watch_do.renderer import CLEAR
 from watch_do.cli import get_subclasses_of
 from watch_do.cli import clear_screen
+from watch_do.cli import get_routes
+from watch_do.cli import get_cli_argument_parser
+from watch_do.cli import write_output_event
 
 
 # pylint: disable=too-few-public-methods
@@ -53,16 +61,77 @@ class TestCLI(TestCase):
             get_subclasses_of(TestBaseClass, FakePackage),
             {TestClassA, TestClassB})
 
-    # pylint: disable=no-self-use
     def test_clear_screen(self):
-        """Check that the correct clear screen command is sent for each OS.
+        """Check that terminals are cleared without starting a process.
         """
+        stream = Mock()
+        stream.isatty.return_value = True
         with patch('os.system') as os_system:
-            clear_screen()
-            os_system.assert_called_with('clear')
-            with patch('os.name', 'nt'):
-                clear_screen()
-                os_system.assert_called_with('cls')
+            clear_screen(stream)
+            os_system.assert_not_called()
+        stream.write.assert_called_once_with(CLEAR)
+
+        stream = Mock()
+        stream.isatty.return_value = False
+        clear_screen(stream)
+        stream.write.assert_not_called()
+
+    def test_get_routes(self):
+        """Check that commands are bound to the globs before them.
+        """
+        parser = get_cli_argument_parser(['modificationtime'], ['shell'])
+
+        args = parser.parse_args(
+            ['-w', '*.py', '-w', '*.css', '-d', 'pytest', '-d', 'sass'])
+        self.assertEqual(args.globs, ['*.py', '*.css'])
+        self.assertEqual(args.commands, ['pytest', 'sass'])
+        self.assertEqual(get_routes(args), [None, None])
+
+        args = parser.parse_args(
+            ['-d', 'echo', '-w', '*.py', '-w', '*.pyi', '-d', 'pytest',
+             '-d', 'mypy', '-w', '*.css', '-d', 'sass'])
+        self.assertEqual(args.globs, ['*.py', '*.pyi', '*.css'])
+        self.assertEqual(args.commands, ['echo', 'pytest', 'mypy', 'sass'])
+        self.assertEqual(get_routes(args), [
+            None, ['*.py', '*.pyi'], ['*.py', '*.pyi'], ['*.css']])
+
+    def test_change_types(self):
+        """Check that `--on` binds the types of change to the next command.
+        """
+        parser = get_cli_argument_parser(['modificationtime'], ['shell'])
+
+        args = parser.parse_args(
+            ['-w', '*.py', '-d', 'pytest', '--on', 'created, renamed', '-d',
+             'git add %f', '-d', 'echo', '--on', 'removed', '-d', 'rm'])
+        self.assertEqual(args.commands, ['pytest', 'git add %f', 'echo', 'rm'])
+        self.assertEqual(args.change_types, [
+            None, ['created', 'renamed'], None, ['removed']])
+
+        with patch('sys.stderr'), self.assertRaises(SystemExit):
+            parser.parse_args(['-w', '*.py', '--on', 'deleted', '-d', 'rm'])
+
+    def test_write_output_event(self):
+        """Check that the doers' output is written as events.
+        """
+        event_writer = Mock(spec=EventWriter)
+        doer_manager = DoerManager(['echo %f', 'exit 3'], Shell,
+                                   report_runs=True)
+
+        last_run = None
+        for output in doer_manager.run_doers('a.py'):
+            last_run = write_output_event(event_writer, output, last_run)
+
+        events = [(call[0][0], call[1])
+                  for call in event_writer.write.call_args_list]
+        self.assertEqual([event for event, _ in events], [
+            'doer_start', 'output', 'doer_finish', 'doer_start', 'output',
+            'doer_finish'])
+        self.assertEqual(events[0][1], {
+            'doer': 'shell', 'command': 'echo %f', 'files': ['a.py']})
+        self.assertEqual(events[1][1]['text'], 'a.py\n')
+        self.assertEqual(events[2][1]['returncode'], 0)
+        self.assertEqual(events[5][1]['returncode'], 3)
+        self.assertFalse(events[5][1]['cancelled'])
 
     def test_watch_do(self):
         """Check that the main cli method works as expected.
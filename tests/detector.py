@@ -0,0 +1,112 @@
+"""Test the `Detector` class.
+"""
+
+from unittest import TestCase
+from unittest.mock import Mock
+
+from watch_do import ChangeQueue
+from watch_do import Detector
+from watch_do import EventWriter
+
+
+class TestDetector(TestCase):
+    """Test the `Detector` class.
+    """
+
+    def setUp(self):
+        """Create a detector using a fake watcher manager.
+        """
+        self.watcher_manager = Mock()
+        self.watcher_manager.files = {'dave.txt', 'bob.py'}
+        self.watcher_manager.files_generation = 1
+        self.change_queue = ChangeQueue()
+        self.on_missing_file = Mock()
+
+        self.detector = Detector(self.watcher_manager, self.change_queue,
+                                 0.01, on_missing_file=self.on_missing_file)
+
+    def tearDown(self):
+        """Stop the detector.
+        """
+        self.detector.stop()
+        if self.detector.is_alive():
+            self.detector.join()
+
+    def test___init__(self):
+        """Check that the properties are stored.
+        """
+        self.assertIs(self.detector.watcher_manager, self.watcher_manager)
+        self.assertIs(self.detector.change_queue, self.change_queue)
+        self.assertEqual(self.detector.interval, 0.01)
+        self.assertTrue(self.detector.daemon)
+
+    def test_run(self):
+        """Check that changes are queued and missing files reported.
+        """
+        missing = FileNotFoundError()
+        self.watcher_manager.get_changed_files.side_effect = [
+            set(), {'dave.txt'}, missing, {'dave.txt', 'bob.py'}]
+        self.watcher_manager.watcher.wait.side_effect = (
+            lambda timeout: None)
+
+        self.detector.start()
+        self.assertTrue(self.detector.wait_until_ready(5))
+
+        files = set()
+        while files != {'dave.txt', 'bob.py'}:
+            files |= self.change_queue.get(5)[0]
+
+        self.on_missing_file.assert_called_once_with(missing)
+        self.assertEqual(self.detector.files, {'dave.txt', 'bob.py'})
+
+        # Running out of side effects raises StopIteration, which closes the
+        # queue
+        with self.assertRaises(StopIteration):
+            self.change_queue.get(5)
+
+    def test_run_writes_events(self):
+        """Check that each check is written as events.
+        """
+        event_writer = Mock(spec=EventWriter)
+        self.watcher_manager.get_changed_files.side_effect = [{'dave.txt'}]
+        detector = Detector(self.watcher_manager, self.change_queue, 0.01,
+                            event_writer=event_writer)
+
+        detector.run()
+
+        self.assertEqual(self.change_queue.get(0)[0], {'dave.txt'})
+        self.assertEqual(
+            [call[0][0] for call in event_writer.write.call_args_list],
+            ['scan_start', 'scan_finish', 'scan_start', 'scan_finish'])
+        self.assertEqual(
+            event_writer.write.call_args_list[1][1]['changed'], 1)
+
+    def test_files(self):
+        """Check that the snapshot of the files is only taken again when files
+        have been added or removed.
+        """
+        self.watcher_manager.get_changed_files.return_value = set()
+
+        self.detector._check()
+        files = self.detector.files
+        self.assertEqual(files, {'dave.txt', 'bob.py'})
+
+        self.watcher_manager.files = {'dave.txt'}
+        self.detector._check()
+        self.assertIs(self.detector.files, files)
+
+        self.watcher_manager.files_generation = 2
+        self.detector._check()
+        self.assertEqual(self.detector.files, {'dave.txt'})
+
+    def test_save_state(self):
+        """Check that the state is only saved once the queued changes have
+        been taken.
+        """
+        self.change_queue.put({'dave.txt'})
+        self.assertFalse(self.detector.save_state())
+        self.watcher_manager.save_state.assert_not_called()
+
+        self.change_queue.get()
+        self.assertTrue(self.detector.save_state())
+        self.watcher_manager.save_state.assert_called_once_with()
@@ -1,10 +1,17 @@
 """Test the doer manager class.
 """
 
+import os
+import tempfile
 from unittest import TestCase
 
 from watch_do.doers import Shell
+from watch_do.doers.doer import Failure
 from watch_do import DoerManager
+from watch_do import DoerPool
+from watch_do import ResultCache
+from watch_do import Change
+from watch_do.doer_manager import DoerRun
 from watch_do.exceptions import UnknownDoer
 
 
@@ -51,3 +58,132 @@ class TestDoerManager(TestCase):
                 'Command failed to run, exited with error code 1',
                 'Bye\n'
             ])
+
+    def test_stages(self):
+        """Check that the doers are grouped into batch and per file stages.
+        """
+        doer_manager = DoerManager(
+            ['echo "%f a"', 'echo "%f b"', 'echo %F', 'echo "%f c"'], Shell)
+        self.assertEqual(
+            [(is_batch, len(doers))
+             for is_batch, doers in doer_manager.stages],
+            [(False, 2), (True, 1), (False, 1)])
+
+        pool = DoerPool(doer_manager)
+        self.assertEqual(list(pool.run(['x', 'y'])), [
+            'x a\n', 'x b\n', 'y a\n', 'y b\n', 'x y\n', 'x c\n', 'y c\n'])
+
+        self.assertEqual(list(pool.run(['x'], ['x', 'y'])), [
+            'x a\n', 'x b\n', 'x y\n', 'x c\n'])
+
+    def test_run_doer(self):
+        """Check that doers are skipped for the contents they last succeeded
+        for.
+        """
+        with tempfile.TemporaryDirectory() as directory:
+            file_name = os.path.join(directory, 'file')
+
+            def write(contents):
+                with open(file_name, 'w') as file_handle:
+                    file_handle.write(contents)
+
+            write('Hello')
+
+            log_name = os.path.join(directory, 'log')
+            doer_manager = DoerManager(
+                ['echo ran >> {}; test -s %f'.format(log_name)], Shell,
+                ResultCache(replay=True))
+            doer = doer_manager.doers[0]
+
+            def runs():
+                with open(log_name) as file_handle:
+                    return len(file_handle.readlines())
+
+            self.assertEqual(list(doer_manager.run_doer(doer, file_name)), [])
+            self.assertEqual(list(doer_manager.run_doer(doer, file_name)), [])
+            self.assertEqual(runs(), 1)
+
+            # Changing to new contents and back runs the doer again
+            write('Bye')
+            list(doer_manager.run_doer(doer, file_name))
+            self.assertEqual(runs(), 2)
+            write('Hello')
+            list(doer_manager.run_doers(file_name))
+            list(doer_manager.run_doers(file_name))
+            self.assertEqual(runs(), 3)
+
+            # Failed runs aren't stored, and forget the previous result
+            write('')
+            for _ in range(2):
+                output = list(doer_manager.run_doer(doer, file_name))
+                self.assertIsInstance(output[0], Failure)
+            self.assertEqual(runs(), 5)
+            write('Hello')
+            list(doer_manager.run_doer(doer, file_name))
+            self.assertEqual(runs(), 6)
+
+            # Missing files are always run
+            list(doer_manager.run_doer(doer, log_name + '.missing'))
+            self.assertEqual(runs(), 7)
+
+    def test_routes(self):
+        """Check that doers are only run for the files matching their globs.
+        """
+        doer_manager = DoerManager(
+            ['echo "py %f"', 'echo "any %f"', 'echo "css" %F'], Shell,
+            routes=[['**/*.py'], None, ['*.css']])
+        self.assertEqual(doer_manager.routes, [['**/*.py'], None, ['*.css']])
+
+        doers = doer_manager.doers
+        self.assertEqual(len(doers), 3)
+        py_doer, any_doer, css_doer = doers[0], doers[1], doers[2]
+        self.assertTrue(doer_manager.matches(py_doer, 'src/a.py'))
+        self.assertFalse(doer_manager.matches(py_doer, 'a.css'))
+        self.assertTrue(doer_manager.matches(any_doer, 'a.css'))
+        self.assertTrue(doer_manager.matches(css_doer, 'a.css'))
+        self.assertFalse(doer_manager.matches(css_doer, 'src/a.py'))
+
+        pool = DoerPool(doer_manager)
+        self.assertEqual(list(pool.run(['a.css', 'src/a.py'])), [
+            'any a.css\n', 'py src/a.py\n', 'any src/a.py\n', 'css a.css\n'])
+        self.assertEqual(list(pool.run(['a.py'])), [
+            'py a.py\n', 'any a.py\n'])
+
+        self.assertEqual(DoerManager(['a', 'b'], Shell).routes, [None, None])
+
+    def test_report_runs(self):
+        """Check that the start and end of each doer's run are marked.
+        """
+        doer_manager = DoerManager(['echo %f', 'exit 2', 'echo %F'], Shell,
+                                   report_runs=True)
+        self.assertTrue(doer_manager.report_runs)
+
+        output = list(DoerPool(doer_manager).run(['a.py']))
+        self.assertEqual(
+            [item for item in output if not isinstance(item, DoerRun)],
+            ['a.py\n', 'Command failed to run, exited with error code 2',
+             'a.py\n'])
+
+        runs = [item for item in output if isinstance(item, DoerRun)]
+        self.assertEqual([(run.doer, run.finished) for run in runs], [
+            (doer, finished) for doer in doer_manager.doers
+            for finished in (False, True)])
+        self.assertEqual([run.returncode for run in runs[1::2]], [0, 2, 0])
+        self.assertEqual(runs[1].file_names, ['a.py'])
+        self.assertGreaterEqual(runs[1].duration, 0)
+
+        self.assertFalse(DoerManager(['a'], Shell).report_runs)
+
+    def test_change_types(self):
+        """Check that doers are only run for their types of change.
+        """
+        doer_manager = DoerManager(
+            ['echo "any %f"', 'echo "removed %f"'], Shell,
+            change_types=[None, ['removed']])
+        self.assertEqual(doer_manager.change_types, [None, ['removed']])
+
+        pool = DoerPool(doer_manager)
+        self.assertEqual(list(pool.run(['a.py'])), ['any a.py\n'])
+        self.assertEqual(
+            list(pool.run([Change('a.py', 'removed')])),
+            ['any a.py\n', 'removed a.py\n'])
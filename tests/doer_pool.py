@@ -0,0 +1,96 @@
+"""Test the `DoerPool` class.
+"""
+
+import time
+import threading
+from unittest import TestCase
+
+from watch_do.doers import Shell
+from watch_do.doers.shell import set_new_session
+from watch_do import DoerManager
+from watch_do import DoerPool
+
+
+class TestDoerPool(TestCase):
+    """Test the `DoerPool` class.
+    """
+    def setUp(self):
+        # Later files finish first, so their output has to be held back
+        self.doer_manager = DoerManager(
+            ['echo "%f start"', 'sleep 0.%f', 'echo "%f end"'], Shell)
+
+    def test___init__(self):
+        """Check that the passed in parameters are stored.
+        """
+        pool = DoerPool(self.doer_manager, 4)
+        self.assertIs(pool.doer_manager, self.doer_manager)
+        self.assertEqual(pool.jobs, 4)
+        self.assertEqual(pool.timings, [])
+
+    def test_run(self):
+        """Check that the output of each job is kept together and in order.
+        """
+        pool = DoerPool(self.doer_manager, 3)
+
+        start_time = time.time()
+        output = list(pool.run(['3', '2', '1']))
+        duration = time.time() - start_time
+
+        self.assertEqual(output, [
+            '3 start\n', '3 end\n',
+            '2 start\n', '2 end\n',
+            '1 start\n', '1 end\n'])
+        self.assertLess(duration, 0.55)
+
+        self.assertEqual([file_name for file_name, _ in pool.timings],
+                         ['3', '2', '1'])
+        self.assertGreaterEqual(pool.timings[0][1], 0.3)
+
+    def test_run_single_job(self):
+        """Check that a single job runs the files one after another.
+        """
+        pool = DoerPool(self.doer_manager)
+
+        output = list(pool.run(['1', '2']))
+        self.assertEqual(output, [
+            '1 start\n', '1 end\n', '2 start\n', '2 end\n'])
+        self.assertEqual(len(pool.timings), 2)
+        self.assertIsNone(pool._executor)
+
+    def test_run_batch(self):
+        """Check that batch doers are run once, between the jobs.
+        """
+        doer_manager = DoerManager(
+            ['echo "%f start"', 'echo %F', 'echo "%f end"'], Shell)
+        pool = DoerPool(doer_manager, 2)
+
+        self.assertEqual(list(pool.run(['1', '2'], ['1', '2', '3'])), [
+            '1 start\n', '2 start\n', '1 2 3\n', '1 end\n', '2 end\n'])
+        self.assertEqual([file_name for file_name, _ in pool.timings],
+                         ['1', '2'])
+
+    def test_cancel(self):
+        """Check that cancelling a run stops the doers and skips the rest.
+        """
+        set_new_session(True)
+        self.addCleanup(set_new_session, False)
+
+        doer_manager = DoerManager(
+            ['echo "%f start"', 'sleep 10', 'echo "%f end"'], Shell)
+
+        for jobs in (1, 2):
+            pool = DoerPool(doer_manager, jobs)
+            timer = threading.Timer(0.2, pool.cancel, [1])
+            timer.start()
+            self.addCleanup(timer.join)
+
+            start_time = time.time()
+            output = list(pool.run(['1', '2']))
+
+            self.assertTrue(pool.cancelled)
+            self.assertNotIn('1 end\n', output)
+            self.assertLess(time.time() - start_time, 5)
+
+        # The doers are reset when the next run starts
+        self.assertEqual(list(DoerPool(doer_manager).run([])), [])
+        self.assertFalse(any(doer.cancelled for doer in doer_manager.doers))
@@ -43,3 +43,56 @@ class TestDoer(TestCase):
             Doer._interpolate_file_name(
                 'A %f B \\%f C %f D \\%f E', '/some/file'),
             'A /some/file B %f C /some/file D %f E')
+
+        # A leading token isn't treated as escaped
+        self.assertEqual(
+            Doer._interpolate_file_name('%f %F', 'a b'), "a b 'a b'")
+
+    def test__interpolate(self):
+        """Check that all of the file names get interpolated.
+        """
+        self.assertEqual(
+            Doer._interpolate('lint %F \\%F %f', ['a.py', "it's.py"]),
+            "lint a.py 'it'\"'\"'s.py' %F a.py")
+
+    def test_is_batch(self):
+        """Check that batch commands are recognised.
+        """
+        self.assertFalse(self.shell.is_batch)
+        self.assertFalse(FakeDoer('echo \\%F').is_batch)
+        self.assertTrue(FakeDoer('echo %F').is_batch)
+
+    def test_run_batch(self):
+        """Check that the doer is run for each file by default.
+        """
+        self.assertEqual(list(self.shell.run_batch(['a', 'b'])),
+                         ['H', 'e', 'l', 'l', 'o'] * 2)
+
+    def test__chunk_file_names(self):
+        """Check that the files are split to keep the command under the limit.
+        """
+        doer = FakeDoer('lint %F')
+        file_names = ['file_{}'.format(index) for index in range(10)]
+
+        self.assertEqual(list(doer._chunk_file_names(file_names)),
+                         [file_names])
+
+        # Each file adds 7 bytes to the 7 byte command
+        chunks = list(doer._chunk_file_names(file_names, 7 + 7 * 3))
+        self.assertEqual(chunks, [file_names[0:3], file_names[3:6],
+                                  file_names[6:9], file_names[9:]])
+
+        # Files that are too long on their own still get a chunk
+        self.assertEqual(list(doer._chunk_file_names(['a' * 20], 10)),
+                         [['a' * 20]])
+
+    def test_cancel(self):
+        """Check that cancelling is recorded until the doer is reset.
+        """
+        self.assertFalse(self.shell.cancelled)
+
+        self.shell.cancel()
+        self.assertTrue(self.shell.cancelled)
+
+        self.shell.reset()
+        self.assertFalse(self.shell.cancelled)
@@ -0,0 +1,72 @@
+"""Test the `Exec` doer class
+"""
+
+import os
+import sys
+import time
+import threading
+from unittest import TestCase, skipUnless
+from unittest.mock import patch
+
+from watch_do.doers import Exec
+from watch_do.exceptions import InvalidCommand
+
+
+class TestExec(TestCase):
+    """Test the `Exec` doer class
+    """
+
+    def test__init__(self):
+        """Check that the command is split and the program found.
+        """
+        doer = Exec('echo "Hello World" %f')
+        self.assertEqual(doer.arguments, ['echo', 'Hello World', '%f'])
+        self.assertTrue(doer.program.endswith('/echo'))
+
+        for command in ('', 'echo "unterminated', 'not-a-real-program %f'):
+            with self.assertRaises(InvalidCommand):
+                Exec(command)
+
+    def test_run(self):
+        """Check that the file name is passed as a single argument.
+        """
+        doer = Exec('printf "[%s]" %f --file=%f \'\\%f\'')
+        self.assertEqual(list(doer.run('my "file".py')),
+                         ['[my "file".py][--file=my "file".py][%f]'])
+
+        self.assertEqual(list(Exec('false').run('')),
+                         ['Command failed to run, exited with error code 1'])
+
+    @skipUnless(os.path.isdir('/proc/self/fd'), 'requires /proc')
+    def test_run_file_descriptors(self):
+        """Check that inheritable file descriptors aren't passed on.
+        """
+        read_descriptor, write_descriptor = os.pipe()
+        self.addCleanup(os.close, read_descriptor)
+        self.addCleanup(os.close, write_descriptor)
+        os.set_inheritable(write_descriptor, True)
+
+        output = ''.join(Exec('ls /proc/self/fd').run(''))
+        self.assertNotIn(str(write_descriptor), output.split())
+
+    def test_run_batch(self):
+        """Check that %F is replaced with an argument for each file.
+        """
+        doer = Exec('printf "[%s]" %F "all: %F"')
+        self.assertEqual(list(doer.run_batch(['a b', 'c'])),
+                         ['[a b][c][all: a b c]'])
+
+        with patch('watch_do.doers.doer._get_command_limit', return_value=22):
+            self.assertEqual(list(doer.run_batch(['a', 'b', 'c'])),
+                             ['[a][all: a]', '[b][all: b]', '[c][all: c]'])
+
+    def test_cancel(self):
+        """Check that cancelling stops the program.
+        """
+        doer = Exec('{} -c "import time; time.sleep(10)"'.format(
+            sys.executable))
+        threading.Timer(0.2, doer.cancel, [1]).start()
+
+        start_time = time.time()
+        self.assertEqual(list(doer.run('')), [])
+        self.assertLess(time.time() - start_time, 5)
@@ -0,0 +1,122 @@
+"""Test the `Python` doer class
+"""
+
+import os
+import sys
+import tempfile
+import subprocess
+from unittest import TestCase
+
+from watch_do.doers import Python
+from watch_do.exceptions import InvalidCommand
+
+
+# Creates a doer for a module in the working directory, run as a script from
+# another directory (like the installed console script) so that the working
+# directory isn't already on sys.path
+ENTRY_POINT = '''
+from watch_do.doers import Python
+for options in ('', '@thread', '@process'):
+    doer = Python('mychecks:check' + options)
+    print(''.join(doer.run('a.py')), end='')
+    doer.close()
+'''
+
+
+def greet(file_name):
+    """Print a greeting and return the file name.
+    """
+    print('Hello', file_name)
+    return file_name.upper()
+
+
+def count(file_names):
+    """Return the number of files and the current process ID.
+    """
+    return '{} {}'.format(len(file_names), os.getpid())
+
+
+def fail(file_name):
+    """Raise an exception.
+    """
+    print('Failing')
+    raise ValueError(file_name)
+
+
+class TestPython(TestCase):
+    """Test the `Python` doer class
+    """
+
+    def test__init__(self):
+        """Check that the function is imported and the options parsed.
+        """
+        doer = Python(__name__ + ':greet@thread,batch')
+        self.assertIs(doer.function, greet)
+        self.assertEqual(doer.options, {'thread', 'batch'})
+        self.assertTrue(doer.is_batch)
+        self.assertFalse(Python(__name__ + ':greet').is_batch)
+
+        for command in ('os.path', __name__ + ':missing', 'missing:greet',
+                        __name__ + ':greet@unknown', 'os:sep'):
+            with self.assertRaises(InvalidCommand):
+                Python(command)
+
+    def test_run(self):
+        """Check that the output and return value are yielded.
+        """
+        stdout = sys.stdout
+        for options in ('', '@thread', '@process'):
+            doer = Python(__name__ + ':greet' + options)
+            self.addCleanup(doer.close)
+
+            self.assertEqual(list(doer.run('a.py')),
+                             ['Hello a.py\n', 'A.PY\n'])
+            self.assertIs(sys.stdout, stdout)
+
+        doer = Python(__name__ + ':fail')
+        output = list(doer.run('a.py'))
+        self.assertEqual(output[0], 'Failing\n')
+        self.assertIn('ValueError: a.py', output[1])
+        self.assertEqual(output[2],
+                         'Command failed to run, raised an exception')
+
+        doer.cancel()
+        self.assertEqual(list(doer.run('a.py')), [])
+
+    def test_run_batch(self):
+        """Check that a batch function is called once for all of the files.
+        """
+        doer = Python(__name__ + ':count@batch,process')
+        self.addCleanup(doer.close)
+
+        output = list(doer.run_batch(['a.py', 'b.py']))
+        self.assertEqual(len(output), 1)
+        self.assertTrue(output[0].startswith('2 '))
+        self.assertNotEqual(output[0], '2 {}\n'.format(os.getpid()))
+
+        doer = Python(__name__ + ':greet')
+        self.assertEqual(list(doer.run_batch(['a', 'b'])),
+                         ['Hello a\n', 'A\n', 'Hello b\n', 'B\n'])
+
+    def test_import_from_working_directory(self):
+        """Check that modules are imported from the working directory.
+        """
+        with tempfile.TemporaryDirectory() as script_directory, \
+                tempfile.TemporaryDirectory() as working_directory:
+            script = os.path.join(script_directory, 'entry_point.py')
+            with open(script, 'w', encoding='UTF-8') as file_handle:
+                file_handle.write(ENTRY_POINT)
+
+            module = os.path.join(working_directory, 'mychecks.py')
+            with open(module, 'w', encoding='UTF-8') as file_handle:
+                file_handle.write('def check(file_name):\n'
+                                  '    return "checked " + file_name\n')
+
+            environment = dict(os.environ, PYTHONPATH=os.path.dirname(
+                os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+            process = subprocess.run(
+                [sys.executable, script], cwd=working_directory,
+                env=environment, stdout=subprocess.PIPE,
+                stderr=subprocess.STDOUT, encoding='UTF-8', check=False)
+
+        self.assertEqual(process.stdout, 'checked a.py\n' * 3)
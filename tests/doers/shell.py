@@ -1,10 +1,16 @@
 """Test the `Shell` doer class
 """
 
+import os
+import time
+import threading
 from unittest import TestCase
+from unittest.mock import patch
 from warnings import catch_warnings
 
 from watch_do.doers import Shell
+from watch_do.doers.doer import Failure
+from watch_do.doers.shell import set_new_session
 
 
 class TestShell(TestCase):
@@ -39,3 +45,83 @@ class TestShell(TestCase):
         self.assertEqual(
             list(shell.run('')),
             ['Hello', 'Command failed to run, exited with error code 1'])
+
+        # Commands killed by a signal have a negative exit code
+        shell = Shell('kill -TERM $$')
+        output = list(shell.run(''))
+        self.assertIsInstance(output[0], Failure)
+        self.assertEqual(output[0].returncode, -15)
+
+    def test_run_batch(self):
+        """Check that a batch command is run once per chunk of files.
+        """
+        shell = Shell('echo %F')
+        self.assertEqual(list(shell.run_batch(['a b', 'c'])), ["a b c\n"])
+
+        with patch('watch_do.doers.doer._get_command_limit', return_value=11):
+            self.assertEqual(list(shell.run_batch(['a', 'b', 'c'])),
+                             ['a b\n', 'c\n'])
+
+    def test_new_session(self):
+        """Check that commands only get their own session when asked to.
+        """
+        shell = Shell('ps -o sid= -p $$')
+        self.assertEqual(int(list(shell.run(''))[0]), os.getsid(0))
+
+        set_new_session(True)
+        self.addCleanup(set_new_session, False)
+        self.assertNotEqual(int(list(shell.run(''))[0]), os.getsid(0))
+
+    def test_cancel(self):
+        """Check that cancelling stops the running command's process group.
+        """
+        set_new_session(True)
+        self.addCleanup(set_new_session, False)
+
+        shell = Shell('echo "started"; sleep 10 & wait')
+        output = shell.run('')
+        self.assertEqual(next(output), 'started\n')
+
+        start_time = time.time()
+        threading.Timer(0.05, shell.cancel, [1]).start()
+        self.assertEqual(list(output), [])
+        self.assertLess(time.time() - start_time, 2)
+
+        # Nothing is run until the doer is reset
+        self.assertEqual(list(shell.run('')), [])
+        shell.reset()
+        self.assertEqual(list(Shell('echo -n "Hello"').run('')), ['Hello'])
+
+    def test_cancel_kills(self):
+        """Check that a command ignoring SIGTERM is killed after the grace
+        period.
+        """
+        set_new_session(True)
+        self.addCleanup(set_new_session, False)
+
+        shell = Shell('trap "" TERM; echo "started"; sleep 10')
+        output = shell.run('')
+        self.assertEqual(next(output), 'started\n')
+
+        start_time = time.time()
+        shell.cancel(0.1)
+        self.assertEqual(list(output), [])
+        self.assertLess(time.time() - start_time, 2)
+
+    def test_close(self):
+        """Check that closing the doer stops the running commands.
+        """
+        for new_session in (False, True):
+            set_new_session(new_session)
+            self.addCleanup(set_new_session, False)
+
+            shell = Shell('echo "$$"; exec sleep 10')
+            output = shell.run('')
+            pid = int(next(output))
+
+            start_time = time.time()
+            shell.close()
+            self.assertEqual(list(output), [])
+            self.assertLess(time.time() - start_time, 2)
+            self.assertRaises(ProcessLookupError, os.kill, pid, 0)
+            self.assertTrue(shell.cancelled)
@@ -0,0 +1,55 @@
+"""Test the `Template` class
+"""
+
+import os
+from unittest import TestCase
+
+from watch_do import Change
+from watch_do.doers.template import Template
+
+
+class TestTemplate(TestCase):
+    """Test the `Template` class
+    """
+
+    def test__init__(self):
+        """Check that the string is compiled into literals and tokens.
+        """
+        template = Template('lint %f \\%f %F %{stem}%{ext} %{unknown} %%')
+        self.assertEqual(template.string,
+                         'lint %f \\%f %F %{stem}%{ext} %{unknown} %%')
+        self.assertEqual(template.tokens, ['f', 'F', 'stem', 'ext'])
+        self.assertEqual(template._segments, [
+            (False, 'lint '), (True, 'f'), (False, ' %f '), (True, 'F'),
+            (False, ' '), (True, 'stem'), (True, 'ext'),
+            (False, ' %{unknown} %%')])
+
+        self.assertEqual(Template('echo').tokens, [])
+
+    def test_render(self):
+        """Check that the file names are interpolated.
+        """
+        template = Template('%f|%{dir}|%{name}|%{stem}|%{ext}')
+        self.assertEqual(template.render(['src/main.py', 'other.py']),
+                         'src/main.py|src|main.py|main|.py')
+        self.assertEqual(template.render(['Makefile']),
+                         'Makefile|.|Makefile|Makefile|')
+
+        template = Template('%{rel} %{abs}')
+        self.assertEqual(
+            template.render([os.path.join(os.getcwd(), 'a.py')]),
+            'a.py ' + os.path.join(os.getcwd(), 'a.py'))
+
+        template = Template('lint %F \\%F')
+        self.assertEqual(template.render(['a b.py', 'c.py']),
+                         "lint 'a b.py' c.py %F")
+        self.assertEqual(template.render(['a b.py', 'c.py'], quote=False),
+                         'lint a b.py c.py %F')
+
+        self.assertEqual(Template('echo %f %{stem}.').render([]), 'echo  .')
+
+        template = Template('%{type} %{old} %f')
+        self.assertEqual(template.render(['a.py']), 'modified a.py a.py')
+        self.assertEqual(
+            template.render([Change('b.py', 'renamed', 'a.py')]),
+            'renamed a.py b.py')
@@ -0,0 +1,102 @@
+"""Test the `Worker` doer class
+"""
+
+import sys
+import time
+import shlex
+import threading
+from unittest import TestCase
+
+from watch_do import Change
+from watch_do.doers import Worker
+
+
+# Responds to each request, printing the type of any change that isn't a
+# modification and exiting when asked to handle "exit"
+WORKER_SCRIPT = '''
+import os, sys, json
+for line in sys.stdin:
+    request = json.loads(line)
+    file_name = request['file']
+    if request['type'] != 'modified':
+        print(request['type'])
+    if file_name == 'exit':
+        sys.exit(3)
+    if file_name == 'sleep':
+        import time; time.sleep(10)
+    print('stray print')
+    returncode = {'bad': 1, 'killed': -9}.get(file_name, 0)
+    print(json.dumps({'output': '{} {}\\n'.format(file_name, os.getpid()),
+                      'returncode': returncode}),
+          flush=True)
+'''
+
+
+class TestWorker(TestCase):
+    """Test the `Worker` doer class
+    """
+
+    def setUp(self):
+        self.worker = Worker('{} -c {}'.format(
+            shlex.quote(sys.executable), shlex.quote(WORKER_SCRIPT)))
+        self.addCleanup(self.worker.close)
+
+    def test_run(self):
+        """Check that files are sent to the same process.
+        """
+        self.assertIsNone(self.worker.process)
+
+        output = list(self.worker.run('a.py'))
+        self.assertIsNotNone(self.worker.process)
+        self.assertEqual(output[0], 'stray print\n')
+        pid = output[1].split()[1]
+        self.assertEqual(output, ['stray print\n', 'a.py {}\n'.format(pid)])
+
+        self.assertEqual(list(self.worker.run('b.py')),
+                         ['stray print\n', 'b.py {}\n'.format(pid)])
+
+        self.assertEqual(list(self.worker.run('bad')), [
+            'stray print\n', 'bad {}\n'.format(pid),
+            'Command failed to run, exited with error code 1'])
+
+        self.assertEqual(list(self.worker.run('killed')), [
+            'stray print\n', 'killed {}\n'.format(pid),
+            'Command failed to run, exited with error code -9'])
+
+        self.assertEqual(list(self.worker.run(Change('c.py', 'created'))), [
+            'created\n', 'stray print\n', 'c.py {}\n'.format(pid)])
+
+    def test_run_restarts(self):
+        """Check that the process is started again if it exits.
+        """
+        pid = list(self.worker.run('a.py'))[1]
+
+        self.assertEqual(list(self.worker.run('exit')), [
+            'Worker exited with error code 3, it will be restarted'])
+        self.assertIsNone(self.worker.process)
+
+        self.assertNotEqual(list(self.worker.run('a.py'))[1], pid)
+
+    def test_cancel(self):
+        """Check that cancelling stops the process.
+        """
+        threading.Timer(0.5, self.worker.cancel, [1]).start()
+
+        start_time = time.time()
+        self.assertEqual(list(self.worker.run('sleep')), [])
+        self.assertLess(time.time() - start_time, 5)
+        self.assertIsNone(self.worker.process)
+
+        self.assertEqual(list(self.worker.run('a.py')), [])
+        self.worker.reset()
+        self.assertEqual(len(list(self.worker.run('a.py'))), 2)
+
+    def test_close(self):
+        """Check that closing stops the process.
+        """
+        list(self.worker.run('a.py'))
+        process = self.worker.process
+
+        self.worker.close()
+        self.assertIsNone(self.worker.process)
+        self.assertEqual(process.returncode, 0)
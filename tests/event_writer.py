@@ -0,0 +1,44 @@
+"""Test the `EventWriter` class.
+"""
+
+import io
+import json
+from unittest import TestCase
+
+from watch_do import EventWriter
+
+
+class TestEventWriter(TestCase):
+    """Test the `EventWriter` class.
+    """
+
+    def setUp(self):
+        self.stream = io.StringIO()
+        self.event_writer = EventWriter(self.stream, 100)
+
+    def test_write(self):
+        """Check that events are written as lines of compact JSON.
+        """
+        self.event_writer.write('change', file='a.py', type='modified')
+        self.event_writer.flush()
+
+        line = self.stream.getvalue()
+        self.assertTrue(line.endswith('\n'))
+        self.assertNotIn(' ', line)
+
+        event = json.loads(line)
+        self.assertEqual(event.pop('event'), 'change')
+        self.assertIsInstance(event.pop('time'), float)
+        self.assertEqual(event, {'file': 'a.py', 'type': 'modified'})
+
+    def test_flush(self):
+        """Check that events are buffered until flushed or the buffer fills.
+        """
+        self.event_writer.write('scan_start', files=1)
+        self.assertEqual(self.stream.getvalue(), '')
+
+        self.event_writer.flush()
+        self.assertEqual(len(self.stream.getvalue().splitlines()), 1)
+
+        self.event_writer.write('output', text='x' * 100)
+        self.assertEqual(len(self.stream.getvalue().splitlines()), 2)
@@ -2,8 +2,12 @@
 """
 
 import os
+import shutil
+from unittest.mock import patch
 
 from tests.helper_functions import TestCaseWithFakeFiles
+from tests.helper_functions import create_file
+from tests.helper_functions import remove_file
 
 from watch_do import GlobManager
 
@@ -76,3 +80,102 @@ class TestGlobManager(TestCaseWithFakeFiles):
             [os.path.join(self.temp_dir.name, file_name) for file_name in [
                 'bob.py', 'geoff.py']])
         self.assertCountEqual(glob_manager.get_files(), {'bob.py', 'geoff.py'})
+
+    def test_get_changes(self):
+        """Check that added and removed files are reported.
+        """
+        glob_manager = GlobManager(['**/*.py'])
+        added, removed = glob_manager.get_changes()
+        self.assertEqual(added, glob_manager.last_files)
+        self.assertEqual(removed, set())
+
+        self.assertEqual(glob_manager.get_changes(), (set(), set()))
+
+        create_file('animals/vehicles/train.py')
+        remove_file('bob.py')
+        create_file('ignored.txt')
+        self.assertEqual(glob_manager.get_changes(),
+                         ({'animals/vehicles/train.py'}, {'bob.py'}))
+
+        # Directories are also picked up when they're created and removed
+        os.makedirs('plants/trees')
+        create_file('plants/trees/oak.py')
+        self.assertEqual(glob_manager.get_changes(),
+                         ({'plants/trees/oak.py'}, set()))
+
+        shutil.rmtree('animals/vehicles')
+        self.assertEqual(
+            glob_manager.get_changes(),
+            (set(), {'animals/vehicles/aeroplane.txt.py',
+                     'animals/vehicles/bus.py',
+                     'animals/vehicles/tractor.py',
+                     'animals/vehicles/train.py'}))
+
+        self.assertNotIn('animals/vehicles/bus.py', glob_manager.last_files)
+
+    def test_get_changes_unmodified_directories(self):
+        """Check that only modified directories are listed again.
+        """
+        glob_manager = GlobManager(['**/*.py'])
+        glob_manager.get_changes()
+
+        # Move the modification times into the past, so they aren't racy
+        for directory in ['.', 'animals', 'animals/vehicles']:
+            os.utime(directory, (0, 0))
+        glob_manager.get_changes()
+
+        with patch('os.scandir', side_effect=os.scandir) as scandir:
+            self.assertEqual(glob_manager.get_changes(), (set(), set()))
+            scandir.assert_not_called()
+
+            create_file('animals/horse.py')
+            self.assertEqual(glob_manager.get_changes(),
+                             ({'animals/horse.py'}, set()))
+            scandir.assert_called_once_with('animals')
+
+    def test_get_files_excludes(self):
+        """Check that excluded files and directories aren't returned.
+        """
+        glob_manager = GlobManager(['**/*.py'], ['vehicles/', 'geoff.py'])
+        with patch('os.scandir', side_effect=os.scandir) as scandir:
+            self.assertCountEqual(
+                glob_manager.get_files(),
+                {
+                    'bob.py',
+                    'fred.txt.py',
+                    'animals/dog.py',
+                    'animals/mouse.txt.py',
+                    'animals/sheep.py'
+                })
+
+            # Excluded directories are never listed
+            self.assertNotIn(
+                'animals/vehicles',
+                [call[0][0] for call in scandir.call_args_list])
+
+        self.assertEqual(glob_manager.excludes, ['vehicles/', 'geoff.py'])
+
+    def test_get_files_gitignore(self):
+        """Check that the .gitignore files are honoured.
+        """
+        os.makedirs('.git')
+        create_file('.git/config.py')
+        create_file('.gitignore', 'vehicles/\n*.txt.py\n')
+        create_file('animals/.gitignore', '!mouse.txt.py\nsheep.py\n')
+
+        glob_manager = GlobManager(['**/*.py'], gitignore=True)
+        self.assertTrue(glob_manager.gitignore)
+        self.assertCountEqual(
+            glob_manager.get_files(),
+            {'bob.py', 'geoff.py', 'animals/dog.py', 'animals/mouse.txt.py'})
+
+        # Changing a .gitignore re-evaluates the files beneath it
+        create_file('animals/.gitignore', '')
+        os.utime('animals/.gitignore', (0, 0))
+        self.assertEqual(glob_manager.get_changes(),
+                         ({'animals/sheep.py'}, {'animals/mouse.txt.py'}))
+
+        # The rules from .gitignore files above the roots are also used
+        glob_manager = GlobManager(['animals/*.py'], gitignore=True)
+        self.assertCountEqual(
+            glob_manager.get_files(), {'animals/dog.py', 'animals/sheep.py'})
@@ -0,0 +1,64 @@
+"""Test the `GlobMatcher` class.
+"""
+
+from unittest import TestCase
+
+from watch_do import GlobMatcher
+
+
+class TestGlobMatcher(TestCase):
+    """Test the `GlobMatcher` class.
+    """
+
+    def test_roots(self):
+        """Check that only the outermost roots need to be walked.
+        """
+        self.assertEqual(
+            GlobMatcher(['src/**/*.py', 'src/lib/*.pyx', 'tests/*.py']).roots,
+            ['src', 'tests'])
+
+        self.assertEqual(
+            GlobMatcher(['*.txt', 'src/**/*.py', '../other/*.py']).roots,
+            ['', '../other'])
+
+        self.assertEqual(GlobMatcher(['./a/b/c.py']).roots, ['a/b'])
+
+    def test_matches_file(self):
+        """Check that files are matched against all of the globs.
+        """
+        matcher = GlobMatcher(['src/**/*.py', 'tests/test_?.py', '[!.]*.md'])
+
+        self.assertTrue(matcher.matches_file('src/cli.py'))
+        self.assertTrue(matcher.matches_file('src/a/b/c.py'))
+        self.assertTrue(matcher.matches_file('tests/test_a.py'))
+        self.assertTrue(matcher.matches_file('README.md'))
+
+        self.assertFalse(matcher.matches_file('src/cli.pyc'))
+        self.assertFalse(matcher.matches_file('lib/src/cli.py'))
+        self.assertFalse(matcher.matches_file('tests/test_ab.py'))
+        self.assertFalse(matcher.matches_file('tests/a/test_a.py'))
+        self.assertFalse(matcher.matches_file('.hidden.md'))
+        self.assertFalse(matcher.matches_file('docs/index.md'))
+
+        matcher = GlobMatcher(['**/*.py', 'build/**'])
+        self.assertTrue(matcher.matches_file('cli.py'))
+        self.assertTrue(matcher.matches_file('a/b/cli.py'))
+        self.assertTrue(matcher.matches_file('build/a/b.o'))
+
+        self.assertFalse(GlobMatcher([]).matches_file('cli.py'))
+
+    def test_matches_directory(self):
+        """Check that directories that can't contain matches are pruned.
+        """
+        matcher = GlobMatcher(['src/**/*.py', 'a/*/c/*.txt', 'b.txt'])
+
+        self.assertTrue(matcher.matches_directory('src'))
+        self.assertTrue(matcher.matches_directory('src/x/y'))
+        self.assertTrue(matcher.matches_directory('a'))
+        self.assertTrue(matcher.matches_directory('a/b'))
+        self.assertTrue(matcher.matches_directory('a/b/c'))
+
+        self.assertFalse(matcher.matches_directory('docs'))
+        self.assertFalse(matcher.matches_directory('a/b/d'))
+        self.assertFalse(matcher.matches_directory('a/b/c/d'))
+        self.assertFalse(matcher.matches_directory('b.txt'))
@@ -0,0 +1,148 @@
+"""Test the `HashCache` class.
+"""
+
+import os
+import tempfile
+import threading
+from types import SimpleNamespace
+from unittest import TestCase
+
+from watch_do import HashCache
+
+
+class TestHashCache(TestCase):
+    """Test the `HashCache` class.
+    """
+
+    def setUp(self):
+        """Create a temporary directory containing an aged file.
+        """
+        self.temporary_directory = tempfile.TemporaryDirectory()
+        self.cache_file = os.path.join(
+            self.temporary_directory.name, 'cache', 'hashes')
+
+        self.file_name = os.path.join(self.temporary_directory.name, 'file')
+        with open(self.file_name, 'wb') as file_handle:
+            file_handle.write(b'Hello')
+
+        # Age the file, so that it isn't considered to be racy
+        os.utime(self.file_name, (0, 0))
+        self.stat = os.stat(self.file_name)
+
+    def tearDown(self):
+        """Clear up the temporary directory.
+        """
+        self.temporary_directory.cleanup()
+
+    def test_get_and_put(self):
+        """Check that hashes are stored by stat and algorithm.
+        """
+        cache = HashCache(self.cache_file)
+        self.assertIsNone(cache.get(self.stat, 'md5'))
+        self.assertFalse(cache.dirty)
+
+        cache.put(self.file_name, self.stat, 'md5', 'abcd')
+        self.assertTrue(cache.dirty)
+        self.assertEqual(cache.get(self.stat, 'md5'), 'abcd')
+        self.assertIsNone(cache.get(self.stat, 'crc32'))
+
+        os.utime(self.file_name, (1, 1))
+        self.assertIsNone(cache.get(os.stat(self.file_name), 'md5'))
+
+    def test_put_racy(self):
+        """Check that recently modified files aren't stored.
+        """
+        os.utime(self.file_name)
+
+        cache = HashCache(self.cache_file)
+        cache.put(self.file_name, os.stat(self.file_name), 'md5', 'abcd')
+        self.assertEqual(len(cache), 0)
+        self.assertFalse(cache.dirty)
+
+    def test_save(self):
+        """Check that the entries are saved and loaded again.
+        """
+        cache = HashCache(self.cache_file)
+        cache.put(self.file_name, self.stat, 'md5', 'abcd')
+        cache.put(self.file_name, self.stat, 'crc32', '0123')
+        cache.save()
+        self.assertFalse(cache.dirty)
+
+        cache = HashCache(self.cache_file)
+        self.assertEqual(len(cache), 2)
+        self.assertEqual(cache.get(self.stat, 'md5'), 'abcd')
+        self.assertEqual(cache.get(self.stat, 'crc32'), '0123')
+
+    def test_save_merge(self):
+        """Check that entries saved by another instance are kept.
+        """
+        first = HashCache(self.cache_file)
+        second = HashCache(self.cache_file)
+
+        first.put(self.file_name, self.stat, 'md5', 'abcd')
+        first.save()
+        second.put(self.file_name, self.stat, 'crc32', '0123')
+        second.save()
+
+        cache = HashCache(self.cache_file)
+        self.assertEqual(cache.get(self.stat, 'md5'), 'abcd')
+        self.assertEqual(cache.get(self.stat, 'crc32'), '0123')
+
+    def test_save_eviction(self):
+        """Check that unwatched files and the oldest entries are evicted.
+        """
+        cache = HashCache(self.cache_file, max_entries=1)
+        cache.put(self.file_name, self.stat, 'md5', 'abcd')
+        cache.put('other', self.stat, 'crc32', '0123')
+        cache.save({self.file_name})
+        self.assertEqual(len(cache), 1)
+        self.assertEqual(cache.get(self.stat, 'md5'), 'abcd')
+
+        cache.put(self.file_name, self.stat, 'crc32', '0123')
+        cache._entries[next(iter(cache._entries))][2] = 0
+        cache.save()
+        self.assertEqual(len(cache), 1)
+        self.assertEqual(cache.get(self.stat, 'crc32'), '0123')
+
+    def test_corrupt(self):
+        """Check that corrupt or truncated caches are handled.
+        """
+        cache = HashCache(self.cache_file)
+        cache.put(self.file_name, self.stat, 'md5', 'abcd')
+        cache.save()
+
+        with open(self.cache_file, 'rb') as file_handle:
+            data = file_handle.read()
+
+        with open(self.cache_file, 'wb') as file_handle:
+            file_handle.write(data[:-1])
+        self.assertEqual(len(HashCache(self.cache_file)), 0)
+
+        with open(self.cache_file, 'wb') as file_handle:
+            file_handle.write(b'garbage')
+        self.assertEqual(len(HashCache(self.cache_file)), 0)
+
+    def test_save_concurrent(self):
+        """Check that entries can be stored while the cache is being saved.
+        """
+        cache = HashCache(self.cache_file, max_entries=500)
+        stopped = threading.Event()
+
+        def put():
+            inode = 0
+            while not stopped.is_set():
+                inode += 1
+                stat = SimpleNamespace(st_dev=0, st_ino=inode, st_size=5,
+                                       st_mtime_ns=0)
+                cache.put('file-{}'.format(inode), stat, 'md5', 'abcd')
+
+        thread = threading.Thread(target=put)
+        thread.start()
+        try:
+            for _ in range(20):
+                cache.save()
+        finally:
+            stopped.set()
+            thread.join()
+
+        self.assertGreater(len(HashCache(self.cache_file)), 0)
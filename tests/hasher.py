@@ -0,0 +1,68 @@
+"""Test the `Hasher` class.
+"""
+
+import hashlib
+import tempfile
+from unittest import TestCase
+
+from watch_do import Hasher
+
+
+class TestHasher(TestCase):
+    """Test the `Hasher` class.
+    """
+
+    def setUp(self):
+        """Create a temporary file spanning a number of chunks.
+        """
+        self.content = bytes(range(256)) * 1000
+
+        # No buffering, all data is written straight to the file
+        self.temporary_file = tempfile.NamedTemporaryFile(buffering=0)
+        self.temporary_file.write(self.content)
+
+    def tearDown(self):
+        """Clear up the temporary file
+        """
+        self.temporary_file.close()
+
+    def test___init__(self):
+        """Check that the properties are stored and validated.
+        """
+        hasher = Hasher('sha1', 4096)
+        self.assertEqual(hasher.algorithm, 'sha1')
+        self.assertEqual(hasher.chunk_size, 4096)
+
+        with self.assertRaises(ValueError):
+            Hasher('not an algorithm')
+
+    def test_hash_file(self):
+        """Check that files are hashed correctly when read in chunks.
+        """
+        expected = hashlib.md5(self.content).hexdigest()
+
+        # Read in chunks that don't divide the file evenly
+        hasher = Hasher('md5', chunk_size=1000)
+        self.assertEqual(hasher.hash_file(self.temporary_file.name), expected)
+
+        hasher = Hasher('md5')
+        self.assertEqual(hasher.hash_file(self.temporary_file.name), expected)
+
+        self.assertRaises(FileNotFoundError, hasher.hash_file,
+                          '/some/made/up/file/path')
+
+    def test_hash_file_algorithms(self):
+        """Check each of the algorithms produces the expected hash.
+        """
+        self.temporary_file.seek(0)
+        self.temporary_file.truncate()
+        self.temporary_file.write(b'Hello')
+
+        for algorithm, expected in [
+                ('md5', '8b1a9953c4611296a827abf8c47804d7'),
+                ('sha1', 'f7ff9e8b7bb2e09b70935a5d785e0cc5d9d0abf0'),
+                ('blake2b', 'ad10196e1159e75dd6be7d03f75be04f'),
+                ('crc32', 'f7d18982')]:
+            hasher = Hasher(algorithm)
+            self.assertEqual(
+                hasher.hash_file(self.temporary_file.name), expected)
@@ -0,0 +1,91 @@
+"""Test the `IgnoreRules` class.
+"""
+
+import os
+from unittest import TestCase
+
+from tests.helper_functions import TestCaseWithFakeFiles
+from tests.helper_functions import create_file
+
+from watch_do import IgnoreRules
+
+
+class TestIgnoreRules(TestCase):
+    """Test the `IgnoreRules` class.
+    """
+
+    def test___init__(self):
+        """Check that the patterns and base directory are stored.
+        """
+        rules = IgnoreRules(['*.pyc'], 'src')
+        self.assertEqual(rules.patterns, ['*.pyc'])
+        self.assertEqual(rules.base, os.path.abspath('src'))
+
+    def test_match(self):
+        """Check that paths are matched following the .gitignore format.
+        """
+        rules = IgnoreRules([
+            '# A comment',
+            '',
+            '*.pyc',
+            'build/',
+            '/dist',
+            'docs/*.html',
+            '**/cache/**',
+            '\\#notes'
+        ])
+
+        self.assertTrue(rules.match('a.pyc', False))
+        self.assertTrue(rules.match('src/a.pyc', False))
+        self.assertTrue(rules.match('build', True))
+        self.assertTrue(rules.match('src/build', True))
+        self.assertTrue(rules.match('dist', True))
+        self.assertTrue(rules.match('dist', False))
+        self.assertTrue(rules.match('docs/index.html', False))
+        self.assertTrue(rules.match('a/cache/b/c.txt', False))
+        self.assertTrue(rules.match('#notes', False))
+
+        self.assertIsNone(rules.match('a.py', False))
+        self.assertIsNone(rules.match('build', False))
+        self.assertIsNone(rules.match('src/dist', True))
+        self.assertIsNone(rules.match('src/docs/index.html', False))
+        self.assertIsNone(rules.match('# A comment', False))
+
+    def test_match_negated(self):
+        """Check that the last matching pattern takes precedence.
+        """
+        rules = IgnoreRules(['*.log', '!important.log', 'old/important.log'])
+
+        self.assertTrue(rules.match('debug.log', False))
+        self.assertFalse(rules.match('important.log', False))
+        self.assertTrue(rules.match('old/important.log', False))
+        self.assertIsNone(rules.match('debug.txt', False))
+
+    def test_relative_path(self):
+        """Check that directories are made relative to the base directory.
+        """
+        rules = IgnoreRules([], 'src')
+        self.assertEqual(rules.relative_path('src'), '')
+        self.assertEqual(rules.relative_path('src/a/b'), 'a/b')
+        self.assertIsNone(rules.relative_path('srcs'))
+        self.assertIsNone(rules.relative_path(''))
+
+        rules = IgnoreRules([])
+        self.assertEqual(rules.relative_path(''), '')
+        self.assertEqual(rules.relative_path('src'), 'src')
+
+
+class TestIgnoreRulesFromFile(TestCaseWithFakeFiles):
+    """Test loading `IgnoreRules` from a .gitignore file.
+    """
+
+    def test_from_file(self):
+        """Check the rules are relative to the directory of the file.
+        """
+        create_file('animals/.gitignore', '*.txt\n!cat.txt\n')
+        rules = IgnoreRules.from_file('animals/.gitignore')
+
+        self.assertEqual(rules.patterns, ['*.txt', '!cat.txt'])
+        self.assertEqual(rules.base, os.path.abspath('animals'))
+        self.assertTrue(rules.match('cow.txt', False))
+        self.assertFalse(rules.match('cat.txt', False))
@@ -0,0 +1,58 @@
+"""Test the `Notifier` class.
+"""
+
+import sys
+from unittest import skipUnless
+
+from tests.helper_functions import TestCaseWithFakeFiles
+from tests.helper_functions import create_file
+from tests.helper_functions import remove_file
+
+from watch_do import Notifier
+
+
+@skipUnless(sys.platform.startswith('linux'), 'inotify requires Linux')
+class TestNotifier(TestCaseWithFakeFiles):
+    """Test the `Notifier` class.
+    """
+    def setUp(self):
+        super(TestNotifier, self).setUp()
+
+        self.notifier = Notifier()
+
+    def tearDown(self):
+        self.notifier.close()
+
+        super(TestNotifier, self).tearDown()
+
+    def test_add_watch(self):
+        """Check that directories are watched and unwatched.
+        """
+        self.notifier.add_watch('')
+        self.notifier.add_watch('animals')
+        self.assertEqual(self.notifier.directories, {'', 'animals'})
+        self.assertTrue(self.notifier.is_watching('animals'))
+
+        self.notifier.remove_watch('animals')
+        self.assertFalse(self.notifier.is_watching('animals'))
+
+        with self.assertRaises(FileNotFoundError):
+            self.notifier.add_watch('not_a_directory')
+
+    def test_read_events(self):
+        """Check that changes to files are reported with their paths.
+        """
+        self.notifier.add_watch('')
+        self.notifier.add_watch('animals/vehicles')
+
+        # Nothing has happened yet
+        self.assertEqual(self.notifier.read_events(0), [])
+
+        create_file('bob.py', 'Hello')
+        create_file('animals/vehicles/bus.py', 'World')
+        remove_file('dave.txt')
+        create_file('animals/cat.txt', 'Unwatched')
+
+        paths = {path for path, _ in self.notifier.read_events(1)}
+        self.assertEqual(paths, {'bob.py', 'animals/vehicles/bus.py',
+                                 'dave.txt'})
@@ -0,0 +1,61 @@
+"""Test the `Renderer` class.
+"""
+
+import io
+from unittest import TestCase
+
+from watch_do import Renderer
+from watch_do.renderer import CLEAR
+
+
+class TerminalStream(io.StringIO):
+    """A stream that claims to be a terminal.
+    """
+
+    def isatty(self):
+        return True
+
+
+class TestRenderer(TestCase):
+    """Test the `Renderer` class.
+    """
+
+    def setUp(self):
+        self.stream = TerminalStream()
+        self.renderer = Renderer(self.stream, scrollback=3)
+
+    def test___init__(self):
+        """Check that the screen is only cleared for terminals.
+        """
+        self.assertTrue(self.renderer.is_tty)
+        self.assertTrue(self.renderer.clears)
+        self.assertFalse(Renderer(self.stream, clear=False).clears)
+        self.assertFalse(Renderer(io.StringIO()).clears)
+
+    def test_clear(self):
+        """Check that the screen is cleared with escape sequences.
+        """
+        self.renderer.write('a\n')
+        self.renderer.clear()
+        self.assertEqual(self.stream.getvalue(), 'a\n' + CLEAR)
+        self.assertEqual(self.renderer.scrollback, [])
+
+        stream = io.StringIO()
+        Renderer(stream).clear()
+        self.assertEqual(stream.getvalue(), '')
+
+    def test_write(self):
+        """Check that only the most recent lines are kept.
+        """
+        self.renderer.write('')
+        self.renderer.write('a\nb')
+        self.renderer.write('c\nd\ne\n')
+        self.assertEqual(self.stream.getvalue(), 'a\nbc\nd\ne\n')
+        self.assertEqual(self.renderer.scrollback, ['bc\n', 'd\n', 'e\n'])
+
+    def test_redraw(self):
+        """Check that the lines kept are written again.
+        """
+        self.renderer.write('a\nb\n')
+        self.renderer.redraw()
+        self.assertEqual(self.stream.getvalue(), 'a\nb\n' + CLEAR + 'a\nb\n')
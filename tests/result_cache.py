@@ -0,0 +1,132 @@
+"""Test the `ResultCache` class.
+"""
+
+import os
+import json
+import tempfile
+from unittest import TestCase
+
+from watch_do import ResultCache
+
+
+class TestResultCache(TestCase):
+    """Test the `ResultCache` class.
+    """
+
+    def setUp(self):
+        """Create a temporary directory containing a file.
+        """
+        self.temporary_directory = tempfile.TemporaryDirectory()
+        self.cache_file = os.path.join(
+            self.temporary_directory.name, 'cache', 'results')
+
+        self.file_name = os.path.join(self.temporary_directory.name, 'file')
+        self.write('Hello')
+
+    def tearDown(self):
+        """Clear up the temporary directory.
+        """
+        self.temporary_directory.cleanup()
+
+    def write(self, contents):
+        """Replace the contents of the file.
+        """
+        with open(self.file_name, 'w') as file_handle:
+            file_handle.write(contents)
+
+    def test_get_key(self):
+        """Check that keys depend on the command and file.
+        """
+        cache = ResultCache()
+        key = cache.get_key('make', self.file_name)
+
+        self.assertEqual(cache.get_key('make', self.file_name), key)
+        self.assertNotEqual(cache.get_key('lint', self.file_name), key)
+        self.assertNotEqual(cache.get_key('make', self.file_name + '2'), key)
+
+    def test_hash_file(self):
+        """Check that digests depend on the contents.
+        """
+        cache = ResultCache()
+        digest = cache.hash_file(self.file_name)
+
+        self.write('Bye')
+        self.assertNotEqual(cache.hash_file(self.file_name), digest)
+        self.write('Hello')
+        self.assertEqual(cache.hash_file(self.file_name), digest)
+
+        self.assertIsNone(cache.hash_file(self.file_name + '.missing'))
+
+    def test_get_and_put(self):
+        """Check that only the last result is kept, and output is only stored
+        when replaying.
+        """
+        cache = ResultCache()
+        self.assertIsNone(cache.get('key', 'a'))
+        self.assertIsNone(cache.get('key', None))
+
+        cache.put('key', 'a', ['output'])
+        self.assertEqual(cache.get('key', 'a'), [])
+        self.assertTrue(cache.dirty)
+
+        cache.put('key', 'b', ['output'])
+        self.assertIsNone(cache.get('key', 'a'))
+        self.assertEqual(cache.get('key', 'b'), [])
+
+        cache.put('key', None, ['output'])
+        self.assertIsNone(cache.get('key', 'b'))
+        self.assertEqual(len(cache), 0)
+
+        cache = ResultCache(replay=True)
+        cache.put('key', 'a', ['output'])
+        self.assertEqual(cache.get('key', 'a'), ['output'])
+        self.assertEqual(len(cache), 1)
+
+        cache.remove('key')
+        cache.remove('missing')
+        self.assertIsNone(cache.get('key', 'a'))
+
+    def test_max_entries(self):
+        """Check that the least recently used results are forgotten.
+        """
+        cache = ResultCache(max_entries=2)
+        cache.put('a', 'a', [])
+        cache.put('b', 'b', [])
+        cache.get('a', 'a')
+        cache.put('c', 'c', [])
+
+        self.assertEqual(len(cache), 2)
+        self.assertIsNone(cache.get('b', 'b'))
+        self.assertIsNotNone(cache.get('a', 'a'))
+
+    def test_save(self):
+        """Check that saved results are loaded.
+        """
+        cache = ResultCache(self.cache_file, replay=True)
+        cache.put('a', 'a', ['output a'])
+        cache.put('b', 'b', ['output b'])
+        cache.save()
+        self.assertFalse(cache.dirty)
+
+        self.assertEqual(
+            ResultCache(self.cache_file, replay=True).get('a', 'a'),
+            ['output a'])
+        self.assertEqual(ResultCache(self.cache_file).get('b', 'b'), [])
+        self.assertIsNone(
+            ResultCache(self.cache_file, max_entries=1).get('a', 'a'))
+
+        # Results stored without output can't be replayed
+        ResultCache(self.cache_file).save()
+        self.assertIsNone(
+            ResultCache(self.cache_file, replay=True).get('a', 'a'))
+
+        with open(self.cache_file, 'w') as file_handle:
+            json.dump({'version': 2,
+                       'entries': [['a', 'a'], 'b', ['c', 'c', []]]},
+                      file_handle)
+        cache = ResultCache(self.cache_file)
+        self.assertEqual(len(cache), 1)
+
+        with open(self.cache_file, 'w') as file_handle:
+            file_handle.write('{')
+        self.assertEqual(len(ResultCache(self.cache_file)), 0)
@@ -0,0 +1,157 @@
+"""Test the `Settler` class.
+"""
+
+import os
+import time
+import threading
+from unittest.mock import Mock
+
+from tests.helper_functions import TestCaseWithFakeFiles
+from tests.helper_functions import create_file
+
+from watch_do import Settler
+from watch_do import Change
+from watch_do import GlobManager
+from watch_do import WatcherManager
+from watch_do.watchers import Inotify
+
+
+class TestSettler(TestCaseWithFakeFiles):
+    """Test the `Settler` class.
+    """
+
+    def setUp(self):
+        super(TestSettler, self).setUp()
+
+        self.watcher_manager = Mock()
+        self.watcher_manager.get_changed_files.return_value = set()
+
+        self.stopped = threading.Event()
+        self.threads = []
+
+    def tearDown(self):
+        """Stop the threads writing to files before the temporary directory
+        is removed.
+        """
+        self.stopped.set()
+        for thread in self.threads:
+            thread.join()
+
+        super(TestSettler, self).tearDown()
+
+    def write_repeatedly(self, file_name, times, interval):
+        """Write to a file a number of times in a background thread.
+
+        The file is always written inside of the temporary directory, and the
+        thread is stopped when the test finishes.
+
+        Parameters:
+            file_name (str): The file to write to.
+            times (int): The number of times to write to the file.
+            interval (float): The time (in seconds) between each write.
+
+        Returns:
+            threading.Thread: The thread writing to the file.
+        """
+        file_name = os.path.join(self.temp_dir.name, file_name)
+
+        def write():
+            """Write to the file.
+            """
+            for index in range(times):
+                if self.stopped.wait(interval):
+                    return
+                create_file(file_name, 'x' * (index + 1))
+
+        thread = threading.Thread(target=write)
+        thread.start()
+        self.threads.append(thread)
+
+        return thread
+
+    def test___init__(self):
+        """Check that the properties are stored.
+        """
+        settler = Settler(0.5, 10, 0.1)
+        self.assertEqual(settler.quiet_period, 0.5)
+        self.assertEqual(settler.max_wait, 10)
+        self.assertEqual(settler.poll_interval, 0.1)
+
+    def test_settle_disabled(self):
+        """Check that the files are returned straight away without a quiet
+        period.
+        """
+        settler = Settler(0, 10)
+        self.assertEqual(settler.settle({'dave.txt'}, self.watcher_manager),
+                         {'dave.txt'})
+        self.watcher_manager.get_changed_files.assert_not_called()
+
+    def test_settle(self):
+        """Check that the files are returned once they stop changing.
+        """
+        settler = Settler(0.2, 10, 0.01)
+        thread = self.write_repeatedly('dave.txt', 5, 0.05)
+
+        start_time = time.time()
+        self.assertEqual(settler.settle({'dave.txt'}, self.watcher_manager),
+                         {'dave.txt'})
+        self.assertFalse(thread.is_alive())
+        self.assertGreaterEqual(time.time() - start_time, 0.2)
+
+    def test_settle_max_wait(self):
+        """Check that files that keep changing are returned after the maximum
+        wait.
+        """
+        settler = Settler(0.2, 0.1, 0.01)
+        self.write_repeatedly('dave.txt', 10, 0.02)
+
+        start_time = time.time()
+        settler.settle({'dave.txt'}, self.watcher_manager)
+        self.assertLess(time.time() - start_time, 0.2)
+
+    def test_settle_fold(self):
+        """Check that files that changed while waiting are included.
+        """
+        settler = Settler(0.05, 10, 0.01)
+        self.watcher_manager.get_changed_files.side_effect = [
+            {'dave.txt', 'bob.py'}, {'bob.py'}, set()]
+
+        self.assertEqual(settler.settle({'dave.txt'}, self.watcher_manager),
+                         {'dave.txt', 'bob.py'})
+        self.assertEqual(self.watcher_manager.get_changed_files.call_count, 2)
+
+    def test_settle_merge(self):
+        """Check that a later change to a file in the batch isn't dropped.
+        """
+        settler = Settler(0.05, 10, 0.01)
+        self.watcher_manager.get_changed_files.side_effect = [
+            {Change('dave.txt', 'removed'), Change('bob.py', 'created')},
+            {Change('bob.py', 'modified')}, set()]
+
+        changes = settler.settle({Change('dave.txt', 'modified')},
+                                 self.watcher_manager)
+        self.assertEqual({change: change.type for change in changes},
+                         {'dave.txt': 'removed', 'bob.py': 'created'})
+
+    def test_settle_inotify(self):
+        """Check that a burst of writes is settled into a single batch when
+        the files are watched with inotify.
+        """
+        watcher_manager = WatcherManager(
+            Inotify, GlobManager(['dave.txt']), False, True)
+        watcher_manager.get_changed_files()
+        for watcher in watcher_manager._watchers.values():
+            self.addCleanup(watcher.close)
+
+        settler = Settler(0.5, 10)
+        self.write_repeatedly('dave.txt', 10, 0.1)
+
+        batches = []
+        deadline = time.time() + 3
+        while time.time() < deadline:
+            watcher_manager.watcher.wait(0.1)
+            changed_files = watcher_manager.get_changed_files()
+            if changed_files:
+                batches.append(settler.settle(changed_files, watcher_manager))
+
+        self.assertEqual(batches, [{'dave.txt'}])
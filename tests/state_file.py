@@ -0,0 +1,81 @@
+"""Test the `StateFile` class.
+"""
+
+import os
+import tempfile
+from unittest import TestCase
+from unittest.mock import patch
+
+from watch_do import StateFile
+
+
+class TestStateFile(TestCase):
+    """Test the `StateFile` class.
+    """
+
+    def setUp(self):
+        """Create a state file in a temporary directory.
+        """
+        self.temporary_directory = tempfile.TemporaryDirectory()
+        self.file_name = os.path.join(self.temporary_directory.name, 'state')
+        self.state_file = StateFile(self.file_name, 'MD5')
+
+    def tearDown(self):
+        """Clear up the temporary directory.
+        """
+        self.temporary_directory.cleanup()
+
+    def count_lines(self):
+        """Count the lines in the state file.
+
+        Returns:
+            int: The number of lines.
+        """
+        with open(self.file_name) as file_handle:
+            return len(file_handle.readlines())
+
+    def test___init__(self):
+        """Check that the properties are stored.
+        """
+        self.assertEqual(self.state_file.file_name, self.file_name)
+        self.assertEqual(self.state_file.watcher_name, 'MD5')
+        self.assertIsNone(self.state_file.load())
+
+    def test_save_and_update(self):
+        """Check that changes are appended and loaded back.
+        """
+        self.state_file.save({'a': 'one', 'b': 2, 'c': (3, 4)})
+        self.assertEqual(self.count_lines(), 4)
+
+        self.state_file.update({'a': 'five', 'd': 'six'}, {'b', 'missing'})
+        self.assertEqual(self.count_lines(), 7)
+
+        self.assertEqual(StateFile(self.file_name, 'MD5').load(),
+                         {'a': 'five', 'c': (3, 4), 'd': 'six'})
+        self.assertIsNone(StateFile(self.file_name, 'SHA1').load())
+
+    def test_update_compact(self):
+        """Check that the log is compacted once it grows too large.
+        """
+        self.state_file.save({'a': 0})
+        with patch('watch_do.state_file._MIN_COMPACT_RECORDS', 4):
+            for value in range(1, 5):
+                self.state_file.update({'a': value}, set())
+
+        self.assertEqual(self.count_lines(), 2)
+        self.assertEqual(StateFile(self.file_name, 'MD5').load(), {'a': 4})
+
+    def test_load_truncated(self):
+        """Check that a partially written record is ignored.
+        """
+        self.state_file.save({'a': 'one'})
+        with open(self.file_name, 'a') as file_handle:
+            file_handle.write('["b", "tw')
+
+        self.assertEqual(self.state_file.load(), {'a': 'one'})
+
+        # The damaged file is rewritten rather than appended to
+        self.state_file.update({'c': 'three'}, set())
+        self.assertEqual(self.count_lines(), 3)
+        self.assertEqual(StateFile(self.file_name, 'MD5').load(),
+                         {'a': 'one', 'c': 'three'})
@@ -1,14 +1,21 @@
 """Test the `WatcherManager` class.
 """
 
+import os
+import tempfile
+
 from tests.helper_functions import TestCaseWithFakeFiles
 from tests.helper_functions import create_file
 from tests.helper_functions import remove_file
 
 from watch_do import WatcherManager
 from watch_do import GlobManager
+from watch_do import StateFile
+from watch_do.change import Change
+from watch_do.watchers.stat import CompositeStat
 from watch_do.watchers import Watcher
 from watch_do.watchers.hash import MD5
+from watch_do.watchers.stat import ModificationTime
 
 
 class TestWatcherManager(TestCaseWithFakeFiles):
@@ -28,6 +35,8 @@ class TestWatcherManager(TestCaseWithFakeFiles):
         self.assertIsInstance(self.watcher_manager.glob_manager, GlobManager)
         self.assertTrue(self.watcher_manager.reglob)
         self.assertTrue(self.watcher_manager.changed_on_remove)
+        self.assertEqual(self.watcher_manager.workers, 1)
+        self.assertIsNone(self.watcher_manager.state_file)
         self.assertEqual(self.watcher_manager.files, set())
 
     def test_get_changed_files(self):
@@ -46,6 +55,7 @@ class TestWatcherManager(TestCaseWithFakeFiles):
                              'rob.txt',
                              'geoff.py'
                          })
+        self.assertEqual(self.watcher_manager.files_generation, 1)
 
         # New file
         create_file('something_random.jpeg')
@@ -61,6 +71,7 @@ class TestWatcherManager(TestCaseWithFakeFiles):
         create_file('dave.txt', 'Hello World')
         self.assertEqual(self.watcher_manager.get_changed_files(),
                          {'dave.txt'})
+        self.assertEqual(self.watcher_manager.files_generation, 3)
 
         # Disable changed_on_remove
         self.watcher_manager._changed_on_remove = False
@@ -78,3 +89,209 @@ class TestWatcherManager(TestCaseWithFakeFiles):
         remove_file('bob.py')
         self.assertEqual(self.watcher_manager.get_changed_files(),
                          set())
+
+    def test_get_changed_files_workers(self):
+        """Check that checking the watchers in parallel gives the same results.
+        """
+        glob_manager = GlobManager(['**/*'])
+        watcher_manager = WatcherManager(
+            MD5, glob_manager, False, True, workers=4)
+
+        self.assertEqual(watcher_manager.get_changed_files(), set())
+        self.assertEqual(len(watcher_manager.files), 18)
+
+        create_file('dave.txt', 'Hello World')
+        create_file('animals/vehicles/bus.py', 'Hello World')
+        self.assertEqual(watcher_manager.get_changed_files(),
+                         {'dave.txt', 'animals/vehicles/bus.py'})
+        self.assertEqual(watcher_manager.get_changed_files(), set())
+
+        # Missing files are ignored without reglobbing...
+        remove_file('bob.py')
+        self.assertEqual(watcher_manager.get_changed_files(), set())
+
+        # ...and re-raised with it
+        watcher_manager._reglob = True
+        watcher_manager._watchers['bob.py'] = MD5('bob.py')
+        with self.assertRaises(FileNotFoundError):
+            watcher_manager._check_watchers()
+
+    def test_get_changes(self):
+        """Check that the type of each change is reported.
+        """
+        def get_changes():
+            return {(change, change.type, change.old_file_name)
+                    for change in self.watcher_manager.get_changes()}
+
+        self.assertEqual(get_changes(), set())
+
+        create_file('new.txt', 'New')
+        create_file('dave.txt', 'Changed')
+        remove_file('rob.txt')
+        self.assertEqual(get_changes(), {
+            ('new.txt', 'created', None),
+            ('dave.txt', 'modified', None),
+            ('rob.txt', 'removed', None)})
+
+        # Files are paired up by their hash
+        os.rename('dave.txt', 'renamed.txt')
+        self.assertEqual(get_changes(), {
+            ('renamed.txt', 'renamed', 'dave.txt')})
+
+        # Ambiguous pairs aren't renames
+        os.rename('bob.py', 'bob2.py')
+        os.rename('geoff.py', 'geoff2.py')
+        self.assertEqual(get_changes(), {
+            ('bob2.py', 'created', None), ('geoff2.py', 'created', None),
+            ('bob.py', 'removed', None), ('geoff.py', 'removed', None)})
+
+        self.assertEqual(self.watcher_manager.get_changed_files(), set())
+
+        # Files are paired up by their inode, even if their contents change
+        watcher_manager = WatcherManager(
+            CompositeStat, GlobManager(['*']), True, False)
+        watcher_manager.get_changes()
+        os.rename('new.txt', 'newer.txt')
+        create_file('newer.txt', 'Newer')
+        self.assertEqual(
+            [repr(change) for change in watcher_manager.get_changes()],
+            [repr(Change('newer.txt', 'renamed', 'new.txt'))])
+
+        # The default watcher pairs files up by the inode stored in its table
+        watcher_manager = WatcherManager(
+            ModificationTime, GlobManager(['*']), True, True)
+        watcher_manager.get_changes()
+        os.rename('newer.txt', 'newest.txt')
+        create_file('other.txt')
+        self.assertEqual(
+            {(change, change.type, change.old_file_name)
+             for change in watcher_manager.get_changes()},
+            {('newest.txt', 'renamed', 'newer.txt'),
+             ('other.txt', 'created', None)})
+
+        # Watchers that can't identify files don't pair them up
+        class Subclass(ModificationTime):
+            """A subclass of a watcher, which isn't stored in a table.
+            """
+            __slots__ = ()
+
+        watcher_manager = WatcherManager(
+            Subclass, GlobManager(['*']), True, True)
+        watcher_manager.get_changes()
+        os.rename('newest.txt', 'newer.txt')
+        self.assertEqual(
+            {(change, change.type) for change in
+             watcher_manager.get_changes()},
+            {('newer.txt', 'created'), ('newest.txt', 'removed')})
+
+    def test_get_changed_files_state_file(self):
+        """Check that changes made between runs are reported.
+        """
+        state_directory = tempfile.TemporaryDirectory()
+        self.addCleanup(state_directory.cleanup)
+        state_file_name = os.path.join(state_directory.name, 'state')
+
+        def create_watcher_manager():
+            """Create a manager for a new run using the state file.
+            """
+            return WatcherManager(
+                MD5, GlobManager(['*']), True, True,
+                state_file=StateFile(state_file_name, 'MD5'))
+
+        def get_changed_files_and_save():
+            """Check a new run for changes, then save its state.
+            """
+            watcher_manager = create_watcher_manager()
+            changed_files = watcher_manager.get_changed_files()
+            watcher_manager.save_state()
+            return changed_files
+
+        # Without a saved state, nothing is reported
+        watcher_manager = create_watcher_manager()
+        self.assertEqual(watcher_manager.get_changed_files(), set())
+        watcher_manager.save_state()
+
+        create_file('dave.txt', 'Hello World')
+        self.assertEqual(watcher_manager.get_changed_files(), {'dave.txt'})
+        watcher_manager.save_state()
+
+        # Nothing changed between runs
+        self.assertEqual(get_changed_files_and_save(), set())
+
+        # Changed, added and removed between runs
+        create_file('dave.txt', 'Goodbye')
+        create_file('new.txt', 'New')
+        remove_file('bob.py')
+        self.assertEqual(get_changed_files_and_save(),
+                         {'dave.txt', 'new.txt', 'bob.py'})
+        self.assertEqual(get_changed_files_and_save(), set())
+
+        # Changes that weren't saved (i.e. Watch Do was killed while the
+        # doers were running) are reported again
+        watcher_manager = create_watcher_manager()
+        watcher_manager.get_changed_files()
+        create_file('dave.txt', 'Unsaved')
+        remove_file('new.txt')
+        self.assertEqual(watcher_manager.get_changed_files(),
+                         {'dave.txt', 'new.txt'})
+        self.assertEqual(get_changed_files_and_save(),
+                         {'dave.txt', 'new.txt'})
+        self.assertEqual(get_changed_files_and_save(), set())
+
+        # A state from another watcher is ignored
+        create_file('dave.txt', 'Hello')
+        watcher_manager = create_watcher_manager()
+        watcher_manager._state_file = StateFile(state_file_name, 'SHA1')
+        self.assertEqual(watcher_manager.get_changed_files(), set())
+
+    def test_get_changed_files_table(self):
+        """Check that watchers stored in a table are reported the same way.
+        """
+        state_directory = tempfile.TemporaryDirectory()
+        self.addCleanup(state_directory.cleanup)
+        state_file = StateFile(
+            os.path.join(state_directory.name, 'state'), 'ModificationTime')
+
+        watcher_manager = WatcherManager(
+            ModificationTime, self.glob_manager, True, True, workers=4,
+            state_file=state_file)
+        self.assertIsNotNone(watcher_manager._table)
+        self.assertEqual(watcher_manager._watchers, {})
+
+        self.assertEqual(watcher_manager.get_changed_files(), set())
+        self.assertEqual(len(watcher_manager._table), 6)
+
+        os.utime('dave.txt', (0, 0))
+        create_file('new.txt')
+        remove_file('bob.py')
+        self.assertEqual(watcher_manager.get_changed_files(),
+                         {'dave.txt', 'new.txt', 'bob.py'})
+        self.assertEqual(watcher_manager.get_changed_files(), set())
+        watcher_manager.save_state()
+
+        # The values in the table are restored from the state file
+        os.utime('rob.txt', (0, 0))
+        watcher_manager = WatcherManager(
+            ModificationTime, GlobManager(['*']), True, True,
+            state_file=state_file)
+        self.assertEqual(watcher_manager.get_changed_files(), {'rob.txt'})
+        watcher_manager.save_state()
+
+        # Files renamed while Watch Do wasn't running are paired up too
+        os.rename('rob.txt', 'robert.txt')
+        watcher_manager = WatcherManager(
+            ModificationTime, GlobManager(['*']), True, True,
+            state_file=state_file)
+        self.assertEqual(
+            [repr(change) for change in watcher_manager.get_changes()],
+            [repr(Change('robert.txt', 'renamed', 'rob.txt'))])
+
+        # Subclasses are created as objects, they may override the value
+        class Subclass(ModificationTime):
+            """A subclass of a watcher that declares its stat fields.
+            """
+            __slots__ = ()
+
+        watcher_manager = WatcherManager(
+            Subclass, self.glob_manager, True, True)
+        self.assertIsNone(watcher_manager._table)
@@ -0,0 +1,114 @@
+"""Test the `WatcherTable` class.
+"""
+
+import os
+
+from tests.helper_functions import TestCaseWithFakeFiles
+from tests.helper_functions import remove_file
+
+from watch_do import WatcherTable
+
+
+class TestWatcherTable(TestCaseWithFakeFiles):
+    """Test the `WatcherTable` class.
+    """
+
+    def setUp(self):
+        super(TestWatcherTable, self).setUp()
+
+        self.table = WatcherTable(('st_mtime', 'st_size', 'st_ino'))
+        for file_name in ['dave.txt', 'bob.py', 'rob.txt']:
+            self.table.add(file_name)
+
+    def check(self):
+        """Check all of the rows of the table.
+
+        Returns:
+            set: The files that have changed.
+        """
+        return self.table.check(range(len(self.table)))
+
+    def test_add_and_remove(self):
+        """Check that rows are moved to fill in removed ones.
+        """
+        self.assertEqual(self.table.stat_fields,
+                         ('st_mtime', 'st_size', 'st_ino'))
+        self.assertEqual(len(self.table), 3)
+
+        self.table.add('dave.txt')
+        self.assertEqual(len(self.table), 3)
+
+        os.utime('rob.txt', (0, 0))
+        self.check()
+        self.table.remove('dave.txt')
+        self.assertEqual(len(self.table), 2)
+        self.assertNotIn('dave.txt', self.table)
+        self.assertEqual(self.table.get_value('rob.txt'),
+                         (0.0, 0, os.stat('rob.txt').st_ino))
+
+        self.table.remove('rob.txt')
+        self.table.remove('bob.py')
+        self.assertEqual(len(self.table), 0)
+
+    def test_check(self):
+        """Check that changes are reported after the first check.
+        """
+        self.assertIsNone(self.table.get_value('dave.txt'))
+        self.assertEqual(self.check(), set())
+        self.assertEqual(self.check(), set())
+
+        os.utime('dave.txt', (0, 0))
+        with open('bob.py', 'a') as file_handle:
+            file_handle.write('Hello')
+        self.assertEqual(self.check(), {'dave.txt', 'bob.py'})
+        self.assertEqual(self.check(), set())
+
+        remove_file('rob.txt')
+        self.assertEqual(self.check(), set())
+        with self.assertRaises(FileNotFoundError):
+            self.table.check(range(len(self.table)), ignore_missing=False)
+
+    def test_restore(self):
+        """Check that restored values are compared on the first check.
+        """
+        os.utime('dave.txt', (0, 0))
+        self.check()
+        value = self.table.get_value('dave.txt')
+
+        table = WatcherTable(('st_mtime', 'st_size', 'st_ino'))
+        table.add('dave.txt')
+        table.add('bob.py')
+        table.restore('dave.txt', value)
+        table.restore('bob.py', ('not', 'a', 'value'))
+        self.assertEqual(table.check(range(2)), set())
+
+        table.restore('dave.txt', (1.0,) + value[1:])
+        self.assertEqual(table.check(range(2)), {'dave.txt'})
+
+    def test_identity(self):
+        """Check that the identity fields are stored, without changes to them
+        being reported.
+        """
+        table = WatcherTable(('st_size',), ('st_dev', 'st_ino'))
+        self.assertEqual(table.identity_fields, ('st_dev', 'st_ino'))
+        table.add('dave.txt')
+        table.check(range(1))
+
+        stat = os.stat('dave.txt')
+        value = table.get_value('dave.txt')
+        self.assertEqual(value, (0, stat.st_dev, stat.st_ino))
+        self.assertEqual(table.get_identity(value),
+                         (stat.st_dev, stat.st_ino))
+
+        # Values from a table without the identity fields can't be paired
+        self.assertIsNone(table.get_identity((0,)))
+        self.assertIsNone(table.get_identity('0.0'))
+        self.check()
+        self.assertIsNone(
+            self.table.get_identity(self.table.get_value('dave.txt')))
+
+        # Replacing the file changes its inode, but not its size
+        os.rename('rob.txt', 'dave.txt')
+        self.assertEqual(table.check(range(1)), set())
+        self.assertEqual(table.get_identity(table.get_value('dave.txt'))[1],
+                         os.stat('dave.txt').st_ino)
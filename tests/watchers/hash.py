@@ -1,10 +1,18 @@
-"""Test the `MD5` watcher class.
+"""Test the hash based watcher classes.
 """
 
+import os
 from unittest import TestCase
+from unittest.mock import patch
 import tempfile
 
 from watch_do.watchers import MD5
+from watch_do.watchers import SHA1
+from watch_do.watchers import Blake2
+from watch_do.watchers import CRC32
+from watch_do.watchers import HybridMD5
+from watch_do.watchers import hash as hash_watchers
+from watch_do import HashCache
 
 
 class TestMD5(TestCase):
@@ -41,3 +49,120 @@ class TestMD5(TestCase):
 
         md5 = MD5('/some/made/up/file/path')
         self.assertRaises(FileNotFoundError, md5._get_value)
+
+    def test__get_value_algorithms(self):
+        """Check that the other algorithms hash the file's contents.
+        """
+        self.temporary_file.write(b'Hello')
+
+        file_name = self.temporary_file.name
+        self.assertEqual(SHA1(file_name)._get_value(),
+                         'f7ff9e8b7bb2e09b70935a5d785e0cc5d9d0abf0')
+        self.assertEqual(Blake2(file_name)._get_value(),
+                         'ad10196e1159e75dd6be7d03f75be04f')
+        self.assertEqual(CRC32(file_name)._get_value(), 'f7d18982')
+
+
+class TestHybridMD5(TestCase):
+    """Test the `HybridMD5` watcher class.
+    """
+
+    def setUp(self):
+        """Create an instance of the watcher referencing a temporary file.
+        """
+        # No buffering, all data is written straight to the file
+        self.temporary_file = tempfile.NamedTemporaryFile(buffering=0)
+        self.temporary_file.write(b'Hello')
+
+        # Age the file, so that it isn't considered to be racy
+        os.utime(self.temporary_file.name, (0, 0))
+
+        self.hybrid_md5 = HybridMD5(self.temporary_file.name)
+
+    def tearDown(self):
+        """Clear up the temporary file
+        """
+        self.temporary_file.close()
+
+    def test__get_value(self):
+        """Check that the file is only re-hashed when its stat changes.
+        """
+        with patch.object(MD5.hasher, 'hash_file',
+                          wraps=MD5.hasher.hash_file) as md5_get_value:
+            self.assertEqual(self.hybrid_md5._get_value(),
+                             '8b1a9953c4611296a827abf8c47804d7')
+            self.assertEqual(self.hybrid_md5._get_value(),
+                             '8b1a9953c4611296a827abf8c47804d7')
+            self.assertEqual(md5_get_value.call_count, 1)
+
+            # Touching the file re-hashes it, but the value is unchanged
+            os.utime(self.temporary_file.name, (1, 1))
+            self.assertEqual(self.hybrid_md5._get_value(),
+                             '8b1a9953c4611296a827abf8c47804d7')
+            self.assertEqual(md5_get_value.call_count, 2)
+
+            self.temporary_file.write(b'World')
+            os.utime(self.temporary_file.name, (2, 2))
+            self.assertEqual(self.hybrid_md5._get_value(),
+                             '68e109f0f40ca72a15e05cc22786f8e6')
+
+        md5 = HybridMD5('/some/made/up/file/path')
+        self.assertRaises(FileNotFoundError, md5._get_value)
+
+    def test__get_value_racy(self):
+        """Check that recently modified files are always re-hashed.
+        """
+        os.utime(self.temporary_file.name)
+        with patch.object(MD5.hasher, 'hash_file',
+                          wraps=MD5.hasher.hash_file) as md5_get_value:
+            self.hybrid_md5._get_value()
+            self.hybrid_md5._get_value()
+            self.assertEqual(md5_get_value.call_count, 2)
+
+
+class TestHashCache(TestCase):
+    """Test the hash based watchers sharing a `HashCache`.
+    """
+
+    def setUp(self):
+        """Create an aged temporary file and an empty cache.
+        """
+        self.temporary_directory = tempfile.TemporaryDirectory()
+        self.file_name = os.path.join(self.temporary_directory.name, 'file')
+        with open(self.file_name, 'wb') as file_handle:
+            file_handle.write(b'Hello')
+
+        os.utime(self.file_name, (0, 0))
+
+        self.cache = HashCache(
+            os.path.join(self.temporary_directory.name, 'hashes'))
+        hash_watchers.set_cache(self.cache)
+
+    def tearDown(self):
+        """Stop using the cache and clear up the temporary directory.
+        """
+        hash_watchers.set_cache(None)
+        self.temporary_directory.cleanup()
+
+    def test__get_value(self):
+        """Check that cached hashes are used until the file changes.
+        """
+        with patch.object(MD5.hasher, 'hash_file',
+                          wraps=MD5.hasher.hash_file) as hash_file:
+            self.assertEqual(MD5(self.file_name)._get_value(),
+                             '8b1a9953c4611296a827abf8c47804d7')
+            self.assertEqual(HybridMD5(self.file_name)._get_value(),
+                             '8b1a9953c4611296a827abf8c47804d7')
+            self.assertEqual(hash_file.call_count, 1)
+
+            with open(self.file_name, 'ab') as file_handle:
+                file_handle.write(b'World')
+            os.utime(self.file_name, (1, 1))
+
+            self.assertEqual(MD5(self.file_name)._get_value(),
+                             '68e109f0f40ca72a15e05cc22786f8e6')
+            self.assertEqual(hash_file.call_count, 2)
+
+        # Each algorithm has its own entries
+        self.assertEqual(CRC32(self.file_name)._get_value(), '77770c79')
+        self.assertEqual(len(self.cache), 3)
@@ -0,0 +1,92 @@
+"""Test the `Inotify` watcher.
+"""
+
+import os
+import errno
+from unittest.mock import patch
+from concurrent.futures import ThreadPoolExecutor
+
+from tests.helper_functions import TestCaseWithFakeFiles
+from tests.helper_functions import create_file
+from tests.helper_functions import remove_file
+
+from watch_do.watchers import Inotify
+
+
+class TestInotify(TestCaseWithFakeFiles):
+    """Test the `Inotify` watcher.
+    """
+
+    def setUp(self):
+        """Create watchers for a couple of the fake files.
+        """
+        super(TestInotify, self).setUp()
+
+        self.bob = Inotify('bob.py')
+        self.bus = Inotify('animals/vehicles/bus.py')
+
+    def tearDown(self):
+        self.bob.close()
+        self.bus.close()
+
+        super(TestInotify, self).tearDown()
+
+    def test_has_changed(self):
+        """Check that changes are picked up after waiting for them.
+        """
+        self.assertFalse(self.bob.has_changed())
+        self.assertFalse(self.bus.has_changed())
+
+        # Force a different modification time, as the write may have happened
+        # within the file system's timestamp granularity
+        create_file('bob.py', 'Hello')
+        os.utime('bob.py', (0, 0))
+        Inotify.wait(1)
+        self.assertTrue(self.bob.has_changed())
+        self.assertFalse(self.bus.has_changed())
+
+        Inotify.wait(0)
+        self.assertFalse(self.bob.has_changed())
+
+        remove_file('animals/vehicles/bus.py')
+        Inotify.wait(1)
+        self.assertRaises(FileNotFoundError, self.bus.has_changed)
+
+    def test_polling_fallback(self):
+        """Check that files are polled if their directory can't be watched.
+        """
+        watcher = Inotify('animals/dog.py')
+        self.assertFalse(watcher.has_changed())
+
+        with patch.object(Inotify._registry, 'unwatchable', {'animals'}):
+            os.utime('animals/dog.py', (0, 0))
+            self.assertTrue(watcher.has_changed())
+
+        watcher.close()
+
+    def test__watch(self):
+        """Check that exhausting the watch limit marks a directory as polled.
+        """
+        notifier = Inotify._registry.get_notifier()
+        if notifier is None:
+            self.skipTest('inotify is not available')
+
+        limit = OSError(errno.ENOSPC, 'No space left on device')
+        with patch.object(notifier, 'add_watch', side_effect=limit), \
+                patch.object(Inotify._registry, 'unwatchable', set()):
+            self.assertFalse(Inotify._registry.watch('animals'))
+            self.assertIn('animals', Inotify._registry.unwatchable)
+
+    def test_threads(self):
+        """Check that the shared state stays consistent across threads.
+        """
+        def check(_):
+            watcher = Inotify('animals/cow.txt')
+            watcher.has_changed()
+            watcher.close()
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            list(executor.map(check, range(200)))
+
+        self.assertNotIn('animals/cow.txt', Inotify._registry.files)
+        self.assertNotIn('animals', Inotify._registry.directories)
@@ -2,11 +2,14 @@
 """
 
 import os
+import time
 
 from unittest import TestCase
+from unittest.mock import patch
 import tempfile
 
 from watch_do.watchers import ModificationTime
+from watch_do.watchers import CompositeStat
 
 
 class TestModificationTime(TestCase):
@@ -32,3 +35,79 @@ class TestModificationTime(TestCase):
         os.utime(self.temporary_file.name, (0, 1234567890))
 
         self.assertEqual(self.modification_time._get_value(), '1234567890.0')
+
+    def test_get_identity(self):
+        """Check that files aren't identified by their modification time.
+        """
+        self.assertIsNone(ModificationTime.get_identity('0.0'))
+
+
+class TestCompositeStat(TestCase):
+    """Test the `CompositeStat` watcher.
+    """
+
+    def setUp(self):
+        """Create an instance of the watcher referencing a temporary file.
+        """
+        # No buffering, all data is written straight to the file
+        self.temporary_file = tempfile.NamedTemporaryFile(buffering=0)
+        self.temporary_file.write(b'Hello')
+
+        # Age the file, so that it isn't considered to be racy
+        os.utime(self.temporary_file.name, ns=(0, 0))
+
+        self.composite_stat = CompositeStat(self.temporary_file.name)
+
+    def tearDown(self):
+        """Clear up the temporary file
+        """
+        self.temporary_file.close()
+
+    def test__get_value(self):
+        """Check that the nanosecond stat of the file is returned.
+        """
+        stat = os.stat(self.temporary_file.name)
+        self.assertEqual(
+            self.composite_stat._get_value(),
+            (0, stat.st_ctime_ns, 5, stat.st_dev, stat.st_ino, None))
+
+        os.utime(self.temporary_file.name, ns=(0, 1))
+        self.assertEqual(self.composite_stat._get_value()[0], 1)
+
+        composite_stat = CompositeStat('/some/made/up/file/path')
+        self.assertRaises(FileNotFoundError, composite_stat._get_value)
+
+    def test_get_identity(self):
+        """Check that files are identified by their device and inode.
+        """
+        stat = os.stat(self.temporary_file.name)
+        self.assertEqual(
+            CompositeStat.get_identity(self.composite_stat._get_value()),
+            (stat.st_dev, stat.st_ino))
+        self.assertIsNone(CompositeStat.get_identity(None))
+
+    def test_has_changed_racy(self):
+        """Check that rewrites that don't change the stat are detected.
+        """
+        path = self.temporary_file.name
+        mtime = time.time_ns()
+        os.utime(path, ns=(mtime, mtime))
+        self.assertFalse(self.composite_stat.has_changed())
+        self.assertIsNotNone(self.composite_stat.last_value[-1])
+
+        # Rewrite the file, keeping the stat the same
+        with patch('os.stat', return_value=os.stat(path)):
+            self.temporary_file.seek(0)
+            self.temporary_file.write(b'World')
+            self.assertTrue(self.composite_stat.has_changed())
+            self.assertFalse(self.composite_stat.has_changed())
+
+            # Once the file is no longer racy, it's checked one last time
+            with patch('time.time', return_value=mtime / 1e9 + 10):
+                self.temporary_file.seek(0)
+                self.temporary_file.write(b'Hello')
+                self.assertTrue(self.composite_stat.has_changed())
+
+                self.temporary_file.seek(0)
+                self.temporary_file.write(b'World')
+                self.assertFalse(self.composite_stat.has_changed())
@@ -52,6 +52,19 @@ class TestWatcher(TestCase):
             # Nothing changed, so the result should be False now
             self.assertFalse(self.watcher.has_changed())
 
+    def test_restore(self):
+        """Check that a restored value is compared against on the first call.
+        """
+        self.assertIsNone(self.watcher.last_value)
+
+        self.watcher.restore('World')
+        self.assertEqual(self.watcher.last_value, 'World')
+        self.assertTrue(self.watcher.has_changed())
+        self.assertEqual(self.watcher.last_value, 'Hello')
+
+        self.watcher.restore('Hello')
+        self.assertFalse(self.watcher.has_changed())
+
     def test__get_value(self):
         """Check this method isn't implemented in the base class.
         """
@@ -4,7 +4,22 @@ Contains the generic helper classes aiding with the general purpose of the
 program.
 """
 
+from .glob_matcher import GlobMatcher
+from .ignore_rules import IgnoreRules
 from .glob_manager import GlobManager
 from .watcher_manager import WatcherManager
 from .banner_builder import BannerBuilder
 from .doer_manager import DoerManager
+from .notifier import Notifier
+from .hasher import Hasher
+from .hash_cache import HashCache
+from .state_file import StateFile
+from .watcher_table import WatcherTable
+from .settler import Settler
+from .change_queue import ChangeQueue
+from .detector import Detector
+from .doer_pool import DoerPool
+from .result_cache import ResultCache
+from .change import Change
+from .event_writer import EventWriter
+from .renderer import Renderer
@@ -0,0 +1,48 @@
+"""The :func:`.atomic_write` function writes a file by writing a temporary file
+alongside it and then renaming it over the original, so that a partially
+written file is never read.
+
+As an example, the following code would replace the contents of a file.
+
+>>> with atomic_write('results.json', prefix='.results-') as handle:
+...     json.dump(results, handle)
+"""
+
+import os
+import tempfile
+from contextlib import contextmanager
+
+
+@contextmanager
+def atomic_write(file_name, mode='w', prefix='.watch-do-'):
+    """Open a temporary file that replaces a file once it has been written.
+
+    The directory of the file is created if it doesn't exist. If the
+    ``with`` block raises an exception, the temporary file is removed and the
+    original file is left untouched.
+
+    Parameters:
+        file_name (str): The path of the file to replace.
+        mode (str): The mode to open the temporary file with, either ``'w'``
+            or ``'wb'``.
+        prefix (str): The prefix of the temporary file's name.
+
+    Yields:
+        file: The temporary file, opened using ``mode``.
+
+    Raises:
+        OSError: If the file couldn't be written.
+    """
+    directory = os.path.dirname(file_name) or '.'
+    os.makedirs(directory, exist_ok=True)
+
+    file_descriptor, temporary_name = tempfile.mkstemp(
+        dir=directory, prefix=prefix)
+    try:
+        encoding = None if 'b' in mode else 'UTF-8'
+        with os.fdopen(file_descriptor, mode, encoding=encoding) as handle:
+            yield handle
+        os.replace(temporary_name, file_name)
+    except BaseException:
+        os.unlink(temporary_name)
+        raise
@@ -47,7 +47,7 @@ class BannerBuilder:
 
     @staticmethod
     def build_footer(trigger_time, trigger_cause,
-                     doer_run_time, files, watch_method):
+                     doer_run_time, files, watch_method, job_timings=None):
         """Build the footer from the provided metadata.
 
         This interpolates the metadata provided by the parameters into a
@@ -64,6 +64,9 @@ class BannerBuilder:
                 being watched.
             watch_method (:class:`.Watcher`): A reference to the class that is
                 being used to watch the files.
+            job_timings (list): An optional ``list`` of ``(file_name,
+                duration)`` tuples, the time the doers took to run for each
+                file when they were run concurrently.
 
         Returns:
             str: A string containing the generated footer.
@@ -84,4 +87,6 @@ class BannerBuilder:
             trigger_cause=trigger_cause_string,
             doer_run_time='{:.2f}'.format(doer_run_time),
             number_of_files=len(files),
-            watch_method=watch_method.__name__)
+            watch_method=watch_method.__name__) + ''.join(
+                '\n  {}: {:.2f} seconds'.format(file_name, duration)
+                for file_name, duration in job_timings or [])
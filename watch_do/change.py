@@ -0,0 +1,125 @@
+"""The :class:`.Change` class describes how a file has changed.
+
+A :class:`.Change` is a string (the name of the file) with the type of the
+change attached, so it can be used anywhere a file name is expected. The type
+is one of :data:`CREATED`, :data:`MODIFIED`, :data:`REMOVED` or
+:data:`RENAMED`.
+
+>>> change = Change('src/new.py', RENAMED, 'src/old.py')
+>>> change == 'src/new.py'
+True
+>>> change.type, change.old_file_name
+('renamed', 'src/old.py')
+
+When a file changes more than once before the doers are run, the changes are
+combined using :meth:`Change.merge`.
+
+>>> Change('a.py', CREATED).merge(Change('a.py', MODIFIED)).type
+'created'
+"""
+
+
+#: str: The file has started being watched, i.e. it was created.
+CREATED = 'created'
+
+#: str: The file has been modified.
+MODIFIED = 'modified'
+
+#: str: The file has stopped being watched, i.e. it was removed.
+REMOVED = 'removed'
+
+#: str: The file was moved from another watched file.
+RENAMED = 'renamed'
+
+#: tuple: All of the types of change.
+TYPES = (CREATED, MODIFIED, REMOVED, RENAMED)
+
+
+class Change(str):
+    """This class is the name of a changed file, along with the type of the
+    change.
+    """
+
+    def __new__(cls, file_name, change_type=MODIFIED, old_file_name=None):
+        """Create a :class:`.Change`.
+
+        Parameters:
+            file_name (str): The name of the changed file.
+            change_type (str): The type of the change, one of :data:`TYPES`.
+            old_file_name (str): The file's previous name, if it was renamed.
+
+        Returns:
+            :class:`.Change`: The change.
+        """
+        change = super(Change, cls).__new__(cls, file_name)
+        change.type = change_type
+        change.old_file_name = old_file_name
+
+        return change
+
+    def __repr__(self):
+        if self.old_file_name is None:
+            return 'Change({!r}, {!r})'.format(str(self), self.type)
+
+        return 'Change({!r}, {!r}, {!r})'.format(
+            str(self), self.type, self.old_file_name)
+
+    def __reduce__(self):
+        return (Change, (str(self), self.type, self.old_file_name))
+
+    @property
+    def file_name(self):
+        """str: The name of the changed file.
+        """
+        return str(self)
+
+    def merge(self, later):
+        """Combine this change with a later change to the same file.
+
+        Parameters:
+            later (:class:`.Change`): The later change.
+
+        Returns:
+            :class:`.Change`: A change describing both changes, i.e. a file
+            that was created and then modified has been created.
+        """
+        if later.type == MODIFIED and self.type in (CREATED, RENAMED):
+            return self
+
+        if later.type == CREATED and self.type == REMOVED:
+            return Change(self, MODIFIED)
+
+        return later
+
+
+def get_type(file_name):
+    """Get the type of change made to a file.
+
+    Parameters:
+        file_name (str): The changed file, either a :class:`.Change` or a
+            plain string.
+
+    Returns:
+        str: The type of the change, plain strings are considered to have
+        been modified.
+    """
+    return getattr(file_name, 'type', MODIFIED)
+
+
+def merge_changes(earlier, later):
+    """Combine two changes to the same file, see :meth:`.Change.merge`.
+
+    Parameters:
+        earlier (str): The earlier change, either a :class:`.Change` or a
+            plain file name.
+        later (str): The later change, either a :class:`.Change` or a plain
+            file name.
+
+    Returns:
+        str: The combined change, the later change if either of them is a
+        plain file name.
+    """
+    if isinstance(earlier, Change) and isinstance(later, Change):
+        return earlier.merge(later)
+
+    return later
@@ -0,0 +1,129 @@
+"""The :class:`.ChangeQueue` class passes changed files from the thread
+detecting changes to the thread running the doers.
+
+Each file is only queued once, however many times it changes before the
+changes are taken from the queue. This means that a file that is changed
+repeatedly while the doers are running results in a single follow-up run.
+
+As an example, the following code would queue a file twice and take the
+changes from the queue, along with the time the first change was queued.
+
+>>> change_queue = ChangeQueue()
+>>> change_queue.put({'main.py'})
+>>> change_queue.put({'main.py'})
+>>> change_queue.get()
+({'main.py'}, 1514764800.0)
+
+The changes made to a file while it's queued are combined, see
+:meth:`.Change.merge`.
+"""
+
+import time
+import threading
+
+from .change import merge_changes
+
+
+class ChangeQueue:
+    """This class queues changed files, ignoring duplicates.
+
+    It's safe to use from multiple threads.
+    """
+
+    def __init__(self):
+        """Initialise an empty :class:`.ChangeQueue`.
+        """
+        self._condition = threading.Condition()
+        self._files = {}
+        self._trigger_time = None
+        self._exception = None
+
+    def __len__(self):
+        with self._condition:
+            return len(self._files)
+
+    def put(self, files, trigger_time=None):
+        """Queue changed files.
+
+        Parameters:
+            files (set): The files that have changed, either
+                :class:`.Change`'s or plain file names. Changes to files that
+                are already queued are combined with the queued change.
+            trigger_time (float): The time (as a unix timestamp) the changes
+                were detected, defaults to the current time.
+        """
+        if not files:
+            return
+
+        with self._condition:
+            if self._trigger_time is None:
+                self._trigger_time = trigger_time or time.time()
+
+            for file_name in files:
+                queued = self._files.get(file_name)
+                if queued is not None:
+                    file_name = merge_changes(queued, file_name)
+
+                self._files[file_name] = file_name
+
+            self._condition.notify_all()
+
+    def close(self, exception):
+        """Stop the queue, once the queued files have been taken any waiting
+        and future calls to :meth:`get` raise an exception.
+
+        Parameters:
+            exception (Exception): The exception to raise, i.e. the error that
+                stopped changes from being detected.
+        """
+        with self._condition:
+            self._exception = exception
+            self._condition.notify_all()
+
+    def wait(self, timeout=None):
+        """Wait for files to be queued, without taking them.
+
+        Parameters:
+            timeout (float): The maximum time (in seconds) to wait, or
+                ``None`` to wait indefinitely.
+
+        Returns:
+            bool: True if there are queued files or the queue has been closed.
+        """
+        with self._condition:
+            return bool(self._condition.wait_for(
+                lambda: self._files or self._exception is not None, timeout))
+
+    def get(self, timeout=None):
+        """Take all of the queued files, waiting for a change if there are
+        none.
+
+        Parameters:
+            timeout (float): The maximum time (in seconds) to wait, or
+                ``None`` to wait indefinitely.
+
+        Raises:
+            Exception: The exception passed to :meth:`close`, if the queue has
+                been closed and is empty.
+
+        Returns:
+            tuple: A ``(files, trigger_time)`` tuple, where ``files`` is a
+            ``set`` of the changed files and ``trigger_time`` is the time
+            (as a unix timestamp) the first of them was queued. The ``set``
+            is empty (and the time ``None``) if the timeout elapsed.
+        """
+        with self._condition:
+            self._condition.wait_for(
+                lambda: self._files or self._exception is not None, timeout)
+
+            # Files queued before the queue was closed are still returned
+            if not self._files and self._exception is not None:
+                raise self._exception
+
+            files = set(self._files.values())
+            trigger_time = self._trigger_time
+
+            self._files = {}
+            self._trigger_time = None
+
+        return files, trigger_time
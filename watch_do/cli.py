@@ -6,7 +6,10 @@ The command line entry points into the program.
 import os
 import sys
 import time
+import signal
+import hashlib
 import argparse
+import threading
 
 from . import doers
 from . import watchers
@@ -14,7 +17,26 @@ from . import GlobManager
 from . import WatcherManager
 from . import DoerManager
 from . import BannerBuilder
+from . import HashCache
+from . import StateFile
+from . import Settler
+from . import ChangeQueue
+from . import Detector
+from . import DoerPool
+from . import ResultCache
+from . import EventWriter
+from . import Renderer
+from .doer_manager import DoerRun
+from .watchers import hash as hash_watchers
+from .doers import shell as shell_doers
 from .exceptions import UnknownDoer
+from .exceptions import InvalidCommand
+from .change import TYPES as CHANGE_TYPES
+from .change import get_type
+
+
+# The minimum time (in seconds) between saves of the hash cache
+_CACHE_SAVE_INTERVAL = 60
 
 
 def get_subclasses_of(parent_class, package_to_search):
@@ -40,10 +62,255 @@ def get_subclasses_of(parent_class, package_to_search):
     return modules
 
 
-def clear_screen():
-    """Platform independent way of clearing the terminal.
+def clear_screen(stream=None):
+    """Clear the terminal using ANSI escape sequences, without starting a
+    process. Nothing is written if the stream isn't a terminal.
+
+    Parameters:
+        stream (file): The stream to clear, defaults to ``sys.stdout``.
+    """
+    Renderer(stream).clear()
+
+
+def get_cache_directory():
+    """Get the directory that Watch Do's caches are stored in by default.
+
+    Returns:
+        str: The ``watch-do`` directory inside of ``$XDG_CACHE_HOME``, or
+        ``~/.cache`` if it isn't set.
+    """
+    cache_home = (os.environ.get('XDG_CACHE_HOME') or
+                  os.path.join(os.path.expanduser('~'), '.cache'))
+
+    return os.path.join(cache_home, 'watch-do')
+
+
+def get_hash_cache(cache_directory, args):
+    """Get the hash cache for the files being watched.
+
+    Instances watching the same globs from the same directory share a cache.
+
+    Parameters:
+        cache_directory (str): The directory containing the caches.
+        args (argparse.Namespace): The parsed command line arguments.
+
+    Returns:
+        :class:`.HashCache`: The cache.
     """
-    os.system('cls' if os.name == 'nt' else 'clear')
+    key = '\0'.join([os.getcwd()] + args.globs + ['--'] + args.excludes)
+    name = 'hashes-' + hashlib.sha1(key.encode('UTF-8')).hexdigest()[:16]
+
+    return HashCache(os.path.join(cache_directory, name))
+
+
+def get_result_cache(cache_directory, args):
+    """Get the result cache for the doers being run.
+
+    Instances running the same commands from the same directory share a
+    cache.
+
+    Parameters:
+        cache_directory (str): The directory containing the caches.
+        args (argparse.Namespace): The parsed command line arguments.
+
+    Returns:
+        :class:`.ResultCache`: The cache.
+    """
+    key = '\0'.join([os.getcwd()] + args.commands)
+    name = 'results-' + hashlib.sha1(key.encode('UTF-8')).hexdigest()[:16]
+
+    return ResultCache(os.path.join(cache_directory, name),
+                       replay=args.replay_output)
+
+
+def save_result_cache(result_cache):
+    """Save the result cache, reporting (rather than raising) any errors.
+
+    Parameters:
+        result_cache (:class:`.ResultCache`): The cache to save.
+    """
+    try:
+        result_cache.save()
+    except OSError as ex:
+        print('Unable to save the result cache: {}'.format(ex),
+              file=sys.stderr)
+
+
+def save_hash_cache(hash_cache, watched_files):
+    """Save the hash cache, reporting (rather than raising) any errors.
+
+    Parameters:
+        hash_cache (:class:`.HashCache`): The cache to save.
+        watched_files (set): The files being watched, entries for other files
+            are evicted.
+    """
+    try:
+        hash_cache.save(watched_files)
+    except OSError as ex:
+        print('Unable to save the hash cache: {}'.format(ex),
+              file=sys.stderr)
+
+
+def get_event_writer(file_descriptor):
+    """Get the event writer used by ``--output json``.
+
+    Parameters:
+        file_descriptor (int): The file descriptor to write the events to, it
+            isn't closed when the writer's stream is.
+
+    Raises:
+        OSError: If the file descriptor can't be opened.
+
+    Returns:
+        :class:`.EventWriter`: The event writer.
+    """
+    return EventWriter(os.fdopen(file_descriptor, 'w', encoding='UTF-8',
+                                 closefd=False))
+
+
+def write_output_event(event_writer, output, last_run=None):
+    """Write an item of the doers' output as an event.
+
+    Parameters:
+        event_writer (:class:`.EventWriter`): The writer to write the event
+            to.
+        output (str|:class:`.DoerRun`): The item of output, either a chunk of
+            text or the start or end of a doer's run.
+        last_run (:class:`.DoerRun`): The last run that was written, the doer
+            the text belongs to.
+
+    Returns:
+        :class:`.DoerRun`: The last run that was written.
+    """
+    if not isinstance(output, DoerRun):
+        if output and last_run is not None:
+            event_writer.write(
+                'output', doer=type(last_run.doer).__name__.lower(),
+                files=last_run.file_names, text=output)
+        elif output:
+            event_writer.write('output', text=output)
+
+        return last_run
+
+    details = {'doer': type(output.doer).__name__.lower(),
+               'command': output.doer.command,
+               'files': output.file_names}
+    if not output.finished:
+        event_writer.write('doer_start', **details)
+    else:
+        event_writer.write(
+            'doer_finish', returncode=output.returncode,
+            duration=round(output.duration, 6), skipped=output.skipped,
+            cancelled=output.doer.cancelled, **details)
+
+    return output
+
+
+def cancel_on_change(change_queue, doer_pool, finished, grace_period=None):
+    """Cancel the doers' run if a change is queued before it has finished.
+
+    Parameters:
+        change_queue (:class:`.ChangeQueue`): The queue to wait for changes
+            on.
+        doer_pool (:class:`.DoerPool`): The pool running the doers.
+        finished (threading.Event): Set once the run has finished.
+        grace_period (float): The time (in seconds) the doers are given to
+            stop before they're killed.
+    """
+    while not finished.is_set():
+        if change_queue.wait(0.1):
+            doer_pool.cancel(grace_period)
+            return
+
+
+class RouteAction(argparse.Action):
+    """Append the argument to a list, like the ``append`` action, while also
+    recording the order of the ``--watch`` and ``--do`` arguments.
+
+    The arguments are grouped into routes, each being a list of globs followed
+    by the commands that are bound to them. A ``--watch`` after a ``--do``
+    starts a new route, so ``-w '*.py' -d pytest -w '*.css' -d sass`` only
+    runs ``pytest`` for the Python files. Commands given before any globs are
+    run for every file.
+
+    The types of change given by ``--on`` are bound to the ``--do`` that
+    follows it.
+    """
+
+    def __call__(self, parser, namespace, values, option_string=None):
+        if self.dest == 'on':
+            setattr(namespace, 'on', values)
+            return
+
+        if self.dest == 'commands':
+            change_types = list(getattr(namespace, 'change_types', None) or [])
+            change_types.append(getattr(namespace, 'on', None))
+            setattr(namespace, 'change_types', change_types)
+            setattr(namespace, 'on', None)
+
+        items = list(getattr(namespace, self.dest, None) or [])
+        items.append(values)
+        setattr(namespace, self.dest, items)
+
+        routes = getattr(namespace, 'routes', None)
+        if routes is None:
+            routes = []
+            setattr(namespace, 'routes', routes)
+
+        if self.dest == 'globs':
+            if not routes or routes[-1][1]:
+                routes.append(([], []))
+            routes[-1][0].append(values)
+        else:
+            if not routes:
+                routes.append(([], []))
+            routes[-1][1].append(values)
+
+
+def get_routes(args):
+    """Get the globs each of the commands is bound to.
+
+    If every ``--do`` follows every ``--watch``, the commands are run for
+    every file.
+
+    Parameters:
+        args (argparse.Namespace): The parsed command line arguments.
+
+    Returns:
+        list: The globs each command is bound to (or ``None`` if it's run for
+        every file), in the same order as ``args.commands``.
+    """
+    routes = getattr(args, 'routes', None) or []
+    if len(routes) <= 1:
+        return [None] * len(args.commands)
+
+    return [list(globs) or None
+            for globs, commands in routes
+            for _ in commands]
+
+
+def parse_change_types(string):
+    """Parse a comma separated list of types of change.
+
+    Parameters:
+        string (str): The types, i.e. ``created,renamed``.
+
+    Raises:
+        argparse.ArgumentTypeError: If any of the types aren't recognised.
+
+    Returns:
+        list: The types of change.
+    """
+    change_types = [part.strip() for part in string.split(',')
+                    if part.strip()]
+
+    unknown = [part for part in change_types if part not in CHANGE_TYPES]
+    if unknown or not change_types:
+        raise argparse.ArgumentTypeError(
+            'expected a comma separated list of {}'.format(
+                ', '.join(CHANGE_TYPES)))
+
+    return change_types
 
 
 def get_cli_argument_parser(watcher_class_names, doer_class_names):
@@ -68,24 +335,63 @@ def get_cli_argument_parser(watcher_class_names, doer_class_names):
         '-w',
         '--watch',
         metavar='glob',
-        action='append',
+        action=RouteAction,
         dest='globs',
         required=True,
         help='Any number of file globs (should be quoted to stop the shell '
-        'expanding them) to expand and assign watchers to.')
+        'expanding them) to expand and assign watchers to. The `--do` '
+        'commands that follow a group of globs are only run for the files '
+        'matching them, unless all of the globs come first.')
+
+    parser.add_argument(
+        '-x',
+        '--exclude',
+        metavar='pattern',
+        action='append',
+        dest='excludes',
+        default=[],
+        help='Any number of .gitignore style patterns matching files and '
+        'directories to exclude, for example "node_modules/". Excluded '
+        'directories are never searched.')
+
+    parser.add_argument(
+        '-g',
+        '--gitignore',
+        default=False,
+        action='store_true',
+        help='Also exclude the files and directories that are ignored by '
+        '.gitignore files.')
 
     parser.add_argument(
         '-d',
         '--do',
         metavar='command',
-        action='append',
+        action=RouteAction,
         dest='commands',
         required=True,
         help='Perform an action. The format of `command` is [doer::command], '
         'for example "shell::echo \'%%f changed!\'". The `doer::` portion of '
         'the command can be omitted and `--default-doer` will be used by '
         'default. If the `command` portion contains \'::\', you MUST specify '
-        'the `doer::` explicitly.')
+        'the `doer::` explicitly. `%%F` is replaced with all of the changed '
+        'files, running the command once for all of them. `%%{dir}`, '
+        '`%%{name}`, `%%{stem}`, `%%{ext}`, `%%{rel}` and `%%{abs}` are '
+        'replaced with parts of the changed file\'s path. "exec::command" '
+        'runs the program directly, without a shell. "worker::command" '
+        'starts the command once and sends it each changed file as a line of '
+        'JSON, "python::module:function" calls a Python function with each '
+        'changed file. `%%{type}` is replaced with the type of the change '
+        'and `%%{old}` with the file\'s name before it was renamed.')
+
+    parser.add_argument(
+        '--on',
+        metavar='types',
+        action=RouteAction,
+        dest='on',
+        type=parse_change_types,
+        help='Only run the `--do` that follows for the given types of change, '
+        'a comma separated list of {}. `--run-on-remove` must be set for '
+        'removed files.'.format(', '.join(CHANGE_TYPES)))
 
     parser.add_argument(
         '-m',
@@ -106,7 +412,55 @@ def get_cli_argument_parser(watcher_class_names, doer_class_names):
         metavar='seconds',
         type=float,
         default=2,
-        help='The interval (in seconds) between checks for changed files.')
+        help='The interval (in seconds) between checks for changed files. '
+        'Event driven watchers (i.e. inotify) check as soon as a change is '
+        'reported, this is then the maximum time between checks.')
+
+    parser.add_argument(
+        '--workers',
+        metavar='threads',
+        type=int,
+        default=1,
+        help='The number of threads used to check the files for changes. '
+        'Checking in parallel helps when each check is slow, i.e. on network '
+        'file systems.')
+
+    parser.add_argument(
+        '--state-file',
+        metavar='file',
+        help='Save the state of the watched files to this file, so that '
+        'changes made while Watch Do isn\'t running are detected when it\'s '
+        'started again.')
+
+    parser.add_argument(
+        '--hash-cache',
+        default=False,
+        action='store_true',
+        help='Store the hashes calculated by the hash based watchers, so '
+        'unchanged files aren\'t hashed again when Watch Do is restarted.')
+
+    parser.add_argument(
+        '--skip-unchanged',
+        default=False,
+        action='store_true',
+        help='Skip the doers for a file if its contents haven\'t changed '
+        'since they last ran successfully for it, i.e. after saving it '
+        'without any changes. Only the changed file is considered, so this '
+        'isn\'t suitable for doers that read other files. Batch (`%%F`) '
+        'doers are always run.')
+
+    parser.add_argument(
+        '--replay-output',
+        default=False,
+        action='store_true',
+        help='Show the stored output of the doers that are skipped, see '
+        '`--skip-unchanged`.')
+
+    parser.add_argument(
+        '--cache-dir',
+        metavar='directory',
+        default=get_cache_directory(),
+        help='The directory that caches are stored in.')
 
     parser.add_argument(
         '-t',
@@ -114,8 +468,17 @@ def get_cli_argument_parser(watcher_class_names, doer_class_names):
         metavar='seconds',
         type=float,
         default=0,
-        help='The time to wait (in seconds) between detecting a change and '
-        'running the doers.')
+        help='The time (in seconds) that the changed files must go '
+        'unmodified for before running the doers. Further changes made while '
+        'waiting are included in the same run.')
+
+    parser.add_argument(
+        '--max-wait',
+        metavar='seconds',
+        type=float,
+        default=30,
+        help='The maximum time to wait (in seconds) for the changed files to '
+        'stop being modified, see `--wait-time`.')
 
     parser.add_argument(
         '-b',
@@ -130,7 +493,33 @@ def get_cli_argument_parser(watcher_class_names, doer_class_names):
         '--disable-clear',
         default=False,
         action='store_true',
-        help='Don\'t clear the screen between file changes.')
+        help='Don\'t clear the screen between file changes. The screen is '
+        'never cleared if the output isn\'t a terminal.')
+
+    parser.add_argument(
+        '--scrollback',
+        metavar='lines',
+        type=int,
+        default=1000,
+        help='The maximum number of lines of output kept in memory to redraw '
+        'the screen with when the terminal is resized.')
+
+    parser.add_argument(
+        '--output',
+        choices=['text', 'json'],
+        default='text',
+        help='The format of the output. "json" writes each event (checks, '
+        'changes, doers starting and finishing and their output) as a line '
+        'of JSON, without banners or clearing the screen.')
+
+    parser.add_argument(
+        '--output-fd',
+        metavar='fd',
+        type=int,
+        default=1,
+        help='The file descriptor the events are written to by `--output '
+        'json`, i.e. 3 to keep them apart from anything else written to '
+        'stdout.')
 
     parser.add_argument(
         '-r',
@@ -156,9 +545,35 @@ def get_cli_argument_parser(watcher_class_names, doer_class_names):
         'changed files. For example, if two files change at the same time (or '
         'in a time less than `--interval`), Watch Do will only run the doers '
         'once. To change this behaviour, making each changed file trigger the '
-        'doers, specify this argument. If, while the doers are running, your '
-        ' files change multiple times, Watch Do will only run the doers one '
-        'time per changed file, it does not queue up changes.')
+        'doers, specify this argument. Files that change while the doers are '
+        'running are queued, each file is only queued once however many '
+        'times it changes.')
+
+    parser.add_argument(
+        '-j',
+        '--jobs',
+        metavar='jobs',
+        type=int,
+        default=1,
+        help='The number of changed files to run the doers for at the same '
+        'time when `--multi` is set. The doers for each file still run in '
+        'order, and the output of each file is shown in one piece.')
+
+    parser.add_argument(
+        '--restart',
+        default=False,
+        action='store_true',
+        help='Stop the doers when a change is detected while they\'re '
+        'running, then run them again for the files that changed. Shell '
+        'commands are sent SIGTERM, then SIGKILL after `--grace-period`.')
+
+    parser.add_argument(
+        '--grace-period',
+        metavar='seconds',
+        type=float,
+        default=5,
+        help='The time (in seconds) stopped commands are given to exit before '
+        'they\'re killed, see `--restart`.')
 
     return parser
 
@@ -186,72 +601,192 @@ def watch_do():
     parser = get_cli_argument_parser(list(watcher_classes), list(doer_classes))
     args = parser.parse_args()
 
+    hash_cache = None
+    result_cache = None
+    detector = None
+    doer_manager = None
+    event_writer = None
+    renderer = None
     try:
+        if args.output == 'json':
+            try:
+                event_writer = get_event_writer(args.output_fd)
+            except OSError as ex:
+                parser.error('unable to open file descriptor {}: {}'.format(
+                    args.output_fd, ex.strerror))
+        else:
+            renderer = Renderer(sys.stdout, not args.disable_clear,
+                                args.scrollback)
+
+        # The screen is redrawn once the terminal has been resized, between
+        # runs of the doers
+        resized = threading.Event()
+        if renderer is not None and renderer.clears and hasattr(
+                signal, 'SIGWINCH'):
+            signal.signal(signal.SIGWINCH, lambda *_: resized.set())
+
         # Get the selected watcher and default doer that was given
         watcher = watcher_classes[args.watcher_method]
         default_doer = doer_classes[args.default_doer]
 
+        # Commands are only started in their own sessions if they can be
+        # cancelled, otherwise they're interrupted along with Watch Do
+        shell_doers.set_new_session(args.restart)
+
         # Set up the basic classes that control the main Watch Do functionality
-        glob_manager = GlobManager(args.globs)
+        glob_manager = GlobManager(args.globs, args.excludes, args.gitignore)
+        state_file = None
+        if args.state_file:
+            state_file = StateFile(args.state_file, watcher.__name__)
         watcher_manager = WatcherManager(
-            watcher, glob_manager, args.reglob, args.run_on_remove)
-        doer_manager = DoerManager(args.commands, default_doer)
+            watcher, glob_manager, args.reglob, args.run_on_remove,
+            args.workers, state_file)
+        if args.skip_unchanged:
+            result_cache = get_result_cache(args.cache_dir, args)
+        doer_manager = DoerManager(args.commands, default_doer, result_cache,
+                                   get_routes(args), args.change_types,
+                                   event_writer is not None)
+        doer_pool = DoerPool(doer_manager, args.jobs)
+        settler = Settler(args.wait_time, args.max_wait)
+
+        if args.hash_cache:
+            hash_cache = get_hash_cache(args.cache_dir, args)
+            hash_watchers.set_cache(hash_cache)
+
+        # Changes are detected in the background, so they're still noticed
+        # while the doers are running
+        change_queue = ChangeQueue()
+
+        def on_missing_file(ex):
+            if event_writer is not None:
+                event_writer.write('missing_file', file=ex.filename)
+            else:
+                renderer.write(
+                    'The file "{}" was not found. We will check again in {} '
+                    'seconds.\n'.format(ex.filename, args.interval))
+
+        detector = Detector(
+            watcher_manager, change_queue, args.interval, settler,
+            on_missing_file, event_writer)
+        detector.start()
+        detector.wait_until_ready()
+
+        if not args.disable_banners and event_writer is None:
+            renderer.clear()
+            renderer.write(BannerBuilder.build_header(
+                detector.files, watcher))
 
         # Start the main Watch Do program loop
-        first_time = True
+        last_save_time = 0
         while True:
-            try:
-                changed_files = watcher_manager.get_changed_files()
-            except FileNotFoundError as ex:
-                print('The file "{}" was not found. We will check again in {} '
-                      'seconds.'.format(ex.filename, args.interval))
-                time.sleep(args.interval)
-                continue
-
-            if first_time and not args.disable_banners:
-                if not args.disable_clear:
-                    clear_screen()
-
-                print(BannerBuilder.build_header(
-                    glob_manager.last_files, watcher), end='')
+            changed_files, trigger_time = change_queue.get(args.interval)
+
+            if resized.is_set() and not changed_files:
+                resized.clear()
+                renderer.redraw()
+
+            # The watchers' state is only saved once the doers have run for
+            # every change, so changes aren't lost if Watch Do is killed
+            if not changed_files:
+                detector.save_state()
+
+            # Save the caches periodically, so they aren't lost if Watch Do
+            # is killed
+            if time.time() - last_save_time >= _CACHE_SAVE_INTERVAL:
+                if hash_cache is not None and hash_cache.dirty:
+                    save_hash_cache(hash_cache, detector.files)
+                if result_cache is not None and result_cache.dirty:
+                    save_result_cache(result_cache)
+                last_save_time = time.time()
 
             # If some files have changed
             if changed_files:
-                trigger_time = time.time()
-                time.sleep(args.wait_time)
-
-                if not args.disable_clear:
-                    clear_screen()
-
-                if not args.disable_banners:
-                    print(BannerBuilder.build_header(
-                        glob_manager.last_files, watcher), end='')
+                if event_writer is not None:
+                    for change in sorted(changed_files):
+                        event_writer.write(
+                            'change', file=str(change), type=get_type(change),
+                            old_file=getattr(change, 'old_file_name', None))
+                else:
+                    renderer.clear()
+
+                    if not args.disable_banners:
+                        renderer.write(BannerBuilder.build_header(
+                            detector.files, watcher))
 
                 # Run the doers and print their output
-                start_time = time.time()
-                for file_name in changed_files:
-                    for output in doer_manager.run_doers(file_name):
-                        print(output, end='')
-                        sys.stdout.flush()
+                file_names = list(changed_files)
+                if not args.multi:
+                    file_names = file_names[:1]
+
+                # With --restart, a change while the doers are running
+                # cancels them
+                finished = threading.Event()
+                if args.restart:
+                    threading.Thread(
+                        target=cancel_on_change,
+                        args=(change_queue, doer_pool, finished,
+                              args.grace_period),
+                        daemon=True).start()
+
+                if event_writer is not None:
+                    event_writer.write('run_start', files=file_names)
 
-                    if not args.multi:
-                        break
+                start_time = time.time()
+                last_run = None
+                try:
+                    for output in doer_pool.run(file_names,
+                                                list(changed_files)):
+                        if event_writer is not None:
+                            last_run = write_output_event(
+                                event_writer, output, last_run)
+                            continue
+
+                        renderer.write(output)
+                finally:
+                    finished.set()
 
                 end_time = time.time()
-                if not args.disable_banners:
-                    print(BannerBuilder.build_footer(
+
+                if event_writer is not None:
+                    event_writer.write(
+                        'run_finish', files=file_names,
+                        duration=round(end_time - start_time, 6),
+                        cancelled=doer_pool.cancelled)
+                    event_writer.flush()
+
+                # Run the doers again for the cancelled files along with the
+                # new changes
+                if doer_pool.cancelled:
+                    change_queue.put(changed_files, trigger_time)
+                    if event_writer is None:
+                        renderer.write('\nChanges detected, restarting.\n')
+                    continue
+
+                detector.save_state()
+
+                if not args.disable_banners and event_writer is None:
+                    renderer.write(BannerBuilder.build_footer(
                         trigger_time,
                         list(changed_files),
                         end_time - start_time,
-                        glob_manager.last_files,
-                        watcher), end='')
-
-            time.sleep(args.interval)
-            first_time = False
+                        detector.files,
+                        watcher,
+                        doer_pool.timings if args.jobs > 1 else None))
     except UnknownDoer as ex:
         parser.error('unknown doer: ' + str(ex))
+    except InvalidCommand as ex:
+        parser.error('invalid command: ' + str(ex))
     except KeyboardInterrupt:
-        pass
+        if (hash_cache is not None and hash_cache.dirty and
+                detector is not None):
+            save_hash_cache(hash_cache, detector.files)
+        if result_cache is not None and result_cache.dirty:
+            save_result_cache(result_cache)
+    finally:
+        if doer_manager is not None:
+            doer_manager.close()
+        if event_writer is not None:
+            event_writer.flush()
 
 
 if __name__ == '__main__':
@@ -0,0 +1,185 @@
+"""The :class:`.Detector` class checks for changed files in a background
+thread, so that changes are still detected while the doers are running.
+
+Changed files are put onto a :class:`.ChangeQueue`, which the thread running
+the doers takes them from.
+
+As an example, the following code would start checking for changes every two
+seconds and then wait for the first change.
+
+>>> change_queue = ChangeQueue()
+>>> detector = Detector(watcher_manager, change_queue, 2)
+>>> detector.start()
+>>> change_queue.get()
+
+If an :class:`.EventWriter` is given, the start and end of each check is
+written to it as the ``scan_start`` and ``scan_finish`` events.
+
+The thread running the doers saves the watchers' state through the detector
+once it has run the doers for the queued changes, so the state is never saved
+while the files are being checked or before the changes have been handled.
+
+>>> detector.save_state()
+"""
+
+import time
+import threading
+
+
+class Detector(threading.Thread):
+    """This class repeatedly checks for changed files in a thread.
+
+    The thread is a daemon thread, so it doesn't stop the program from
+    exiting. Any unexpected exception closes the :class:`.ChangeQueue`, so
+    it's re-raised in the thread taking changes from the queue.
+    """
+
+    def __init__(self, watcher_manager, change_queue, interval, settler=None,
+                 on_missing_file=None, event_writer=None):
+        """Initialise the :class:`.Detector`.
+
+        Parameters:
+            watcher_manager (:class:`.WatcherManager`): The manager used to
+                check for changed files.
+            change_queue (:class:`.ChangeQueue`): The queue changed files are
+                put onto.
+            interval (float): The interval (in seconds) between checks.
+            settler (:class:`.Settler`): If given, used to wait for changed
+                files to stop changing before they're queued.
+            on_missing_file (callable): If given, called with the
+                ``FileNotFoundError`` when a watched file is missing.
+            event_writer (:class:`.EventWriter`): If given, each check is
+                written to it as events.
+        """
+        super(Detector, self).__init__(daemon=True)
+
+        self._watcher_manager = watcher_manager
+        self._change_queue = change_queue
+        self._interval = interval
+        self._settler = settler
+        self._on_missing_file = on_missing_file
+        self._event_writer = event_writer
+        self._files = frozenset()
+        self._files_generation = None
+
+        self._ready = threading.Event()
+        self._stopped = threading.Event()
+        self._lock = threading.Lock()
+
+    @property
+    def watcher_manager(self):
+        """:class:`.WatcherManager`: The manager used to check for changes.
+        """
+        return self._watcher_manager
+
+    @property
+    def change_queue(self):
+        """:class:`.ChangeQueue`: The queue changed files are put onto.
+        """
+        return self._change_queue
+
+    @property
+    def interval(self):
+        """float: The interval (in seconds) between checks.
+        """
+        return self._interval
+
+    @property
+    def files(self):
+        """frozenset: A snapshot of the files being watched, taken after the
+        last check that added or removed files. The :class:`.WatcherManager`'s
+        own set is changed by each check, so it mustn't be used from other
+        threads.
+        """
+        return self._files
+
+    def wait_until_ready(self, timeout=None):
+        """Block until the files have been checked for the first time.
+
+        Parameters:
+            timeout (float): The maximum time (in seconds) to wait, or
+                ``None`` to wait indefinitely.
+
+        Returns:
+            bool: True if the files have been checked (or checking failed).
+        """
+        return self._ready.wait(timeout)
+
+    def save_state(self):
+        """Save the state of the watchers (see
+        :meth:`.WatcherManager.save_state`), unless there are queued changes
+        that the doers haven't been run for.
+
+        This waits for the current check to finish, including waiting for the
+        changed files to settle.
+
+        Raises:
+            OSError: If the state couldn't be written.
+
+        Returns:
+            bool: True if the state was saved.
+        """
+        with self._lock:
+            if len(self.change_queue):
+                return False
+
+            self.watcher_manager.save_state()
+            return True
+
+    def stop(self):
+        """Stop checking for changes after the current check.
+        """
+        self._stopped.set()
+
+    def run(self):
+        """Check for changes until stopped.
+        """
+        try:
+            while not self._stopped.is_set():
+                with self._lock:
+                    self._check()
+                self._ready.set()
+
+                self.watcher_manager.watcher.wait(self.interval)
+        except Exception as ex:  # pylint: disable=broad-except
+            self.change_queue.close(ex)
+        finally:
+            self._ready.set()
+
+    def _check(self):
+        """Check for changes once, queueing any changed files.
+        """
+        if self._event_writer is not None:
+            self._event_writer.write('scan_start',
+                                     files=len(self.watcher_manager.files))
+        start_time = time.time()
+
+        changed_files = set()
+        try:
+            changed_files = self.watcher_manager.get_changed_files()
+        except FileNotFoundError as ex:
+            if self._on_missing_file is not None:
+                self._on_missing_file(ex)
+            return
+        finally:
+            # The snapshot is only taken again when the files have changed,
+            # copying every file name on each check would be slow
+            generation = self.watcher_manager.files_generation
+            if generation != self._files_generation:
+                self._files = frozenset(self.watcher_manager.files)
+                self._files_generation = generation
+
+            if self._event_writer is not None:
+                duration = round(time.time() - start_time, 6)
+                self._event_writer.write(
+                    'scan_finish', duration=duration,
+                    files=len(self._files),
+                    changed=len(changed_files))
+                self._event_writer.flush()
+
+        trigger_time = time.time()
+        if changed_files and self._settler is not None:
+            changed_files = self._settler.settle(
+                changed_files, self.watcher_manager)
+
+        self.change_queue.put(changed_files, trigger_time)
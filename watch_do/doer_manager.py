@@ -16,13 +16,83 @@ In the above case, the ``shell:`` prefix wasn't necessary, as the default doer
 All of the doers can be run by calling the :meth:`.run_doers` method.
 
 >>> manager.run_doers('my_file.txt')
+
+Doers with a batch command (containing ``%F``) are run once for all of the
+changed files using the :meth:`.run_doer_batch` method. The doers are split
+into :attr:`.stages`, consecutive doers without a batch command are run for
+each file in turn, while batch doers are run once for all of the files. The
+stages are run by a :class:`.DoerPool`.
+
+>>> manager = DoerManager(['black %f', 'flake8 %F'], Shell)
+>>> DoerPool(manager).run(['a.py', 'b.py'])
+
+If a :class:`.ResultCache` is given, doers are skipped for files whose
+contents haven't changed since they last ran successfully for them.
+
+>>> manager = DoerManager(['make %f'], Shell, ResultCache('results'))
+
+Doers can be bound to globs, so that they're only run for the files matching
+them. In the following example, ``pytest`` is only run when a Python file
+changes and ``sass`` only when a SCSS file changes.
+
+>>> manager = DoerManager(['pytest', 'sass %f'], Shell,
+...                       routes=[['**/*.py'], ['static/**/*.scss']])
+
+Doers can also be bound to types of change (see :mod:`.change`), i.e. to only
+remove a compiled file once its source has been removed.
+
+>>> manager = DoerManager(['black %f', 'rm %{stem}.pyc'], Shell,
+...                       change_types=[None, ['removed']])
+
+If ``report_runs`` is set, each doer's output is preceded and followed by a
+:class:`.DoerRun`, which marks when the doer started and how it finished.
+Being part of the output, the marks stay in order with it even when the doers
+are run in a :class:`.DoerPool`.
 """
 
+import time
+from itertools import groupby
 from importlib import import_module
 
+from .change import get_type
+from .glob_matcher import GlobMatcher
+from .doers.doer import Failure
 from .exceptions import UnknownDoer
 
 
+class DoerRun:
+    """This class marks the start or end of a doer's run in the output of the
+    :class:`.DoerManager`.
+    """
+
+    def __init__(self, doer, file_names, finished=False, returncode=None,
+                 duration=None, skipped=False):
+        """Initialise the :class:`.DoerRun`.
+
+        Parameters:
+            doer (:class:`.Doer`): The doer that was run.
+            file_names (list): The files the doer was run for.
+            finished (bool): A boolean value indicating whether this marks
+                the end of the run, rather than the start.
+            returncode (int): The exit code of the doer, non-zero if it
+                yielded a :class:`.Failure`. Only set at the end of the run.
+            duration (float): The time (in seconds) the doer took to run.
+                Only set at the end of the run.
+            skipped (bool): A boolean value indicating whether the doer was
+                skipped, as it had already run successfully for the files.
+        """
+        self.doer = doer
+        self.file_names = file_names
+        self.finished = finished
+        self.returncode = returncode
+        self.duration = duration
+        self.skipped = skipped
+
+    def __repr__(self):
+        return 'DoerRun({!r}, {!r}, finished={!r})'.format(
+            self.doer.command, self.file_names, self.finished)
+
+
 class DoerManager:
     """This class creates and manages doers.
 
@@ -31,7 +101,8 @@ class DoerManager:
     relevant output returned.
     """
 
-    def __init__(self, commands, default_doer):
+    def __init__(self, commands, default_doer, result_cache=None,
+                 routes=None, change_types=None, report_runs=False):
         """Initialise the :class:`.DoerManager` and parse all commands.
 
         The commands that get passed into this class are parsed (removing their
@@ -47,11 +118,38 @@ class DoerManager:
             default_doer (:class:`.Doer`): A reference to a doer class to use
                 as the default doer if one is not explicitly specified using
                 the ``doer:`` prefix.
+            result_cache (:class:`.ResultCache`): If given, used to skip the
+                doers (other than batch doers) for files they've already run
+                successfully for.
+            routes (list): The globs each command is bound to, in the same
+                order as ``commands``. A command bound to no globs (or
+                ``None``) is run for every file, as are all of the commands if
+                this isn't given.
+            change_types (list): The types of change each command is bound
+                to, in the same order as ``commands``. A command bound to no
+                types (or ``None``) is run for every type of change.
+            report_runs (bool): A boolean value indicating whether to mark the
+                start and end of each doer's run with a :class:`.DoerRun` in
+                its output.
         """
         self._commands = commands
         self._default_doer = default_doer
+        self._result_cache = result_cache
+        self._routes = routes or [None] * len(commands)
+        self._change_types = change_types or [None] * len(commands)
+        self._report_runs = report_runs
 
         self._doers = self._process_commands(self.commands)
+        self._matchers = {
+            doer: GlobMatcher(list(globs))
+            for doer, globs in zip(self._doers, self._routes) if globs}
+        self._types = {
+            doer: frozenset(types)
+            for doer, types in zip(self._doers, self._change_types) if types}
+        self._stages = [
+            (is_batch, list(doers))
+            for is_batch, doers in groupby(self._doers,
+                                           lambda doer: doer.is_batch)]
 
     @property
     def commands(self):
@@ -67,6 +165,34 @@ class DoerManager:
         """
         return self._default_doer
 
+    @property
+    def routes(self):
+        """list: The globs each command is bound to, ``None`` for the commands
+        that are run for every file.
+        """
+        return self._routes
+
+    @property
+    def change_types(self):
+        """list: The types of change each command is bound to, ``None`` for
+        the commands that are run for every type of change.
+        """
+        return self._change_types
+
+    @property
+    def report_runs(self):
+        """bool: A boolean value indicating whether the start and end of each
+        doer's run is marked in its output.
+        """
+        return self._report_runs
+
+    @property
+    def result_cache(self):
+        """:class:`.ResultCache`: The cache used to skip the doers, or
+        ``None``.
+        """
+        return self._result_cache
+
     @property
     def doers(self):
         """list: The doers that were created as a result of passing the
@@ -74,6 +200,14 @@ class DoerManager:
         """
         return self._doers
 
+    @property
+    def stages(self):
+        """list: The doers grouped into stages, a ``(is_batch, doers)`` tuple
+        for each group of consecutive doers that either do or don't have a
+        batch command.
+        """
+        return self._stages
+
     def _process_commands(self, commands):
         """Process the `commands` and create `Doer` instances from them.
 
@@ -116,6 +250,138 @@ class DoerManager:
 
         return doers
 
+    def close(self):
+        """Close each of the doers, stopping any processes they keep running.
+        """
+        for doer in self.doers:
+            doer.close()
+
+    def matches(self, doer, file_name):
+        """Determine if a doer should be run for a file.
+
+        Parameters:
+            doer (:class:`.Doer`): The doer.
+            file_name (str): The file that has changed.
+
+        Returns:
+            bool: True if the file matches one of the doer's globs and the
+            type of its change is one of the doer's types, either of which
+            is always the case if the doer isn't bound to them.
+        """
+        types = self._types.get(doer)
+        if types is not None and get_type(file_name) not in types:
+            return False
+
+        matcher = self._matchers.get(doer)
+
+        return matcher is None or matcher.matches_file(file_name)
+
+    def run_doer(self, doer, file_name):
+        """Run a doer for a file, unless it isn't bound to the file or the
+        file's contents haven't changed since it last ran successfully.
+
+        Parameters:
+            doer (:class:`.Doer`): The doer to run.
+            file_name (str): The file to run the doer for.
+
+        Yields:
+            str: The output of the doer, or its stored output if it was
+                skipped and the :class:`.ResultCache` replays output.
+        """
+        if not self.matches(doer, file_name):
+            return
+
+        if self.result_cache is None:
+            yield from self._report_run(doer, [file_name],
+                                        doer.run(file_name))
+            return
+
+        key = self.result_cache.get_key(doer.command, file_name)
+        digest = self.result_cache.hash_file(file_name)
+        output = self.result_cache.get(key, digest)
+        if output is not None:
+            yield from self._report_run(doer, [file_name], output, True)
+            return
+
+        yield from self._report_run(
+            doer, [file_name],
+            self._run_and_cache(doer, file_name, key, digest))
+
+    def _run_and_cache(self, doer, file_name, key, digest):
+        """Run a doer for a file, storing its output in the
+        :class:`.ResultCache` if it succeeds, or forgetting the previous
+        result if it doesn't.
+
+        Parameters:
+            doer (:class:`.Doer`): The doer to run.
+            file_name (str): The file to run the doer for.
+            key (str): The key of the doer's result for the file.
+            digest (str): The digest of the file's contents before the doer
+                was run.
+
+        Yields:
+            str: The output of the doer.
+        """
+        output = []
+        failed = False
+        for item in doer.run(file_name):
+            failed = failed or isinstance(item, Failure)
+            output.append(item)
+            yield item
+
+        if not failed and not doer.cancelled:
+            self.result_cache.put(key, digest, output)
+        else:
+            self.result_cache.remove(key)
+
+    def run_doer_batch(self, doer, file_names):
+        """Run a batch doer for the files it's bound to.
+
+        Parameters:
+            doer (:class:`.Doer`): The doer to run.
+            file_names (list): The changed files.
+
+        Yields:
+            str: The output of the doer, it isn't run if it's bound to none
+                of the files.
+        """
+        file_names = [file_name for file_name in file_names
+                      if self.matches(doer, file_name)]
+        if file_names:
+            yield from self._report_run(doer, file_names,
+                                        doer.run_batch(file_names))
+
+    def _report_run(self, doer, file_names, output, skipped=False):
+        """Mark the start and end of a doer's output, if :attr:`report_runs`
+        is set.
+
+        Parameters:
+            doer (:class:`.Doer`): The doer being run.
+            file_names (list): The files the doer is run for.
+            output (iterable): The output of the doer.
+            skipped (bool): A boolean value indicating whether the output was
+                replayed from the :class:`.ResultCache`.
+
+        Yields:
+            str: The output of the doer, preceded and followed by a
+                :class:`.DoerRun`.
+        """
+        if not self.report_runs:
+            yield from output
+            return
+
+        yield DoerRun(doer, file_names)
+
+        start_time = time.time()
+        returncode = 0
+        for item in output:
+            if isinstance(item, Failure):
+                returncode = item.returncode
+            yield item
+
+        yield DoerRun(doer, file_names, True, returncode,
+                      time.time() - start_time, skipped)
+
     def run_doers(self, file_name):
         """Run each doer in turn and yield its output.
 
@@ -124,4 +390,4 @@ class DoerManager:
                 stderr from the doers.
         """
         for doer in self.doers:
-            yield from doer.run(file_name)
+            yield from self.run_doer(doer, file_name)
@@ -0,0 +1,209 @@
+"""The :class:`.DoerPool` class runs the doers for multiple files at the same
+time.
+
+The doers for each file (a job) are run in order, in one of a pool of
+threads. The output of the jobs is never interleaved, the output of the first
+job is streamed as it's produced while the output of the others is buffered
+until the jobs before them have finished.
+
+As an example, the following code would run the doers for three files, with up
+to two of them running at the same time.
+
+>>> pool = DoerPool(doer_manager, 2)
+>>> for output in pool.run(['a.proto', 'b.proto', 'c.proto']):
+...     print(output, end='')
+
+Doers with a batch command (containing ``%F``) are run once for all of the
+files, between the jobs for the doers before and after them. The time each job
+took can then be retrieved from :attr:`timings`.
+
+>>> pool.timings
+[('a.proto', 1.52), ('b.proto', 1.48), ('c.proto', 0.97)]
+
+A run can be cancelled from another thread with :meth:`cancel`, which stops
+the doers that are running and skips the rest.
+"""
+
+import time
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+
+# Marks the end of a job's output
+_DONE = object()
+
+
+class DoerPool:
+    """This class runs the doers for multiple files concurrently.
+    """
+
+    def __init__(self, doer_manager, jobs=1):
+        """Initialise the :class:`.DoerPool`.
+
+        Parameters:
+            doer_manager (:class:`.DoerManager`): The manager used to run the
+                doers for each file.
+            jobs (int): The maximum number of files to run the doers for at
+                the same time, the doers are run in the calling thread if this
+                is 1.
+        """
+        self._doer_manager = doer_manager
+        self._jobs = jobs
+        self._executor = None
+        self._cancelled = threading.Event()
+
+        self._timings = []
+
+    @property
+    def doer_manager(self):
+        """:class:`.DoerManager`: The manager used to run the doers.
+        """
+        return self._doer_manager
+
+    @property
+    def jobs(self):
+        """int: The maximum number of files the doers are run for at once.
+        """
+        return self._jobs
+
+    @property
+    def timings(self):
+        """list: A ``(file_name, duration)`` tuple for each job of the last
+        run, in the order they were passed to :meth:`run`.
+        """
+        return self._timings
+
+    @property
+    def cancelled(self):
+        """bool: A boolean value indicating whether the current (or last) run
+        was cancelled.
+        """
+        return self._cancelled.is_set()
+
+    def cancel(self, grace_period=None):
+        """Cancel the current run.
+
+        The doers that are running are cancelled and no more are started, the
+        run's output ends once they've stopped. This is safe to call from any
+        thread.
+
+        Parameters:
+            grace_period (float): The time (in seconds) the doers are given to
+                stop before they're killed, or ``None`` for their default.
+        """
+        self._cancelled.set()
+        for doer in self.doer_manager.doers:
+            doer.cancel(grace_period)
+
+    def run(self, file_names, batch_file_names=None):
+        """Run the doers for each of the files.
+
+        The stages of the :class:`.DoerManager` are run in turn, the doers in
+        batch stages are run once for all of the files.
+
+        Parameters:
+            file_names (list): The files to run the doers for.
+            batch_file_names (list): The files to run the batch doers for,
+                defaults to ``file_names``.
+
+        Yields:
+            str: The output of the doers, the output of each job is yielded
+                in the same order as ``file_names``.
+        """
+        if batch_file_names is None:
+            batch_file_names = file_names
+
+        durations = {}
+        self._timings = []
+
+        self._cancelled.clear()
+        for doer in self.doer_manager.doers:
+            doer.reset()
+
+        for is_batch, doers in self.doer_manager.stages:
+            if self.cancelled:
+                return
+
+            if is_batch:
+                for doer in doers:
+                    if self.cancelled:
+                        return
+                    yield from self.doer_manager.run_doer_batch(
+                        doer, batch_file_names)
+            else:
+                yield from self._run_jobs(file_names, doers, durations)
+
+        self._timings = [(file_name, durations[file_name])
+                         for file_name in file_names
+                         if file_name in durations]
+
+    def _run_jobs(self, file_names, doers, durations):
+        """Run a stage of doers for each of the files.
+
+        Parameters:
+            file_names (list): The files to run the doers for.
+            doers (list): The doers to run for each file, in order.
+            durations (dict): The time taken for each file so far, the time
+                taken by this stage is added to it.
+
+        Yields:
+            str: The output of the doers, the output of each job is yielded
+                in the same order as ``file_names``.
+        """
+        if self.jobs <= 1:
+            for file_name in file_names:
+                start_time = time.time()
+                for doer in doers:
+                    if self.cancelled:
+                        return
+                    yield from self.doer_manager.run_doer(doer, file_name)
+                durations[file_name] = (durations.get(file_name, 0) +
+                                        time.time() - start_time)
+            return
+
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.jobs)
+
+        jobs = []
+        for file_name in file_names:
+            output = queue.Queue()
+            future = self._executor.submit(
+                self._run_job, file_name, doers, output, self._cancelled)
+            jobs.append((file_name, output, future))
+
+        for file_name, output, future in jobs:
+            item = output.get()
+            while item is not _DONE:
+                yield item
+                item = output.get()
+
+            # Re-raises any exception raised by the doers
+            durations[file_name] = (durations.get(file_name, 0) +
+                                    future.result())
+
+    def _run_job(self, file_name, doers, output, cancelled):
+        """Run the doers for a file, putting their output onto a queue.
+
+        Parameters:
+            file_name (str): The file to run the doers for.
+            doers (list): The doers to run, in order.
+            output (queue.Queue): The queue to put the output onto, it's
+                followed by a marker once the doers have finished.
+            cancelled (threading.Event): Set when the run has been cancelled,
+                the remaining doers are skipped.
+
+        Returns:
+            float: The time (in seconds) the doers took to run.
+        """
+        start_time = time.time()
+        try:
+            for doer in doers:
+                if cancelled.is_set():
+                    break
+                for item in self.doer_manager.run_doer(doer, file_name):
+                    output.put(item)
+        finally:
+            output.put(_DONE)
+
+        return time.time() - start_time
@@ -7,8 +7,14 @@ core functionality.
 
 from .doer import Doer
 from .shell import Shell
+from .exec import Exec
+from .worker import Worker
+from .python import Python
 
 __all__ = [
     'Doer',
-    'Shell'
+    'Shell',
+    'Exec',
+    'Worker',
+    'Python'
 ]
@@ -8,11 +8,117 @@ The doers are typically created and managed by an instance of a
    This class cannot be instantiated directly, it is an abstract base class.
    Only derived classes that inherit from this class and implement
    :meth:`run` can be instantiated.
+
+Commands are compiled into a :class:`.Template` when the doer is created, see
+:mod:`watch_do.doers.template` for the tokens that can be used.
+
+Commands containing the ``%F`` token are batch commands, the token is replaced
+with all of the changed files (quoted for the shell) so that a single process
+can handle all of them. The files are split into chunks if the command would
+otherwise be too long to run.
 """
 
+import os
+import shlex
+import signal
+import threading
 from abc import ABCMeta
 from abc import abstractmethod
 
+from .template import Template
+
+# Linux limits each argument (i.e. the command passed to ``sh -c``) to this
+# many bytes, regardless of the overall limit
+_MAX_ARG_STRLEN = 131072
+
+# Bytes left spare below the limit, as xargs does
+_ARG_HEADROOM = 2048
+
+
+def _get_command_limit():
+    """Get the maximum length (in bytes) of a command that can be run.
+
+    Returns:
+        int: The maximum length, taking the size of the environment into
+        account.
+    """
+    try:
+        arg_max = os.sysconf('SC_ARG_MAX')
+    except (AttributeError, ValueError, OSError):
+        arg_max = _MAX_ARG_STRLEN
+
+    environment_size = sum(
+        len(os.fsencode(key)) + len(os.fsencode(value)) + 2
+        for key, value in os.environ.items())
+
+    return max(min(arg_max - environment_size, _MAX_ARG_STRLEN) -
+               _ARG_HEADROOM, 4096)
+
+
+def _signal_process(process, signal_number, group=True):
+    """Send a signal to a process, or its process group.
+
+    Parameters:
+        process (subprocess.Popen): The process.
+        signal_number (int): The signal to send.
+        group (bool): A boolean value indicating whether to signal the
+            process's group (the process must have been started in a new
+            session), falling back to the process alone on platforms without
+            process groups.
+    """
+    try:
+        if group and hasattr(os, 'killpg'):
+            os.killpg(process.pid, signal_number)
+        else:
+            process.send_signal(signal_number)
+    except (ProcessLookupError, PermissionError):
+        # The process has already exited
+        pass
+
+
+def _kill_after(process, grace_period, group=True):
+    """Terminate a process (or its group), killing it if it's still running
+    after a grace period.
+
+    Parameters:
+        process (subprocess.Popen): The process.
+        grace_period (float): The time (in seconds) the process is given to
+            exit before it's killed.
+        group (bool): A boolean value indicating whether to signal the
+            process's group, see :func:`_signal_process`.
+    """
+    _signal_process(process, signal.SIGTERM, group)
+
+    timer = threading.Timer(
+        grace_period, _signal_process,
+        [process, getattr(signal, 'SIGKILL', signal.SIGTERM), group])
+    timer.daemon = True
+    timer.start()
+
+
+class Failure(str):
+    """The message a doer yields when it fails, i.e. when a command exits
+    with a non-zero code.
+
+    It's output like any other string, but allows the failure to be detected
+    without parsing the doer's output.
+    """
+
+    def __new__(cls, message, returncode=1):
+        """Create a :class:`.Failure`.
+
+        Parameters:
+            message (str): The message describing the failure.
+            returncode (int): The exit code of the command that failed.
+
+        Returns:
+            :class:`.Failure`: The failure.
+        """
+        failure = super(Failure, cls).__new__(cls, message)
+        failure.returncode = returncode
+
+        return failure
+
 
 class Doer(metaclass=ABCMeta):
     """This is the base :class:`.Doer` that all other doers should inherit
@@ -29,6 +135,8 @@ class Doer(metaclass=ABCMeta):
                 performed.
         """
         self._command = command
+        self._template = Template(command)
+        self._cancelled = False
 
     @property
     def command(self):
@@ -36,13 +144,132 @@ class Doer(metaclass=ABCMeta):
         """
         return self._command
 
+    @property
+    def template(self):
+        """:class:`.Template`: The command, compiled so that file names can be
+        interpolated into it.
+        """
+        return self._template
+
+    @property
+    def cancelled(self):
+        """bool: A boolean value indicating whether the doer has been
+        cancelled, and not reset since.
+        """
+        return self._cancelled
+
+    def cancel(self, grace_period=None):  # pylint: disable=unused-argument
+        """Cancel the runs of this doer that are in progress, along with any
+        that are started until :meth:`reset` is called.
+
+        The base implementation only records the cancellation, doers that run
+        for a long time should override this to stop the runs in progress.
+
+        Parameters:
+            grace_period (float): The time (in seconds) the runs in progress
+                are given to stop before they're killed, or ``None`` for the
+                doer's default.
+        """
+        self._cancelled = True
+
+    def reset(self):
+        """Allow the doer to run again after it has been cancelled.
+        """
+        self._cancelled = False
+
+    def close(self):
+        """Release any resources held by the doer, i.e. processes it keeps
+        running between runs.
+
+        The base implementation does nothing.
+        """
+
+    @property
+    def is_batch(self):
+        """bool: A boolean value indicating whether the command contains the
+        ``%F`` token, and should be run once for all of the changed files.
+        """
+        return 'F' in self.template.tokens
+
+    def run_batch(self, file_names):
+        """Run the doer against a batch of files.
+
+        Doers that can handle multiple files at once should override this
+        method, by default the doer is run against each file in turn.
+
+        Parameters:
+            file_names (list): The file names to run this doer against.
+
+        Yields:
+            str: A string containing the output (possibly the partial output)
+                of the command, both stdout and stderr.
+        """
+        for file_name in file_names:
+            yield from self.run(file_name)
+
+    def _chunk_file_names(self, file_names, limit=None):
+        """Split files into chunks small enough to be interpolated into the
+        command, like xargs.
+
+        Parameters:
+            file_names (list): The file names to split.
+            limit (int): The maximum length (in bytes) of the command,
+                defaults to the system's limit.
+
+        Yields:
+            list: The file names in each chunk.
+        """
+        if limit is None:
+            limit = _get_command_limit()
+
+        tokens = max(1, self.template.tokens.count('F'))
+        base_size = len(os.fsencode(self.command))
+
+        chunk = []
+        size = base_size
+        for file_name in file_names:
+            # Each file is quoted and separated by a space in every token
+            file_size = (len(os.fsencode(shlex.quote(file_name))) + 1) * tokens
+            if chunk and size + file_size > limit:
+                yield chunk
+                chunk = []
+                size = base_size
+
+            chunk.append(file_name)
+            size += file_size
+
+        if chunk:
+            yield chunk
+
+    @staticmethod
+    def _interpolate(string, file_names, quote=True):
+        """Interpolate the tokens into a given ``string``.
+
+        ``%F`` is replaced with all of the ``file_names``, quoted for the
+        shell and separated by spaces, and ``%f`` with the first of them.
+        Escaped tokens will be unescaped and ignored (i.e. ``\\%F`` becomes
+        ``%F``). The ``string`` is compiled each time, doers should render
+        their :attr:`template` instead.
+
+        Parameters:
+            string (str): The string to interpolate the file names into.
+            file_names (list): The file names to insert into the ``string``.
+            quote (bool): A boolean value indicating whether to quote the
+                file names for the shell when replacing ``%F``.
+
+        Returns:
+            str: The input string with the file names interpolated.
+        """
+        return Template(string).render(file_names, quote)
+
     @staticmethod
     def _interpolate_file_name(string, file_name):
         """Interpolate the ``file_name`` into a given ``string``.
 
         The ``string`` parameter will be searched for ``%f`` and replaced with
         ``file_name``. Any escaped ``%f``'s will be unescaped and ignored (i.e.
-        ``\\%f`` becomes ``%f``).
+        ``\\%f`` becomes ``%f``). A ``%F`` is replaced with the quoted
+        ``file_name``.
 
         Parameters:
             string (str): The string to interpolate the ``file_name`` into.
@@ -51,29 +278,7 @@ class Doer(metaclass=ABCMeta):
         Returns:
             str: The input string with file name interpolated.
         """
-        token = '%f'
-
-        position = 0
-        while True:
-            token_position = string.find(token, position)
-
-            # Token not found, nothing to do
-            if token_position == -1:
-                break
-            # Escaped token, ignore it and move on
-            elif string[token_position-1] == '\\':
-                string = string[:token_position-1] + string[token_position:]
-                position = token_position + len(token)
-            # Actual token, replace with the file name
-            else:
-                string = (
-                    string[:token_position] +
-                    file_name +
-                    string[token_position + len(token):]
-                )
-                position = token_position + len(file_name)
-
-        return string
+        return Doer._interpolate(string, [file_name])
 
     @abstractmethod
     def run(self, file_name):
@@ -0,0 +1,148 @@
+"""The :class:`.Exec` class runs programs directly, without a shell.
+
+The command is split into arguments once, when the doer is created, and the
+file names are then substituted into the arguments as they are. There's no
+shell to start for each run, and file names containing spaces or quotes don't
+need quoting.
+
+>>> doer = Exec('pylint --score=n %f')
+>>> doer.run('my file.py')
+
+An argument consisting of only ``%F`` is replaced with a separate argument for
+each file, while a ``%F`` within an argument is replaced with the file names
+separated by spaces.
+
+>>> doer = Exec('flake8 %F')
+>>> doer.run_batch(['a.py', 'b.py', 'c.py'])
+
+As the command isn't run by a shell, shell features such as pipes and
+redirection aren't available. Escaped tokens must be quoted (i.e. ``'\\%f'``),
+otherwise the backslash is removed when the command is split.
+
+Only the file descriptors for the program's output are passed to it, so it
+can't hold Watch Do's own files (i.e. ``--output-fd``) open. Unlike the
+:class:`.Shell` doer, programs are never started in a new session (even with
+``--restart``), so only the program itself (not any processes it starts) is
+stopped when the doer is cancelled.
+"""
+
+import shlex
+import shutil
+import subprocess
+
+from . import Shell
+from .template import Template
+from ..exceptions import InvalidCommand
+
+
+class Exec(Shell):
+    """Run programs directly, capturing their output.
+    """
+
+    _process_group = False
+
+    def __init__(self, command):
+        """Initialise the :class:`.Exec` doer, splitting the command into
+        arguments and finding the program.
+
+        Parameters:
+            command (str): The command to run, split into arguments as a
+                shell would.
+
+        Raises:
+            InvalidCommand: If the command can't be split or the program can't
+                be found.
+        """
+        super(Exec, self).__init__(command)
+
+        try:
+            self._arguments = shlex.split(command)
+        except ValueError as ex:
+            raise InvalidCommand('unable to split "{}": {}'.format(
+                command, ex)) from ex
+
+        if not self._arguments:
+            raise InvalidCommand('no program was given')
+
+        self._argument_templates = [
+            None if argument == '%F' else Template(argument)
+            for argument in self._arguments]
+
+        self._program = shutil.which(self._arguments[0])
+        if self._program is None:
+            raise InvalidCommand('program "{}" was not found'.format(
+                self._arguments[0]))
+
+    @property
+    def arguments(self):
+        """list: The arguments the command was split into, before the file
+        names are substituted.
+        """
+        return self._arguments
+
+    @property
+    def program(self):
+        """str: The path to the program that's run.
+        """
+        return self._program
+
+    def run(self, file_name):
+        """Run the program for a file.
+
+        Parameters:
+            file_name (str): The file name to substitute into the arguments.
+
+        Yields:
+            str: A string containing the output (possibly the partial output)
+                of the program, both stdout and stderr.
+        """
+        yield from self._run_command(self._build_arguments([file_name]))
+
+    def run_batch(self, file_names):
+        """Run the program for a batch of files.
+
+        The program is run once for each chunk of files that fits within the
+        system's limit on the length of a command.
+
+        Parameters:
+            file_names (list): The file names to substitute into the
+                arguments.
+
+        Yields:
+            str: A string containing the output (possibly the partial output)
+                of the program, both stdout and stderr.
+        """
+        for chunk in self._chunk_file_names(file_names):
+            yield from self._run_command(self._build_arguments(chunk))
+
+    def _build_arguments(self, file_names):
+        """Substitute file names into the arguments.
+
+        Parameters:
+            file_names (list): The file names to substitute.
+
+        Returns:
+            list: The arguments to run the program with.
+        """
+        arguments = []
+        for template in self._argument_templates:
+            if template is None:
+                arguments.extend(file_names)
+            else:
+                arguments.append(template.render(file_names, quote=False))
+
+        return arguments
+
+    def _start(self, command):
+        """Start the program.
+
+        Parameters:
+            command (list): The arguments to run the program with.
+
+        Returns:
+            subprocess.Popen: The started process, with stdout and stderr
+            combined into a pipe.
+        """
+        return subprocess.Popen(
+            command, executable=self.program, stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT, encoding='UTF-8', bufsize=1)
@@ -0,0 +1,363 @@
+"""The :class:`.Python` doer calls a Python function, without starting a new
+process.
+
+The command is the function to call, in the form ``module:function``. The
+module is imported once, when the doer is created, and the function is then
+called with the name of each changed file. As with ``python -m``, modules are
+imported from the current working directory first.
+
+>>> doer = Python('my_project.checks:validate')
+>>> doer.run('config.yaml')
+
+Anything the function prints is captured and yielded, followed by its return
+value (unless it's ``None``). A function that raises an exception is reported
+as having failed, along with the traceback.
+
+Options can be given after an ``@``, separated by commas:
+
+* ``batch`` calls the function once with a list of all of the changed files.
+* ``thread`` calls the function in a single dedicated thread, for functions
+  that aren't safe to call from several threads at once (see ``--jobs``).
+* ``process`` calls the function in a pool of processes, for functions that
+  would otherwise hold the GIL for a long time.
+
+>>> doer = Python('my_project.checks:validate_all@batch,process')
+>>> doer.run_batch(['a.yaml', 'b.yaml'])
+"""
+
+import io
+import os
+import sys
+import threading
+import traceback
+from operator import attrgetter
+from importlib import import_module
+from contextlib import contextmanager, redirect_stdout
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import ProcessPoolExecutor
+
+from . import Doer
+from .doer import Failure
+from ..exceptions import InvalidCommand
+
+
+# The options that can be given after the function
+_OPTIONS = ('batch', 'thread', 'process')
+
+
+class _ThreadStdout:
+    """Sends writes to ``sys.stdout`` to a buffer for the current thread, if
+    it has one, so that the output of functions running in different threads
+    is kept apart.
+    """
+
+    def __init__(self, stream):
+        """Initialise the :class:`._ThreadStdout`.
+
+        Parameters:
+            stream (file): The stream written to by threads without a buffer.
+        """
+        self._stream = stream
+        self._local = threading.local()
+
+    def __getattr__(self, name):
+        return getattr(self._stream, name)
+
+    @property
+    def stream(self):
+        """file: The stream written to by threads without a buffer.
+        """
+        return self._stream
+
+    def capture(self, buffer):
+        """Set (or clear) the buffer of the current thread.
+
+        Parameters:
+            buffer (io.StringIO): The buffer to write to, or ``None`` to write
+                to the original stream.
+        """
+        self._local.buffer = buffer
+
+    def write(self, string):
+        """Write a string to the buffer of the current thread, or the
+        original stream if it doesn't have one.
+
+        Parameters:
+            string (str): The string to write.
+
+        Returns:
+            int: The number of characters written.
+        """
+        buffer = getattr(self._local, 'buffer', None)
+        if buffer is not None:
+            return buffer.write(string)
+
+        return self._stream.write(string)
+
+    def flush(self):
+        """Flush the original stream, unless the current thread is writing
+        to a buffer.
+        """
+        if getattr(self._local, 'buffer', None) is None:
+            self._stream.flush()
+
+
+_STDOUT_LOCK = threading.Lock()
+_STDOUT = None
+_STDOUT_USERS = 0
+
+
+@contextmanager
+def _capture_stdout(buffer):
+    """Send writes to ``sys.stdout`` from the current thread to a buffer.
+
+    A :class:`._ThreadStdout` is installed as ``sys.stdout`` while any thread
+    is capturing its output, and the original stream is put back once the
+    last one has finished.
+
+    Parameters:
+        buffer (io.StringIO): The buffer to write to.
+    """
+    global _STDOUT, _STDOUT_USERS  # pylint: disable=global-statement
+
+    with _STDOUT_LOCK:
+        if _STDOUT_USERS == 0:
+            _STDOUT = _ThreadStdout(sys.stdout)
+            sys.stdout = _STDOUT
+        _STDOUT_USERS += 1
+        stdout = _STDOUT
+
+    stdout.capture(buffer)
+    try:
+        yield
+    finally:
+        stdout.capture(None)
+
+        with _STDOUT_LOCK:
+            _STDOUT_USERS -= 1
+            if _STDOUT_USERS == 0:
+                # Leave sys.stdout alone if it's been replaced since
+                if sys.stdout is _STDOUT:
+                    sys.stdout = _STDOUT.stream
+                _STDOUT = None
+
+
+def _import_function(path, directory):
+    """Import a function.
+
+    Parameters:
+        path (str): The function to import, in the form ``module:function``.
+        directory (str): The directory to import the module from, added to
+            the start of ``sys.path`` if it isn't already on it.
+
+    Raises:
+        InvalidCommand: If the function can't be imported.
+
+    Returns:
+        callable: The function.
+    """
+    module_name, _, function_name = path.partition(':')
+    if not module_name or not function_name:
+        raise InvalidCommand(
+            'expected "module:function", got "{}"'.format(path))
+
+    if directory not in sys.path:
+        sys.path.insert(0, directory)
+
+    try:
+        function = attrgetter(function_name)(import_module(module_name))
+    except (ImportError, AttributeError) as ex:
+        raise InvalidCommand(
+            'unable to import "{}": {}'.format(path, ex)) from ex
+
+    if not callable(function):
+        raise InvalidCommand('"{}" is not callable'.format(path))
+
+    return function
+
+
+def _call_in_process(path, directory, argument):
+    """Import and call a function in a worker process.
+
+    Modules are cached by the import system, so they're only imported once
+    per worker.
+
+    Parameters:
+        path (str): The function to call, in the form ``module:function``.
+        directory (str): The directory to import the module from.
+        argument (str|list): The argument to call the function with.
+
+    Returns:
+        tuple: The ``(output, result, error)`` of the call, see
+        :meth:`.Python._call`.
+    """
+    output = io.StringIO()
+    try:
+        with redirect_stdout(output):
+            result = _import_function(path, directory)(argument)
+    except Exception:  # pylint: disable=broad-except
+        return output.getvalue(), None, traceback.format_exc()
+
+    return output.getvalue(), result, None
+
+
+class Python(Doer):
+    """This class implements the :class:`.Doer` interface to call Python
+    functions.
+    """
+
+    def __init__(self, command):
+        """Initialise the :class:`.Python` doer, importing the function.
+
+        Parameters:
+            command (str): The function to call, in the form
+                ``module:function``, optionally followed by ``@`` and a comma
+                separated list of options.
+
+        Raises:
+            InvalidCommand: If the function can't be imported or an option
+                isn't recognised.
+        """
+        super(Python, self).__init__(command)
+
+        path, _, options = command.strip().partition('@')
+        self._path = path
+        self._options = set(filter(None, options.split(',')))
+
+        unknown = self._options.difference(_OPTIONS)
+        if unknown:
+            raise InvalidCommand('unknown option(s): {}'.format(
+                ', '.join(sorted(unknown))))
+
+        self._directory = os.getcwd()
+        self._function = _import_function(path, self._directory)
+
+        self._executor = None
+        self._executor_lock = threading.Lock()
+
+    @property
+    def function(self):
+        """callable: The function that's called.
+        """
+        return self._function
+
+    @property
+    def options(self):
+        """set: The options given after the function.
+        """
+        return self._options
+
+    @property
+    def is_batch(self):
+        """bool: A boolean value indicating whether the ``batch`` option was
+        given, and the function should be called once for all of the changed
+        files.
+        """
+        return 'batch' in self.options
+
+    def run(self, file_name):
+        """Call the function with a file name.
+
+        Parameters:
+            file_name (str): The file name to call the function with.
+
+        Yields:
+            str: The output of the function, followed by its return value.
+        """
+        yield from self._call(file_name)
+
+    def run_batch(self, file_names):
+        """Call the function with all of the files, if the ``batch`` option
+        was given.
+
+        Parameters:
+            file_names (list): The file names to call the function with.
+
+        Yields:
+            str: The output of the function, followed by its return value.
+        """
+        if not self.is_batch:
+            yield from super(Python, self).run_batch(file_names)
+            return
+
+        yield from self._call(list(file_names))
+
+    def close(self):
+        """Shut down the thread or process pool, if one was started.
+        """
+        with self._executor_lock:
+            if self._executor is not None:
+                self._executor.shutdown()
+                self._executor = None
+
+    def _get_executor(self):
+        """Get the pool the function is called in, starting it if required.
+
+        Returns:
+            concurrent.futures.Executor: The pool, or ``None`` if the function
+            is called in the current thread.
+        """
+        with self._executor_lock:
+            if self._executor is None:
+                if 'process' in self.options:
+                    self._executor = ProcessPoolExecutor()
+                elif 'thread' in self.options:
+                    self._executor = ThreadPoolExecutor(max_workers=1)
+
+            return self._executor
+
+    def _call(self, argument):
+        """Call the function, in the pool or the current thread.
+
+        Parameters:
+            argument (str|list): The argument to call the function with.
+
+        Yields:
+            str: The output of the function, followed by its return value, or
+                the traceback if it raised an exception.
+        """
+        if self.cancelled:
+            return
+
+        executor = self._get_executor()
+        if 'process' in self.options:
+            future = executor.submit(_call_in_process, self._path,
+                                     self._directory, argument)
+        elif executor is not None:
+            future = executor.submit(self._call_in_thread, argument)
+        else:
+            future = None
+
+        output, result, error = (future.result() if future is not None
+                                 else self._call_in_thread(argument))
+
+        if output:
+            yield output
+
+        if error is not None:
+            yield error
+            yield Failure('Command failed to run, raised an exception')
+        elif result is not None:
+            result = str(result)
+            yield result if result.endswith('\n') else result + '\n'
+
+    def _call_in_thread(self, argument):
+        """Call the function in the current thread, capturing its output.
+
+        Parameters:
+            argument (str|list): The argument to call the function with.
+
+        Returns:
+            tuple: The ``(output, result, error)`` of the call, where
+            ``output`` is what the function printed, ``result`` is its return
+            value and ``error`` is the formatted traceback if it raised an
+            exception (otherwise ``None``).
+        """
+        output = io.StringIO()
+        try:
+            with _capture_stdout(output):
+                result = self._function(argument)
+        except Exception:  # pylint: disable=broad-except
+            return output.getvalue(), None, traceback.format_exc()
+
+        return output.getvalue(), result, None
@@ -10,11 +10,50 @@ To actually run and retrieve the output of this command, the :meth:`run` method
 should be called.
 
 >>> doer.run('myfile.txt')
+
+Commands containing the ``%F`` token can be run once for many files using the
+:meth:`run_batch` method, the files are split into as few chunks as the
+system's limit on the length of a command allows.
+
+>>> doer = Shell('flake8 %F')
+>>> doer.run_batch(['a.py', 'b.py', 'c.py'])
+
+Commands are run in Watch Do's process group, so that they're interrupted
+along with it (i.e. by Ctrl-C). If the doers can be cancelled (see
+``--restart``) :func:`set_new_session` should be called first, so that each
+command is run in a new session and :meth:`Shell.cancel` can stop the command
+along with any processes it has started. Any commands still running when the
+doer is closed are stopped.
 """
 
+import signal
+import threading
 import subprocess
 
 from . import Doer
+from .doer import Failure
+from .doer import _kill_after
+from .doer import _signal_process
+
+
+# The time (in seconds) a cancelled command is given to exit before it's
+# killed
+_GRACE_PERIOD = 5
+
+# The time (in seconds) commands are given to exit when the doer is closed
+_CLOSE_GRACE_PERIOD = 1
+
+
+def set_new_session(new_session):
+    """Set whether the :class:`.Shell` doers start their commands in a new
+    session.
+
+    Parameters:
+        new_session (bool): A boolean value indicating whether to start each
+            command in a new session, so that its whole process group can be
+            stopped when the doer is cancelled.
+    """
+    Shell.new_session = new_session
 
 
 class Shell(Doer):
@@ -24,12 +63,80 @@ class Shell(Doer):
     captured.
     """
 
+    #: bool: Whether commands are started in a new session, set using
+    #: :func:`set_new_session`.
+    new_session = False
+
+    # Whether the doer's commands can be started in a new session, so their
+    # whole process group can be signalled
+    _process_group = True
+
+    def __init__(self, command):
+        """Initialise the :class:`.Shell` doer.
+
+        Parameters:
+            command (str): The shell command to run.
+        """
+        super(Shell, self).__init__(command)
+
+        self._lock = threading.Lock()
+        self._processes = set()
+
+    def cancel(self, grace_period=None):
+        """Cancel the commands that are running.
+
+        Each command's process group is sent ``SIGTERM``, followed by
+        ``SIGKILL`` if it hasn't exited after the grace period. Commands
+        aren't started again until :meth:`reset` is called.
+
+        Parameters:
+            grace_period (float): The time (in seconds) the commands are given
+                to exit before they're killed, defaults to 5 seconds.
+        """
+        if grace_period is None:
+            grace_period = _GRACE_PERIOD
+
+        with self._lock:
+            super(Shell, self).cancel(grace_period)
+            processes = list(self._processes)
+
+        for process in processes:
+            _kill_after(process, grace_period, self._signals_group)
+
+    def close(self):
+        """Stop the commands that are still running, i.e. when Watch Do is
+        interrupted.
+
+        Each command (or its process group) is sent ``SIGTERM``, followed by
+        ``SIGKILL`` if it hasn't exited after a second.
+        """
+        with self._lock:
+            super(Shell, self).cancel()
+            processes = list(self._processes)
+
+        for process in processes:
+            _signal_process(process, signal.SIGTERM, self._signals_group)
+
+        for process in processes:
+            try:
+                process.wait(_CLOSE_GRACE_PERIOD)
+            except subprocess.TimeoutExpired:
+                _signal_process(
+                    process, getattr(signal, 'SIGKILL', signal.SIGTERM),
+                    self._signals_group)
+
+    @property
+    def _signals_group(self):
+        """bool: Whether the commands' process groups are signalled, rather
+        than only the commands themselves.
+        """
+        return self._process_group and self.new_session
+
     def run(self, file_name):
         """Run the command in the shell.
 
-        The :meth:`_interpolate_file_name` is called on the ``command`` with
-        ``file_name`` as a parameter to ensure this ``file_name`` is
-        interpolated if it's required.
+        The ``file_name`` is interpolated into the command's
+        :attr:`template`, if it's required.
 
         Parameters:
             file_name (str): The ``file_name`` that this doer should run
@@ -39,17 +146,78 @@ class Shell(Doer):
             str: A string containing the output (possibly the partial output)
                 of the command, both stdout and stderr.
         """
-        command = Doer._interpolate_file_name(self.command, file_name)
+        yield from self._run_command(self.template.render([file_name]))
+
+    def run_batch(self, file_names):
+        """Run the command in the shell for a batch of files.
+
+        The ``%F`` token is replaced with the file names, the command is run
+        once for each chunk of files that fits within the system's limit on
+        the length of a command.
+
+        Parameters:
+            file_names (list): The file names that this doer should run
+                against.
+
+        Yields:
+            str: A string containing the output (possibly the partial output)
+                of the command, both stdout and stderr.
+        """
+        for chunk in self._chunk_file_names(file_names):
+            yield from self._run_command(self.template.render(chunk))
+
+    def _run_command(self, command):
+        """Run a command in the shell.
+
+        Nothing is run if the doer has been cancelled.
+
+        Parameters:
+            command (str|list): The command to run, see :meth:`_start`.
 
-        with subprocess.Popen(command, stdout=subprocess.PIPE,
-                              stderr=subprocess.STDOUT, encoding='UTF-8',
-                              bufsize=1, shell=True) as process:
-            for line in process.stdout:
-                yield line
+        Yields:
+            str: A string containing the output (possibly the partial output)
+                of the command, both stdout and stderr.
+        """
+        # The process is registered while holding the lock, so it can't be
+        # missed by a concurrent cancellation
+        with self._lock:
+            if self.cancelled:
+                return
+
+            process = self._start(command)
+            self._processes.add(process)
+
+        try:
+            with process:
+                for line in process.stdout:
+                    yield line
+
+                process.wait()
+        finally:
+            # A command that's still running (i.e. the output stopped being
+            # read when Watch Do was interrupted) is left to :meth:`close`
+            with self._lock:
+                if process.poll() is not None:
+                    self._processes.discard(process)
+
+        # If the command returned a non 0 exit code (or was killed by a signal,
+        # other than by cancelling it), yield an error message
+        if process.returncode != 0 and not self.cancelled:
+            yield Failure('Command failed to run, exited with error code {}'
+                          .format(process.returncode), process.returncode)
+
+    def _start(self, command):
+        """Start a command in the shell, in a new session if
+        :attr:`new_session` is set.
 
-            process.wait()
+        Parameters:
+            command (str): The command to start.
 
-            # If the command returned a non 0 exit code, yield an error message
-            if process.returncode > 0:
-                yield ('Command failed to run, exited with error code {}'
-                       .format(process.returncode))
+        Returns:
+            subprocess.Popen: The started process, with stdout and stderr
+            combined into a pipe.
+        """
+        return subprocess.Popen(
+            command, stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+            encoding='UTF-8', bufsize=1, shell=True,
+            start_new_session=self.new_session)
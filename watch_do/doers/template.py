@@ -0,0 +1,170 @@
+"""The :class:`.Template` class interpolates file names into commands.
+
+A command is compiled into a list of literal text and tokens once, so each
+run only has to render the tokens and join the segments together.
+
+>>> template = Template('cp %f "%{dir}/%{stem}.bak"')
+>>> template.render(['src/main.py'])
+'cp src/main.py "src/main.bak"'
+
+The following tokens are supported, all but ``%F`` refer to the first file:
+
+=============  ================================================================
+Token          Replaced with
+=============  ================================================================
+``%f``         The file name, as it was given.
+``%F``         All of the file names, quoted for the shell and separated by
+               spaces.
+``%{dir}``     The directory containing the file, or ``.`` if there's none.
+``%{name}``    The file's name without the directory, i.e. ``main.py``.
+``%{stem}``    The file's name without the directory or extension, i.e.
+               ``main``.
+``%{ext}``     The file's extension, including the dot, i.e. ``.py``.
+``%{rel}``     The file's path relative to the current directory.
+``%{abs}``     The file's absolute path.
+``%{type}``    The type of the change, one of ``created``, ``modified``,
+               ``removed`` or ``renamed``.
+``%{old}``     The file's previous name if it was renamed, otherwise the file
+               name.
+=============  ================================================================
+
+A token can be escaped with a backslash (i.e. ``\\%f``), the backslash is
+removed and the token left as it is. Tokens with an unknown name are also left
+as they are.
+"""
+
+import os
+import re
+import shlex
+
+from ..change import get_type
+
+
+# The tokens, optionally escaped, that can be interpolated into a command
+_TOKEN_REGEX = re.compile(r'(\\?)%([fF]|\{(\w+)\})')
+
+
+def _get_directory(file_name):
+    """Get the directory containing a file, or ``.`` if there's none.
+    """
+    return os.path.dirname(file_name) or '.'
+
+
+def _get_stem(file_name):
+    """Get a file's name without its directory or extension.
+    """
+    return os.path.splitext(os.path.basename(file_name))[0]
+
+
+def _get_extension(file_name):
+    """Get a file's extension, including the dot.
+    """
+    return os.path.splitext(file_name)[1]
+
+
+def _get_old_file_name(file_name):
+    """Get a file's name before it was renamed, or its name if it wasn't.
+    """
+    return getattr(file_name, 'old_file_name', None) or str(file_name)
+
+
+# Functions to get the value of each token that refers to a single file
+_FILE_TOKENS = {
+    'f': str,
+    'dir': _get_directory,
+    'name': os.path.basename,
+    'stem': _get_stem,
+    'ext': _get_extension,
+    'rel': os.path.relpath,
+    'abs': os.path.abspath,
+    'type': get_type,
+    'old': _get_old_file_name
+}
+
+
+class Template:
+    """This class compiles a command, so file names can be interpolated into
+    it quickly.
+    """
+
+    def __init__(self, string):
+        """Compile the :class:`.Template`.
+
+        Parameters:
+            string (str): The string containing the tokens.
+        """
+        self._string = string
+        self._segments = []
+
+        position = 0
+        for match in _TOKEN_REGEX.finditer(string):
+            escape, token, name = match.groups()
+            if name is not None:
+                token = name
+
+            if escape or (token != 'F' and token not in _FILE_TOKENS):
+                # Keep the token as literal text, without its escape
+                self._add_literal(string[position:match.start()])
+                self._add_literal(match.group()[len(escape):])
+            else:
+                self._add_literal(string[position:match.start()])
+                self._segments.append((True, token))
+
+            position = match.end()
+
+        self._add_literal(string[position:])
+
+    @property
+    def string(self):
+        """str: The string the template was compiled from.
+        """
+        return self._string
+
+    @property
+    def tokens(self):
+        """list: The tokens in the template, in order, i.e. ``'f'`` or
+        ``'stem'``.
+        """
+        return [value for is_token, value in self._segments if is_token]
+
+    def render(self, file_names, quote=True):
+        """Interpolate file names into the template.
+
+        Parameters:
+            file_names (list): The file names, tokens other than ``%F`` refer
+                to the first of them.
+            quote (bool): A boolean value indicating whether to quote the file
+                names for the shell when replacing ``%F``.
+
+        Returns:
+            str: The template with the file names interpolated.
+        """
+        first = file_names[0] if file_names else None
+
+        parts = []
+        for is_token, value in self._segments:
+            if not is_token:
+                parts.append(value)
+            elif value == 'F':
+                parts.append(' '.join(
+                    shlex.quote(file_name) if quote else file_name
+                    for file_name in file_names))
+            elif first is not None:
+                parts.append(_FILE_TOKENS[value](first))
+
+        return ''.join(parts)
+
+    def _add_literal(self, text):
+        """Add literal text to the end of the template, merging it with any
+        literal text before it.
+
+        Parameters:
+            text (str): The text to add.
+        """
+        if not text:
+            return
+
+        if self._segments and not self._segments[-1][0]:
+            self._segments[-1] = (False, self._segments[-1][1] + text)
+        else:
+            self._segments.append((False, text))
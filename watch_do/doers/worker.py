@@ -0,0 +1,218 @@
+"""The :class:`.Worker` doer sends changed files to a long-lived process.
+
+The command is started once, rather than once per change, so tools with a slow
+startup (i.e. Python, Node or the JVM) only pay for it once. Each changed file
+is sent to the process's stdin as a line of JSON, and the process responds
+with a line of JSON once it's done.
+
+>>> doer = Worker('python validate_worker.py')
+>>> doer.run('config.yaml')
+
+For the above example, the process would be sent the following request.
+
+.. code-block:: json
+
+   {"file": "config.yaml", "type": "modified"}
+
+The ``type`` is the type of the change, one of ``created``, ``modified``,
+``removed`` or ``renamed``.
+
+It should then respond with a JSON object on a single line, both keys are
+optional. Lines written before the response that aren't a JSON object are
+passed through as output, so stray prints aren't lost.
+
+.. code-block:: json
+
+   {"output": "config.yaml is valid\\n", "returncode": 0}
+
+Anything written to stderr is passed straight through to the terminal. If the
+process exits it's started again for the next file.
+"""
+
+import json
+import threading
+import subprocess
+
+from . import Doer
+from ..change import get_type
+from .doer import Failure
+from .doer import _kill_after
+
+
+# The time (in seconds) the process is given to exit when closed
+_GRACE_PERIOD = 5
+
+
+class Worker(Doer):
+    """This class implements the :class:`.Doer` interface to send files to a
+    persistent process.
+    """
+
+    def __init__(self, command):
+        """Initialise the :class:`.Worker` doer, the process isn't started
+        until it's first needed.
+
+        Parameters:
+            command (str): The shell command that starts the process.
+        """
+        super(Worker, self).__init__(command)
+
+        self._lock = threading.Lock()
+        self._process = None
+
+    @property
+    def process(self):
+        """subprocess.Popen: The process, or ``None`` if it hasn't been
+        started (or has been stopped).
+        """
+        return self._process
+
+    def run(self, file_name):
+        """Send a file to the process and yield its response.
+
+        Requests are sent one at a time, so the process never has to handle
+        more than one file at once.
+
+        Parameters:
+            file_name (str): The file name to send to the process.
+
+        Yields:
+            str: The output of the process, and an error message if the file
+                couldn't be handled.
+        """
+        with self._lock:
+            if self.cancelled:
+                return
+
+            yield from self._request(
+                {'file': file_name, 'type': get_type(file_name)})
+
+    def cancel(self, grace_period=None):
+        """Cancel the request in progress by terminating the process, it's
+        started again for the next request after :meth:`reset` is called.
+
+        Parameters:
+            grace_period (float): The time (in seconds) the process is given
+                to exit before it's killed, defaults to 5 seconds.
+        """
+        super(Worker, self).cancel(grace_period)
+
+        process = self._detach()
+        if process is not None:
+            _kill_after(process, _GRACE_PERIOD if grace_period is None
+                        else grace_period)
+
+    def close(self):
+        """Stop the process.
+
+        Its stdin is closed so that it can exit cleanly, it's killed if it
+        hasn't exited after 5 seconds.
+        """
+        process = self._detach()
+        if process is None:
+            return
+
+        try:
+            process.wait(_GRACE_PERIOD)
+        except subprocess.TimeoutExpired:
+            _kill_after(process, 0)
+            process.wait()
+
+        self._close_pipes(process)
+
+    def _start(self):
+        """Start the process, unless it's already running.
+
+        Returns:
+            subprocess.Popen: The running process.
+        """
+        process = self._process
+        if process is None or process.poll() is not None:
+            process = subprocess.Popen(
+                self.command, stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+                encoding='UTF-8', bufsize=1, shell=True,
+                start_new_session=True)
+            self._process = process
+
+        return process
+
+    def _detach(self):
+        """Close the process's stdin and forget about it, so the process is
+        started again for the next request.
+
+        Returns:
+            subprocess.Popen: The process, or ``None`` if it wasn't running.
+        """
+        process = self._process
+        self._process = None
+        if process is None or process.poll() is not None:
+            return None
+
+        try:
+            process.stdin.close()
+        except OSError:
+            pass
+
+        return process
+
+    @staticmethod
+    def _close_pipes(process):
+        """Close the pipes to a process that has exited.
+
+        Parameters:
+            process (subprocess.Popen): The process.
+        """
+        for pipe in (process.stdin, process.stdout):
+            try:
+                pipe.close()
+            except OSError:
+                pass
+
+    def _request(self, request):
+        """Send a request to the process and yield its response.
+
+        Parameters:
+            request (dict): The request to send.
+
+        Yields:
+            str: The output of the process.
+        """
+        process = self._start()
+        try:
+            process.stdin.write(json.dumps(request) + '\n')
+            process.stdin.flush()
+
+            for line in process.stdout:
+                try:
+                    response = json.loads(line)
+                except ValueError:
+                    response = None
+
+                if not isinstance(response, dict):
+                    yield line
+                    continue
+
+                if response.get('output'):
+                    yield response['output']
+
+                returncode = response.get('returncode') or 0
+                if returncode != 0:
+                    yield Failure(
+                        'Command failed to run, exited with error code {}'
+                        .format(returncode), returncode)
+                return
+        except (OSError, ValueError):
+            # The pipes were closed, i.e. the process died or was cancelled
+            pass
+
+        # The process exited without responding, it's started again for the
+        # next request
+        returncode = process.wait()
+        if self._process is process:
+            self._process = None
+        self._close_pipes(process)
+
+        if not self.cancelled:
+            yield Failure(
+                'Worker exited with error code {}, it will be restarted'
+                .format(returncode), returncode)
@@ -0,0 +1,111 @@
+"""The :class:`.EventWriter` class writes what Watch Do is doing as a stream
+of JSON events, so that other programs can follow it without parsing the
+human readable output.
+
+Each event is a compact JSON object on its own line, with the name of the
+event and the time it happened, along with any other details.
+
+>>> event_writer = EventWriter(sys.stdout)
+>>> event_writer.write('change', file='main.py', type='modified')
+>>> event_writer.flush()
+
+For the above example, the following line would be written.
+
+.. code-block:: json
+
+   {"event":"change","time":1514764800.0,"file":"main.py","type":"modified"}
+
+Events are buffered until :meth:`.EventWriter.flush` is called, so a burst of
+events (i.e. the output of a chatty doer) is written with as few system calls
+as possible.
+
+The following events are written by the command line program.
+
+================  ============================================================
+Event             Details
+================  ============================================================
+``scan_start``    ``files``, the number of files being watched.
+``scan_finish``   ``duration``, ``files`` and ``changed`` (the number of
+                  changed files).
+``missing_file``  ``file``, a watched file that couldn't be found.
+``change``        ``file``, ``type`` and ``old_file`` (see :mod:`.change`).
+``run_start``     ``files``, the changed files the doers are run for.
+``doer_start``    ``doer``, ``command`` and ``files``.
+``output``        ``doer``, ``files`` and ``text``, a chunk of a doer's output.
+``doer_finish``   ``doer``, ``command``, ``files``, ``returncode``,
+                  ``duration``, ``skipped`` and ``cancelled``.
+``run_finish``    ``files``, ``duration`` and ``cancelled``.
+================  ============================================================
+"""
+
+import json
+import time
+import threading
+
+
+class EventWriter:
+    """This class writes events as lines of JSON.
+
+    It's safe to use from multiple threads, events are never interleaved.
+    """
+
+    def __init__(self, stream, buffer_size=65536):
+        """Initialise the :class:`.EventWriter`.
+
+        Parameters:
+            stream (file): The text stream to write the events to.
+            buffer_size (int): The number of characters buffered before
+                they're written, even if :meth:`flush` isn't called.
+        """
+        self._stream = stream
+        self._buffer_size = buffer_size
+
+        self._lock = threading.Lock()
+        self._buffer = []
+        self._buffered = 0
+
+    @property
+    def stream(self):
+        """file: The stream the events are written to.
+        """
+        return self._stream
+
+    @property
+    def buffer_size(self):
+        """int: The number of characters buffered before they're written.
+        """
+        return self._buffer_size
+
+    def write(self, event, **details):
+        """Write an event.
+
+        Parameters:
+            event (str): The name of the event, i.e. ``change``.
+            **details: The details of the event, which must be serialisable
+                as JSON.
+        """
+        fields = {'event': event, 'time': round(time.time(), 6)}
+        fields.update(details)
+        line = json.dumps(fields, separators=(',', ':')) + '\n'
+
+        with self._lock:
+            self._buffer.append(line)
+            self._buffered += len(line)
+
+            if self._buffered >= self.buffer_size:
+                self._write_buffer()
+
+    def flush(self):
+        """Write the buffered events and flush the stream.
+        """
+        with self._lock:
+            self._write_buffer()
+            self.stream.flush()
+
+    def _write_buffer(self):
+        """Write the buffered events to the stream, the lock must be held.
+        """
+        if self._buffer:
+            self.stream.write(''.join(self._buffer))
+            self._buffer = []
+            self._buffered = 0
@@ -13,3 +13,8 @@ class UnknownWatcher(ImportError):
 class UnknownDoer(ImportError):
     """This can be raised when a :class:`.Doer` cannot be found.
     """
+
+class InvalidCommand(ValueError):
+    """This can be raised when a :class:`.Doer` is given a command that it
+    can't perform.
+    """
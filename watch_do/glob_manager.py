@@ -13,10 +13,68 @@ To actually get the files matching the specified globs the :meth:`get_files`
 method can be called:
 
 >>> manager.get_files()
+
+The directories that are listed while expanding the globs are kept in an
+index along with their modification times. Subsequent calls only re-list the
+directories that have been modified since they were last listed, the files
+that were added or removed as a result can be retrieved directly using the
+:meth:`get_changes` method:
+
+>>> manager.get_changes()
+
+Files and directories can be excluded using ``.gitignore`` style patterns,
+optionally along with the patterns from the ``.gitignore`` files themselves.
+Excluded directories are never listed.
+
+>>> manager = GlobManager(['**/*.js'], ['node_modules/'], gitignore=True)
 """
 
 import os
-from pathlib import Path
+import time
+
+from .glob_matcher import GlobMatcher
+from .ignore_rules import IgnoreRules
+
+
+# Directories modified within this many seconds of being listed are listed
+# again next time, as further changes may not alter their modification time
+_RACY_WINDOW = 2
+
+
+def _join(directory, name):
+    """Join a directory and the name of an item inside of it.
+
+    Parameters:
+        directory (str): The directory, an empty string is the current
+            directory.
+        name (str): The name of the item in the directory.
+
+    Returns:
+        str: The path of the item.
+    """
+    return directory + '/' + name if directory else name
+
+
+# pylint: disable=too-few-public-methods
+class _Directory:
+    """An entry in the :class:`.GlobManager`'s index of listed directories.
+    """
+    __slots__ = ('mtime', 'directories', 'matches', 'inherited_rules',
+                 'rules', 'rules_mtime')
+
+    def __init__(self, inherited_rules):
+        """Initialise an empty entry.
+
+        Parameters:
+            inherited_rules (tuple): The :class:`.IgnoreRules` that apply to
+                the directory from the ``.gitignore`` files above it.
+        """
+        self.mtime = None
+        self.directories = set()
+        self.matches = set()
+        self.inherited_rules = inherited_rules
+        self.rules = None
+        self.rules_mtime = None
 
 
 class GlobManager:
@@ -25,22 +83,49 @@ class GlobManager:
     Multiple globs can be specified in order to watch a multitude of files.
     """
 
-    def __init__(self, globs):
+    def __init__(self, globs, excludes=None, gitignore=False):
         """Initialise the :class:`.GlobManager`.
 
         Parameters:
             globs (list): A list of globs (as strings) that this class will
                 expand.
+            excludes (list): A list of ``.gitignore`` style patterns (as
+                strings) matching files and directories that should never be
+                returned or listed.
+            gitignore (bool): A boolean value indicating whether to also
+                exclude the files and directories matched by ``.gitignore``
+                files.
         """
         self._globs = globs
+        self._excludes = excludes or []
+        self._gitignore = gitignore
         self._last_files = set()
 
+        self._matcher = GlobMatcher(globs)
+        self._exclude_rules = IgnoreRules(
+            self._excludes + (['.git/'] if gitignore else []))
+
+        self._index = {}
+
     @property
     def globs(self):
         """set: A ``set`` of globs that were passed into this class.
         """
         return self._globs
 
+    @property
+    def excludes(self):
+        """list: The exclude patterns that were passed into this class.
+        """
+        return self._excludes
+
+    @property
+    def gitignore(self):
+        """bool: A boolean value indicating whether ``.gitignore`` files are
+        being honoured.
+        """
+        return self._gitignore
+
     @property
     def last_files(self):
         """set: The ``set`` of files last returned by the :meth:`get_files`
@@ -55,20 +140,255 @@ class GlobManager:
             set: A ``set`` of strings containing the files that matched the
             globs passed into this class.
         """
-        files = set()
-        for glob_pattern in self.globs:
-            # If the path is absolute, convert it to a relative one.
-            # This is because Path().glob only takes relative globs.
-            if os.path.isabs(glob_pattern):
-                glob_pattern = os.path.relpath(glob_pattern)
-
-            # This can be changed for glob.glob when Python3.5 is more widely
-            # used, so we can do recursive globbing
-            items = Path().glob(glob_pattern)
-
-            for item in items:
-                if item.is_file():
-                    files.add(item.as_posix())
-
-        self._last_files = files
-        return files
+        self.get_changes()
+
+        return set(self._last_files)
+
+    def get_changes(self):
+        """Expand the globs and return the files added and removed since the
+        last time they were expanded.
+
+        Only the directories that have been modified since they were last
+        listed are listed again.
+
+        Returns:
+            tuple: An ``(added, removed)`` tuple of ``set``'s containing the
+            files that have started and stopped matching the globs.
+        """
+        added = set()
+        removed = set()
+        listed = set()
+
+        # Roots that don't exist yet may have been created since last time
+        for root in self._matcher.roots:
+            if root not in self._index:
+                self._list_directory(root, self._get_inherited_rules(root),
+                                     added, removed, listed)
+
+        for directory in list(self._index):
+            entry = self._index.get(directory)
+            if directory in listed or entry is None:
+                continue
+
+            rules_mtime = None
+            try:
+                mtime = os.stat(directory or '.').st_mtime_ns
+                if entry.rules_mtime is not None:
+                    rules_mtime = os.stat(
+                        _join(directory, '.gitignore')).st_mtime_ns
+            except OSError:
+                # The directory, or its .gitignore, has been removed
+                mtime = None
+
+            if mtime != entry.mtime or rules_mtime != entry.rules_mtime:
+                self._list_directory(directory, entry.inherited_rules,
+                                     added, removed, listed)
+
+        # Files may have been removed and added again (or vice versa) as
+        # directories were removed and listed
+        overlap = added & removed
+        added -= overlap
+        removed -= overlap
+
+        added -= self._last_files
+        removed &= self._last_files
+
+        self._last_files -= removed
+        self._last_files |= added
+
+        return added, removed
+
+    def _list_directory(self, directory, inherited_rules, added, removed,
+                        listed):
+        """List a directory, updating the index and recording the changes.
+
+        Any new sub-directories that could contain matching files are also
+        listed, excluded ones are skipped.
+
+        Parameters:
+            directory (str): The directory to list.
+            inherited_rules (tuple): The :class:`.IgnoreRules` from the
+                ``.gitignore`` files above the directory.
+            added (set): The ``set`` to add newly matching files to.
+            removed (set): The ``set`` to add files that no longer match to.
+            listed (set): The ``set`` of directories that have been listed.
+        """
+        list_time = time.time()
+        try:
+            mtime = os.stat(directory or '.').st_mtime_ns
+            with os.scandir(directory or '.') as entries:
+                files = []
+                directories = []
+                rules_mtime = None
+                for item in entries:
+                    # The item's type is cached from the directory listing,
+                    # only symbolic links need an additional stat
+                    if item.is_dir(follow_symlinks=False):
+                        directories.append(item.name)
+                    elif item.is_file():
+                        files.append(item.name)
+
+                        if self.gitignore and item.name == '.gitignore':
+                            rules_mtime = item.stat().st_mtime_ns
+        except OSError:
+            self._remove_directory(directory, removed)
+            return
+
+        listed.add(directory)
+
+        old_entry = self._index.get(directory)
+        if old_entry is not None and old_entry.rules_mtime != rules_mtime:
+            # The .gitignore has changed, which affects the whole sub-tree
+            self._remove_directory(directory, removed)
+            old_entry = None
+
+        entry = _Directory(inherited_rules)
+        entry.rules_mtime = rules_mtime
+        if old_entry is not None:
+            entry.rules = old_entry.rules
+        elif rules_mtime is not None:
+            entry.rules = self._read_rules(directory)
+
+        if old_entry is None:
+            old_entry = _Directory(inherited_rules)
+
+        rules = inherited_rules
+        if entry.rules is not None:
+            rules += (entry.rules,)
+
+        is_excluded = self._get_exclusion_check(directory, rules)
+
+        for name in files:
+            path = _join(directory, name)
+            if (self._matcher.matches_file(path) and
+                    not is_excluded(path, name, False)):
+                entry.matches.add(path)
+
+        for name in directories:
+            path = _join(directory, name)
+            if (self._matcher.matches_directory(path) and
+                    not is_excluded(path, name, True)):
+                entry.directories.add(name)
+
+        # The directory may be modified again without its modification time
+        # changing, so make sure it's listed again next time
+        if mtime / 1e9 <= list_time - _RACY_WINDOW:
+            entry.mtime = mtime
+
+        self._index[directory] = entry
+
+        added |= entry.matches - old_entry.matches
+        removed |= old_entry.matches - entry.matches
+
+        for name in old_entry.directories - entry.directories:
+            self._remove_directory(_join(directory, name), removed)
+
+        for name in entry.directories - old_entry.directories:
+            self._list_directory(_join(directory, name), rules,
+                                 added, removed, listed)
+
+    def _get_exclusion_check(self, directory, rules):
+        """Create a function that checks if an item in a directory is
+        excluded.
+
+        Parameters:
+            directory (str): The directory containing the items.
+            rules (tuple): The :class:`.IgnoreRules` from the ``.gitignore``
+                files that apply to the directory.
+
+        Returns:
+            callable: A function taking the item's path, name and whether
+            it's a directory, returning True if the item is excluded.
+        """
+        # Work out where the directory is relative to each set of rules once,
+        # rather than for every item
+        relative_rules = []
+        for ignore_rules in rules:
+            relative_directory = ignore_rules.relative_path(directory)
+            if relative_directory is not None:
+                relative_rules.append((ignore_rules, relative_directory))
+
+        def is_excluded(path, name, is_directory):
+            """Check if an item in the directory is excluded.
+            """
+            if self._exclude_rules.match(path, is_directory):
+                return True
+
+            # The last rule to match takes precedence
+            excluded = None
+            for ignore_rules, relative_directory in relative_rules:
+                matched = ignore_rules.match(
+                    _join(relative_directory, name), is_directory)
+                if matched is not None:
+                    excluded = matched
+
+            return bool(excluded)
+
+        return is_excluded
+
+    def _get_inherited_rules(self, root):
+        """Get the rules from the ``.gitignore`` files above a root.
+
+        The ``.gitignore`` files are read from the top level of the git
+        repository containing the root, down to the root's parent directory.
+
+        Parameters:
+            root (str): The root directory that's going to be listed.
+
+        Returns:
+            tuple: The :class:`.IgnoreRules` that apply to the root.
+        """
+        if not self.gitignore:
+            return ()
+
+        ancestors = []
+        directory = os.path.abspath(root or '.')
+        while not os.path.exists(os.path.join(directory, '.git')):
+            parent = os.path.dirname(directory)
+            if parent == directory:
+                # The root isn't inside of a git repository
+                return ()
+
+            directory = parent
+            ancestors.append(directory)
+
+        rules = ()
+        for ancestor in reversed(ancestors):
+            ancestor_rules = self._read_rules(ancestor)
+            if ancestor_rules is not None:
+                rules += (ancestor_rules,)
+
+        return rules
+
+    @staticmethod
+    def _read_rules(directory):
+        """Read the rules from the ``.gitignore`` file in a directory.
+
+        Parameters:
+            directory (str): The directory containing the ``.gitignore``.
+
+        Returns:
+            :class:`.IgnoreRules`: The rules, or ``None`` if the file
+            couldn't be read.
+        """
+        try:
+            return IgnoreRules.from_file(_join(directory, '.gitignore'))
+        except OSError:
+            return None
+
+    def _remove_directory(self, directory, removed):
+        """Remove a directory and its sub-directories from the index.
+
+        Parameters:
+            directory (str): The directory to remove.
+            removed (set): The ``set`` to add the files that were matching
+                inside of the directory to.
+        """
+        entry = self._index.pop(directory, None)
+        if entry is None:
+            return
+
+        removed |= entry.matches
+
+        for name in entry.directories:
+            self._remove_directory(_join(directory, name), removed)
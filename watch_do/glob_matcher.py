@@ -0,0 +1,267 @@
+"""The :class:`.GlobMatcher` class compiles a number of globs into a single
+matcher, allowing a directory tree to be walked once regardless of how many
+globs are being expanded.
+
+The globs follow the same rules as :meth:`pathlib.Path.glob`; ``*``, ``?`` and
+``[...]`` match within a single path segment and ``**`` matches any number of
+directories. A trailing ``**`` matches every file below the directory.
+
+As an example, the following code would create a matcher for Python files
+within ``src`` and the test files within ``tests``.
+
+>>> matcher = GlobMatcher(['src/**/*.py', 'tests/test_*.py'])
+>>> matcher.matches_file('src/watch_do/cli.py')
+True
+
+Directories can be checked to determine if they could contain any matching
+files, allowing whole sub-trees to be skipped while walking.
+
+>>> matcher.matches_directory('docs')
+False
+"""
+
+import os
+import re
+
+
+def _translate_segment(segment):
+    """Translate a single segment of a glob into a regular expression.
+
+    Parameters:
+        segment (str): A part of a glob that doesn't contain a ``/``.
+
+    Returns:
+        str: The regular expression matching the segment.
+    """
+    regex = ''
+    index = 0
+    while index < len(segment):
+        char = segment[index]
+        index += 1
+
+        if char == '*':
+            regex += '[^/]*'
+        elif char == '?':
+            regex += '[^/]'
+        elif char == '[':
+            end = index
+            if end < len(segment) and segment[end] == '!':
+                end += 1
+            if end < len(segment) and segment[end] == ']':
+                end += 1
+            end = segment.find(']', end)
+
+            if end == -1:
+                regex += re.escape(char)
+            else:
+                contents = segment[index:end].replace('\\', '\\\\')
+                if contents.startswith('!'):
+                    contents = '^' + contents[1:]
+                elif contents.startswith('^'):
+                    contents = '\\' + contents
+                regex += '[' + contents + ']'
+                index = end + 1
+        else:
+            regex += re.escape(char)
+
+    return regex
+
+
+def _is_magic(segment):
+    """Determine if a segment of a glob contains any wildcards.
+
+    Parameters:
+        segment (str): A part of a glob that doesn't contain a ``/``.
+
+    Returns:
+        bool: True if the segment contains a wildcard.
+    """
+    return any(char in segment for char in '*?[')
+
+
+def translate(glob_pattern):
+    """Translate a glob into a regular expression matching whole paths.
+
+    Parameters:
+        glob_pattern (str): The glob to translate, it should be relative and
+            use ``/`` as a separator.
+
+    Returns:
+        str: The regular expression (as a string) matching the paths of the
+        files the glob matches.
+    """
+    segments = [segment for segment in glob_pattern.split('/')
+                if segment not in ('', '.')]
+
+    regex = ''
+    for index, segment in enumerate(segments):
+        last = index == len(segments) - 1
+
+        if segment == '**':
+            regex += '.+' if last else '(?:.+/)?'
+        else:
+            regex += _translate_segment(segment) + ('' if last else '/')
+
+    return regex
+
+
+def _compile_glob(glob_pattern):
+    """Compile a glob into the regular expressions used to expand it.
+
+    Parameters:
+        glob_pattern (str): The glob to compile.
+
+    Returns:
+        tuple: A ``(root, file_regex, directory_regex)`` tuple. The root is
+        the directory that contains all of the glob's matches. The file regex
+        (as a string) matches the paths of the files the glob matches and the
+        directory regex matches the paths of directories that may contain
+        them.
+    """
+    # If the path is absolute, convert it to a relative one
+    if os.path.isabs(glob_pattern):
+        glob_pattern = os.path.relpath(glob_pattern)
+
+    segments = [segment for segment in glob_pattern.split('/')
+                if segment not in ('', '.')]
+
+    # The root consists of the directories without any wildcards in them
+    root_length = 0
+    while (root_length < len(segments) - 1 and
+           not _is_magic(segments[root_length])):
+        root_length += 1
+
+    root = '/'.join(segments[:root_length])
+
+    file_regex = translate('/'.join(segments))
+
+    # Build nested optional groups, so that each directory leading up to the
+    # files can be matched, i.e. `a(?:/b(?:/c)?)?`
+    directory_regex = ''
+    for segment in reversed(segments[:-1]):
+        if segment == '**':
+            directory_regex = '.*'
+        elif directory_regex:
+            directory_regex = (_translate_segment(segment) +
+                               '(?:/' + directory_regex + ')?')
+        else:
+            directory_regex = _translate_segment(segment)
+
+    return root, file_regex, directory_regex or '(?!)'
+
+
+def _is_inside(path, directory):
+    """Determine if a path is inside of a directory.
+
+    Parameters:
+        path (str): The path to check.
+        directory (str): The directory that may contain the path.
+
+    Returns:
+        bool: True if the path is inside of the directory.
+    """
+    if not directory:
+        return path.split('/')[0] != '..'
+
+    return path.startswith(directory + '/')
+
+
+class GlobMatcher:
+    """This class matches paths against a number of globs at once.
+
+    All of the globs are compiled into a single regular expression for
+    matching files, and another for matching the directories that could
+    contain those files.
+    """
+
+    def __init__(self, globs):
+        """Initialise the :class:`.GlobMatcher`, compiling the globs.
+
+        Parameters:
+            globs (list): A list of globs (as strings) to match against.
+        """
+        self._globs = globs
+
+        compiled = [_compile_glob(glob_pattern) for glob_pattern in globs]
+
+        self._roots = self._get_walk_roots(
+            {root for root, _, _ in compiled})
+        self._file_regex = self._combine(
+            [file_regex for _, file_regex, _ in compiled])
+        self._directory_regex = self._combine(
+            [directory_regex for _, _, directory_regex in compiled])
+
+    @property
+    def globs(self):
+        """list: The globs that were passed into this class.
+        """
+        return self._globs
+
+    @property
+    def roots(self):
+        """list: The directories that need to be walked to find every
+        matching file. Directories that are inside of another root are
+        omitted, as they are reached while walking that root.
+        """
+        return self._roots
+
+    def matches_file(self, path):
+        """Determine if a file's path matches any of the globs.
+
+        Parameters:
+            path (str): The path of the file, relative to the current
+                directory and using ``/`` as a separator.
+
+        Returns:
+            bool: True if any of the globs match the path.
+        """
+        return self._file_regex.fullmatch(path) is not None
+
+    def matches_directory(self, path):
+        """Determine if a directory could contain files matching the globs.
+
+        Parameters:
+            path (str): The path of the directory, relative to the current
+                directory and using ``/`` as a separator.
+
+        Returns:
+            bool: True if the directory, or any of its sub-directories, may
+            contain matching files.
+        """
+        return self._directory_regex.fullmatch(path) is not None
+
+    @staticmethod
+    def _combine(regexes):
+        """Combine regular expressions into one that matches any of them.
+
+        Parameters:
+            regexes (list): The regular expressions (as strings) to combine.
+
+        Returns:
+            re.Pattern: The compiled regular expression.
+        """
+        # Remove duplicates while keeping the order, so that the cheapest
+        # alternatives are tried first
+        unique = list(dict.fromkeys(regexes))
+
+        return re.compile(
+            '|'.join('(?:' + regex + ')' for regex in unique) or '(?!)',
+            re.DOTALL)
+
+    @staticmethod
+    def _get_walk_roots(roots):
+        """Remove the roots that are inside of other roots.
+
+        Parameters:
+            roots (set): The root directories of each of the globs.
+
+        Returns:
+            list: The sorted list of roots that need to be walked.
+        """
+        walk_roots = []
+        for root in sorted(roots):
+            if not any(_is_inside(root, walk_root)
+                       for walk_root in walk_roots):
+                walk_roots.append(root)
+
+        return walk_roots
@@ -0,0 +1,251 @@
+"""The :class:`.HashCache` class stores the hashes of files on disk, so that
+unchanged files don't have to be hashed again when Watch Do is restarted.
+
+Entries are keyed by the file's device, inode, size and modification time (in
+nanoseconds), along with the hashing algorithm. If any of these change, the
+entry no longer applies and the file is hashed again.
+
+As an example, the following code would load a cache, look up the hash of a
+file and store it if it wasn't found.
+
+>>> cache = HashCache('/home/user/.cache/watch-do/hashes')
+>>> stat = os.stat('model.bin')
+>>> digest = cache.get(stat, 'md5')
+>>> if digest is None:
+...     digest = Hasher('md5').hash_file('model.bin')
+...     cache.put('model.bin', stat, 'md5', digest)
+
+The cache is written using :meth:`save`, which merges in any entries saved by
+other instances and evicts entries for files that are no longer being watched.
+The file is replaced atomically, so a partially written cache is never read.
+"""
+
+import os
+import time
+import struct
+import threading
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+from .atomic_file import atomic_write
+
+
+_MAGIC = b'WDHC\x01'
+_RECORD = struct.Struct('<QQQqIBHB')
+
+# Files modified within this many seconds of being hashed aren't cached, as
+# further writes may not alter their modification time
+_RACY_WINDOW = 2
+
+
+class HashCache:
+    """This class stores the hashes of files, keyed by their stat.
+
+    The cache is loaded when it is created and must be saved explicitly using
+    the :meth:`save` method. It's safe to use from multiple threads, i.e.
+    saving it while the files are being hashed.
+    """
+
+    def __init__(self, file_name, max_entries=200000):
+        """Initialise the :class:`.HashCache`, loading any saved entries.
+
+        Parameters:
+            file_name (str): The path of the file the cache is stored in.
+            max_entries (int): The maximum number of entries to keep, the
+                least recently used entries are evicted first.
+        """
+        self._file_name = file_name
+        self._max_entries = max_entries
+        self._dirty = False
+
+        self._lock = threading.Lock()
+        self._entries = self._read()
+
+    @property
+    def file_name(self):
+        """str: The path of the file the cache is stored in.
+        """
+        return self._file_name
+
+    @property
+    def max_entries(self):
+        """int: The maximum number of entries the cache keeps.
+        """
+        return self._max_entries
+
+    @property
+    def dirty(self):
+        """bool: A boolean value indicating whether there are entries that
+        haven't been saved.
+        """
+        return self._dirty
+
+    def __len__(self):
+        with self._lock:
+            return len(self._entries)
+
+    def get(self, stat, algorithm):
+        """Get the stored hash of a file.
+
+        Parameters:
+            stat (os.stat_result): The current stat of the file.
+            algorithm (str): The name of the hashing algorithm.
+
+        Returns:
+            str: The hash of the file, or ``None`` if it isn't stored.
+        """
+        with self._lock:
+            entry = self._entries.get(self._get_key(stat, algorithm))
+            if entry is None:
+                return None
+
+            entry[2] = int(time.time())
+            return entry[1]
+
+    def put(self, file_name, stat, algorithm, digest):
+        """Store the hash of a file.
+
+        Files that have been modified very recently aren't stored, as they may
+        be modified again without their stat changing.
+
+        Parameters:
+            file_name (str): The path of the file.
+            stat (os.stat_result): The stat of the file when it was hashed.
+            algorithm (str): The name of the hashing algorithm.
+            digest (str): The hash of the file as a hexadecimal string.
+        """
+        now = time.time()
+        if stat.st_mtime_ns / 1e9 > now - _RACY_WINDOW:
+            return
+
+        with self._lock:
+            self._entries[self._get_key(stat, algorithm)] = [
+                file_name, digest, int(now)]
+            self._dirty = True
+
+    def save(self, watched_files=None):
+        """Save the cache, merging in entries saved by other instances.
+
+        Parameters:
+            watched_files (set): If given, entries for files that aren't in
+                this ``set`` are evicted.
+
+        Raises:
+            OSError: If the cache couldn't be written.
+        """
+        directory = os.path.dirname(self.file_name) or '.'
+        os.makedirs(directory, exist_ok=True)
+
+        with open(self.file_name + '.lock', 'a', encoding='UTF-8') as lock:
+            if fcntl is not None:
+                fcntl.flock(lock, fcntl.LOCK_EX)
+
+            # Entries from other instances are kept, unless we have our own
+            stored_entries = self._read()
+
+            with self._lock:
+                for key, entry in stored_entries.items():
+                    self._entries.setdefault(key, entry)
+
+                if watched_files is not None:
+                    self._entries = {
+                        key: entry for key, entry in self._entries.items()
+                        if entry[0] in watched_files}
+
+                if len(self._entries) > self.max_entries:
+                    keys = sorted(self._entries,
+                                  key=lambda key: self._entries[key][2],
+                                  reverse=True)
+                    for key in keys[self.max_entries:]:
+                        del self._entries[key]
+
+                data = self._serialise()
+                self._dirty = False
+
+            try:
+                with atomic_write(self.file_name, 'wb', '.hashes-') as handle:
+                    handle.write(data)
+            except BaseException:
+                self._dirty = True
+                raise
+
+    @staticmethod
+    def _get_key(stat, algorithm):
+        """Get the key for an entry.
+
+        Parameters:
+            stat (os.stat_result): The stat of the file.
+            algorithm (str): The name of the hashing algorithm.
+
+        Returns:
+            tuple: The key.
+        """
+        return (stat.st_dev, stat.st_ino, stat.st_size, stat.st_mtime_ns,
+                algorithm)
+
+    def _serialise(self):
+        """Serialise the entries into the cache's file format, the lock must
+        be held.
+
+        Returns:
+            bytes: The serialised entries.
+        """
+        chunks = [_MAGIC]
+        for key, (file_name, digest, last_used) in self._entries.items():
+            device, inode, size, mtime, algorithm = key
+            algorithm = algorithm.encode('ascii')
+            path = os.fsencode(file_name)
+            digest = bytes.fromhex(digest)
+
+            chunks.append(_RECORD.pack(
+                device, inode, size, mtime, last_used, len(algorithm),
+                len(path), len(digest)))
+            chunks.extend([algorithm, path, digest])
+
+        return b''.join(chunks)
+
+    def _read(self):
+        """Read the entries from the cache's file.
+
+        A missing, unreadable or corrupt file is treated as an empty cache.
+
+        Returns:
+            dict: The entries that were read.
+        """
+        try:
+            with open(self.file_name, 'rb') as handle:
+                data = handle.read()
+        except OSError:
+            return {}
+
+        if not data.startswith(_MAGIC):
+            return {}
+
+        entries = {}
+        offset = len(_MAGIC)
+        try:
+            while offset < len(data):
+                (device, inode, size, mtime, last_used, algorithm_length,
+                 path_length, digest_length) = _RECORD.unpack_from(
+                     data, offset)
+                offset += _RECORD.size
+
+                algorithm = data[offset:offset+algorithm_length]
+                offset += algorithm_length
+                path = data[offset:offset+path_length]
+                offset += path_length
+                digest = data[offset:offset+digest_length]
+                offset += digest_length
+
+                if offset > len(data):
+                    break
+
+                key = (device, inode, size, mtime, algorithm.decode('ascii'))
+                entries[key] = [os.fsdecode(path), digest.hex(), last_used]
+        except (struct.error, UnicodeDecodeError):
+            pass
+
+        return entries
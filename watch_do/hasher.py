@@ -0,0 +1,132 @@
+"""The :class:`.Hasher` class is responsible for efficiently hashing the
+contents of files, it's used by the hash based watchers.
+
+Files are read into a preallocated buffer, avoiding the creation of a new
+``bytes`` object for each chunk. Files aren't memory mapped, as a mapped file
+that's truncated while it's being hashed (i.e. rewritten by an editor) would
+kill the process with ``SIGBUS``.
+
+As an example, the following code would create a hasher using BLAKE2 and hash
+a file with it.
+
+>>> hasher = Hasher('blake2b')
+>>> hasher.hash_file('model.bin')
+
+The supported algorithms are listed in :data:`ALGORITHMS`, ``crc32`` is a
+non-cryptographic checksum that is considerably faster than the others.
+"""
+
+import zlib
+import hashlib
+import threading
+
+
+class _CRC32:
+    """A wrapper around :func:`zlib.crc32` providing the same interface as the
+    :mod:`hashlib` hash objects.
+    """
+
+    def __init__(self):
+        """Initialise the checksum.
+        """
+        self._value = 0
+
+    def update(self, data):
+        """Update the checksum with more data.
+
+        Parameters:
+            data (bytes): A bytes-like object to add to the checksum.
+        """
+        self._value = zlib.crc32(data, self._value)
+
+    def hexdigest(self):
+        """Get the checksum.
+
+        Returns:
+            str: The checksum as a hexadecimal string.
+        """
+        return '{:08x}'.format(self._value)
+
+
+#: The supported algorithms, mapped to a function creating a new hash object.
+ALGORITHMS = {
+    'md5': hashlib.md5,
+    'sha1': hashlib.sha1,
+    'blake2b': lambda: hashlib.blake2b(digest_size=16),
+    'crc32': _CRC32
+}
+
+
+class Hasher:
+    """This class hashes the contents of files.
+
+    A buffer is allocated for each thread that uses the hasher, so a single
+    instance can be safely shared between threads.
+    """
+
+    def __init__(self, algorithm='md5', chunk_size=1024 * 1024):
+        """Initialise the :class:`.Hasher`.
+
+        Parameters:
+            algorithm (str): The name of the algorithm to use, one of
+                :data:`ALGORITHMS`.
+            chunk_size (int): The number of bytes to read at a time.
+
+        Raises:
+            ValueError: If the algorithm isn't supported.
+        """
+        if algorithm not in ALGORITHMS:
+            raise ValueError('unsupported algorithm: ' + algorithm)
+
+        self._algorithm = algorithm
+        self._chunk_size = chunk_size
+
+        self._local = threading.local()
+
+    @property
+    def algorithm(self):
+        """str: The name of the algorithm being used.
+        """
+        return self._algorithm
+
+    @property
+    def chunk_size(self):
+        """int: The number of bytes read at a time.
+        """
+        return self._chunk_size
+
+    def hash_file(self, file_name):
+        """Hash the contents of a file.
+
+        Parameters:
+            file_name (str): The path of the file to hash.
+
+        Raises:
+            FileNotFoundError: If the file could not be found.
+
+        Returns:
+            str: The hash of the file's contents as a hexadecimal string.
+        """
+        file_hash = ALGORITHMS[self.algorithm]()
+
+        with open(file_name, 'rb', buffering=0) as file_handle:
+            view = self._get_buffer()
+            read = file_handle.readinto(view)
+            while read:
+                file_hash.update(view[:read])
+                read = file_handle.readinto(view)
+
+        return file_hash.hexdigest()
+
+    def _get_buffer(self):
+        """Get the calling thread's buffer, allocating it if required.
+
+        Returns:
+            memoryview: A view of the buffer.
+        """
+        view = getattr(self._local, 'view', None)
+        if view is None:
+            view = memoryview(bytearray(self.chunk_size))
+            self._local.view = view
+
+        return view
@@ -0,0 +1,189 @@
+"""The :class:`.IgnoreRules` class matches paths against a list of patterns
+that follow the format of a ``.gitignore`` file.
+
+Patterns without a ``/`` (ignoring a trailing one) match a file or directory
+with that name at any depth, patterns with a ``/`` are anchored to the base
+directory of the rules. A trailing ``/`` only matches directories and a
+leading ``!`` re-includes a path that was ignored by a previous pattern.
+
+As an example, the following code would create rules ignoring any
+``node_modules`` directory and the ``build`` directory at the top level.
+
+>>> rules = IgnoreRules(['node_modules/', '/build'])
+>>> rules.match('src/node_modules', True)
+True
+
+Rules can also be loaded from a ``.gitignore`` file, the directory containing
+the file is used as the base directory.
+
+>>> rules = IgnoreRules.from_file('src/.gitignore')
+"""
+
+import os
+import re
+
+from .glob_matcher import translate
+
+
+class IgnoreRules:
+    """This class matches paths against ``.gitignore`` style patterns.
+
+    The paths passed to :meth:`match` are relative to the base directory, the
+    :meth:`relative_path` method can be used to convert a directory into this
+    form.
+    """
+
+    def __init__(self, patterns, base=''):
+        """Initialise the :class:`.IgnoreRules`, compiling the patterns.
+
+        Parameters:
+            patterns (list): A list of patterns (as strings), the lines of a
+                ``.gitignore`` file.
+            base (str): The directory the patterns are relative to, an empty
+                string is the current directory.
+        """
+        self._patterns = patterns
+        self._base = os.path.abspath(base or '.')
+
+        self._rules = []
+        for pattern in patterns:
+            rule = self._compile_rule(pattern)
+            if rule is not None:
+                self._rules.append(rule)
+
+        # Without any negated rules the first match is the final answer, so
+        # all of the rules can be combined
+        self._negated = any(negated for _, negated, _ in self._rules)
+        self._file_regex = self._combine(
+            [regex for regex, _, directory_only in self._rules
+             if not directory_only])
+        self._directory_regex = self._combine(
+            [regex for regex, _, _ in self._rules])
+
+    @classmethod
+    def from_file(cls, file_name):
+        """Create the rules from the patterns in a ``.gitignore`` file.
+
+        Parameters:
+            file_name (str): The path of the file to read.
+
+        Raises:
+            OSError: If the file couldn't be read.
+
+        Returns:
+            :class:`.IgnoreRules`: The rules, relative to the directory
+            containing the file.
+        """
+        with open(file_name, encoding='UTF-8', errors='replace') as handle:
+            patterns = handle.read().splitlines()
+
+        return cls(patterns, os.path.dirname(file_name))
+
+    @property
+    def patterns(self):
+        """list: The patterns that were passed into this class.
+        """
+        return self._patterns
+
+    @property
+    def base(self):
+        """str: The absolute path of the directory the patterns are relative
+        to.
+        """
+        return self._base
+
+    def relative_path(self, directory):
+        """Get the path of a directory relative to the base directory.
+
+        Parameters:
+            directory (str): The directory, relative to the current directory.
+
+        Returns:
+            str: The path relative to the base directory (an empty string if
+            it is the base directory), or ``None`` if the directory isn't
+            inside of the base directory.
+        """
+        directory = os.path.abspath(directory or '.')
+        if directory == self._base:
+            return ''
+
+        prefix = self._base.rstrip(os.sep) + os.sep
+        if not directory.startswith(prefix):
+            return None
+
+        return directory[len(prefix):].replace(os.sep, '/')
+
+    def match(self, path, is_directory):
+        """Match a path against the rules.
+
+        Parameters:
+            path (str): The path, relative to the base directory and using
+                ``/`` as a separator.
+            is_directory (bool): Whether the path is a directory.
+
+        Returns:
+            bool: True if the path is ignored, False if it has been explicitly
+            re-included or ``None`` if none of the rules matched.
+        """
+        if not self._negated:
+            regex = self._directory_regex if is_directory else self._file_regex
+            return True if regex.fullmatch(path) else None
+
+        for regex, negated, directory_only in reversed(self._rules):
+            if directory_only and not is_directory:
+                continue
+
+            if regex.fullmatch(path):
+                return not negated
+
+        return None
+
+    @staticmethod
+    def _compile_rule(pattern):
+        """Compile a single pattern into a rule.
+
+        Parameters:
+            pattern (str): The pattern to compile.
+
+        Returns:
+            tuple: A ``(regex, negated, directory_only)`` tuple, or ``None``
+            if the pattern is blank or a comment.
+        """
+        # Trailing spaces are ignored unless they're escaped
+        if pattern.endswith('\\ '):
+            pattern = pattern.rstrip(' ') + ' '
+        else:
+            pattern = pattern.rstrip(' ')
+
+        if not pattern or pattern.startswith('#'):
+            return None
+
+        negated = pattern.startswith('!')
+        if negated or pattern.startswith(('\\!', '\\#')):
+            pattern = pattern[1:]
+
+        directory_only = pattern.endswith('/')
+        pattern = pattern.rstrip('/')
+
+        # Patterns containing a slash are relative to the base directory,
+        # otherwise they can match at any depth
+        anchored = '/' in pattern
+        regex = translate(pattern.replace('\\ ', ' '))
+        if not anchored:
+            regex = '(?:.+/)?' + regex
+
+        return re.compile(regex, re.DOTALL), negated, directory_only
+
+    @staticmethod
+    def _combine(regexes):
+        """Combine regular expressions into one that matches any of them.
+
+        Parameters:
+            regexes (list): The compiled regular expressions to combine.
+
+        Returns:
+            re.Pattern: The combined regular expression.
+        """
+        return re.compile(
+            '|'.join('(?:' + regex.pattern + ')' for regex in regexes) or
+            '(?!)', re.DOTALL)
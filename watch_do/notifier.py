@@ -0,0 +1,228 @@
+"""The :class:`.Notifier` class provides access to the Linux kernel's inotify
+interface, allowing directories to be watched for changes without having to
+repeatedly poll the files within them.
+
+Only the C library is required, it is accessed through :mod:`ctypes`; no
+external services or packages are used. If inotify isn't available (i.e. the
+platform isn't Linux) an ``OSError`` is raised when the :class:`.Notifier` is
+created.
+
+As an example, the following code would watch the current directory and wait
+up to 2 seconds for something inside of it to change.
+
+>>> notifier = Notifier()
+>>> notifier.add_watch('')
+>>> notifier.read_events(2)
+"""
+
+import os
+import errno
+import select
+import struct
+import ctypes
+import ctypes.util
+
+
+IN_MODIFY = 0x00000002
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+
+#: The events that indicate a file within a watched directory has changed.
+WATCH_MASK = (IN_MODIFY | IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_FROM |
+              IN_MOVED_TO | IN_CREATE | IN_DELETE | IN_DELETE_SELF |
+              IN_MOVE_SELF | IN_ONLYDIR)
+
+_EVENT_HEADER = struct.Struct('iIII')
+_READ_SIZE = 64 * 1024
+
+
+def _load_libc():
+    """Load the C library and check it provides the inotify functions.
+
+    Raises:
+        OSError: If inotify isn't supported by the C library.
+
+    Returns:
+        ctypes.CDLL: The loaded C library.
+    """
+    libc = ctypes.CDLL(ctypes.util.find_library('c'), use_errno=True)
+
+    try:
+        libc.inotify_init1.argtypes = [ctypes.c_int]
+        libc.inotify_add_watch.argtypes = [
+            ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+        libc.inotify_rm_watch.argtypes = [ctypes.c_int, ctypes.c_int]
+    except AttributeError as ex:
+        raise OSError(errno.ENOSYS, 'inotify is not supported') from ex
+
+    return libc
+
+
+class Notifier:
+    """This class watches directories using inotify.
+
+    Events for the files within the watched directories are read using the
+    :meth:`read_events` method, which returns the path of each file that the
+    kernel reported a change for.
+    """
+
+    def __init__(self):
+        """Initialise the :class:`.Notifier`, creating the inotify instance.
+
+        Raises:
+            OSError: If inotify isn't supported or the instance couldn't be
+                created.
+        """
+        self._libc = _load_libc()
+
+        self._fd = self._libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self._fd < 0:
+            error = ctypes.get_errno()
+            raise OSError(error, os.strerror(error))
+
+        self._directories = {}
+        self._descriptors = {}
+
+    @property
+    def directories(self):
+        """set: The directories that are currently being watched.
+        """
+        return set(self._descriptors)
+
+    def fileno(self):
+        """Get the file descriptor of the inotify instance.
+
+        Returns:
+            int: The file descriptor, suitable for use with :mod:`select`.
+        """
+        return self._fd
+
+    def is_watching(self, directory):
+        """Determine if a directory is currently being watched.
+
+        Parameters:
+            directory (str): The directory to check.
+
+        Returns:
+            bool: True if the directory is being watched.
+        """
+        return directory in self._descriptors
+
+    def add_watch(self, directory):
+        """Start watching a directory for changes.
+
+        Parameters:
+            directory (str): The directory to watch, an empty string refers to
+                the current directory.
+
+        Raises:
+            OSError: If the directory couldn't be watched. An ``errno`` of
+                ``ENOSPC`` indicates the watch descriptor limit has been
+                reached.
+        """
+        if directory in self._descriptors:
+            return
+
+        descriptor = self._libc.inotify_add_watch(
+            self._fd, os.fsencode(directory or '.'), WATCH_MASK)
+        if descriptor < 0:
+            error = ctypes.get_errno()
+            raise OSError(error, os.strerror(error), directory)
+
+        self._directories[descriptor] = directory
+        self._descriptors[directory] = descriptor
+
+    def remove_watch(self, directory):
+        """Stop watching a directory.
+
+        Parameters:
+            directory (str): The directory to stop watching.
+        """
+        descriptor = self._descriptors.pop(directory, None)
+        if descriptor is None:
+            return
+
+        del self._directories[descriptor]
+        self._libc.inotify_rm_watch(self._fd, descriptor)
+
+    def read_events(self, timeout=0):
+        """Wait for and read the events reported by the kernel.
+
+        Parameters:
+            timeout (float): The maximum time (in seconds) to wait for an
+                event to arrive, ``None`` waits indefinitely.
+
+        Returns:
+            list: A ``list`` of ``(path, mask)`` tuples. The path is ``None``
+            if the kernel's event queue overflowed, meaning any file may have
+            changed.
+        """
+        readable, _, _ = select.select([self._fd], [], [], timeout)
+        if not readable:
+            return []
+
+        events = []
+        while True:
+            try:
+                data = os.read(self._fd, _READ_SIZE)
+            except BlockingIOError:
+                break
+
+            events.extend(self._parse_events(data))
+
+        return events
+
+    def _parse_events(self, data):
+        """Parse the raw ``inotify_event`` structures read from the kernel.
+
+        Parameters:
+            data (bytes): The data read from the inotify file descriptor.
+
+        Returns:
+            list: A ``list`` of ``(path, mask)`` tuples.
+        """
+        events = []
+        offset = 0
+        while offset < len(data):
+            descriptor, mask, _, length = _EVENT_HEADER.unpack_from(
+                data, offset)
+            offset += _EVENT_HEADER.size
+
+            name = os.fsdecode(data[offset:offset+length].rstrip(b'\0'))
+            offset += length
+
+            if mask & IN_Q_OVERFLOW:
+                events.append((None, mask))
+                continue
+
+            directory = self._directories.get(descriptor)
+            if directory is None:
+                continue
+
+            if mask & IN_IGNORED:
+                # The kernel removed the watch (i.e. the directory was deleted)
+                del self._directories[descriptor]
+                del self._descriptors[directory]
+
+            events.append((os.path.join(directory, name), mask))
+
+        return events
+
+    def close(self):
+        """Close the inotify instance, removing all of the watches.
+        """
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+
+        self._directories.clear()
+        self._descriptors.clear()
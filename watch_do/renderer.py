@@ -0,0 +1,120 @@
+"""The :class:`.Renderer` class writes Watch Do's human readable output to the
+terminal.
+
+The screen is cleared by writing ANSI escape sequences, rather than running
+``clear`` (or ``cls``) in a shell, so no processes are started each time the
+doers are run. When the output isn't a terminal (i.e. it's piped to a file)
+the screen isn't cleared, so the output isn't littered with escape sequences.
+
+>>> renderer = Renderer(sys.stdout)
+>>> renderer.clear()
+>>> renderer.write('main.py changed\\n')
+
+The last lines written since the screen was cleared are kept, up to a limit,
+so the screen can be drawn again with :meth:`.Renderer.redraw` without
+keeping all of the output of a chatty doer in memory.
+
+>>> renderer.scrollback
+['main.py changed\\n']
+"""
+
+import sys
+import threading
+from collections import deque
+
+
+#: str: Moves the cursor to the top left, then clears the screen and the
+#: terminal's scrollback.
+CLEAR = '\033[H\033[2J\033[3J'
+
+
+class Renderer:
+    """This class writes output to the terminal, clearing it between runs.
+
+    It's safe to use from multiple threads.
+    """
+
+    def __init__(self, stream=None, clear=True, scrollback=1000):
+        """Initialise the :class:`.Renderer`.
+
+        Parameters:
+            stream (file): The text stream to write to, defaults to
+                ``sys.stdout``.
+            clear (bool): A boolean value indicating whether to clear the
+                screen, it's never cleared if the stream isn't a terminal.
+            scrollback (int): The maximum number of lines kept for
+                :meth:`redraw`.
+        """
+        self._stream = stream if stream is not None else sys.stdout
+        self._clear = clear
+
+        try:
+            self._is_tty = self._stream.isatty()
+        except (AttributeError, ValueError):
+            self._is_tty = False
+
+        self._lock = threading.Lock()
+        self._scrollback = deque(maxlen=scrollback)
+
+    @property
+    def stream(self):
+        """file: The stream written to.
+        """
+        return self._stream
+
+    @property
+    def is_tty(self):
+        """bool: A boolean value indicating whether the stream is a terminal.
+        """
+        return self._is_tty
+
+    @property
+    def clears(self):
+        """bool: A boolean value indicating whether the screen is cleared.
+        """
+        return self._clear and self.is_tty
+
+    @property
+    def scrollback(self):
+        """list: The lines written since the screen was last cleared, only
+        the most recent are kept.
+        """
+        with self._lock:
+            return list(self._scrollback)
+
+    def clear(self):
+        """Clear the screen, and forget the lines written before it was
+        cleared.
+        """
+        with self._lock:
+            self._scrollback.clear()
+            if self.clears:
+                self.stream.write(CLEAR)
+                self.stream.flush()
+
+    def write(self, text):
+        """Write text to the stream, flushing it straight away.
+
+        Parameters:
+            text (str): The text to write.
+        """
+        if not text:
+            return
+
+        with self._lock:
+            self.stream.write(text)
+            self.stream.flush()
+
+            lines = text.splitlines(True)
+            if self._scrollback and not self._scrollback[-1].endswith('\n'):
+                lines[0] = self._scrollback.pop() + lines[0]
+            self._scrollback.extend(lines)
+
+    def redraw(self):
+        """Clear the screen and write the lines kept in the scrollback again,
+        i.e. after the terminal has been resized.
+        """
+        with self._lock:
+            if self.clears:
+                self.stream.write(CLEAR + ''.join(self._scrollback))
+                self.stream.flush()
@@ -0,0 +1,251 @@
+"""The :class:`.ResultCache` class remembers the contents of the files that the
+doers last ran successfully for, so they can be skipped when a file changes
+without its contents changing.
+
+Editors that save without changing anything, ``touch`` and
+``git stash && git stash pop`` all change the modification time of files
+without (ultimately) changing their contents. A digest of the file's contents
+is stored for each doer's command and file, and replaced each time the doer
+succeeds, so a doer is only skipped if it would be run with exactly the same
+input as its last successful run. A file that changes to new contents and back
+is run again, as the doer may have done something for the new contents in
+between (i.e. written a build output).
+
+As an example, the following code would create a cache that remembers the
+output of the doers, and look up a doer's result for a file.
+
+>>> result_cache = ResultCache('results', replay=True)
+>>> key = result_cache.get_key('make %f', 'main.c')
+>>> digest = result_cache.hash_file('main.c')
+>>> result_cache.get(key, digest)
+['main.c compiled\\n']
+
+.. warning::
+   Only the changed file is considered, a doer that reads other files (i.e.
+   ``make test``) would be skipped even if those files have changed.
+
+The least recently used results are forgotten once the cache is full. The
+cache is stored as a JSON file, which is replaced atomically when it's saved.
+"""
+
+import json
+import hashlib
+import threading
+from collections import OrderedDict
+
+from .hasher import Hasher
+from .atomic_file import atomic_write
+
+
+_VERSION = 2
+
+
+class ResultCache:
+    """This class stores the result of the last successful run of each doer
+    for each file.
+
+    It's safe to use from multiple threads.
+    """
+
+    def __init__(self, file_name=None, max_entries=1000, replay=False,
+                 algorithm='blake2b'):
+        """Initialise the :class:`.ResultCache`, loading any stored results.
+
+        Parameters:
+            file_name (str): The path of the file the results are stored in,
+                or ``None`` to only keep them in memory.
+            max_entries (int): The maximum number of results to keep.
+            replay (bool): A boolean value indicating whether to store the
+                output of the doers, so it can be shown again when they're
+                skipped.
+            algorithm (str): The algorithm used to hash the files, see
+                :class:`.Hasher`.
+        """
+        self._file_name = file_name
+        self._max_entries = max_entries
+        self._replay = replay
+        self._hasher = Hasher(algorithm)
+
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self._dirty = False
+
+        if file_name is not None:
+            self._load()
+
+    @property
+    def file_name(self):
+        """str: The path of the file the results are stored in.
+        """
+        return self._file_name
+
+    @property
+    def max_entries(self):
+        """int: The maximum number of results to keep.
+        """
+        return self._max_entries
+
+    @property
+    def replay(self):
+        """bool: A boolean value indicating whether the output of the doers is
+        stored.
+        """
+        return self._replay
+
+    @property
+    def dirty(self):
+        """bool: A boolean value indicating whether there are results that
+        haven't been saved.
+        """
+        return self._dirty
+
+    def __len__(self):
+        with self._lock:
+            return len(self._entries)
+
+    def get_key(self, command, file_name):
+        """Get the key of a doer's result for a file.
+
+        Parameters:
+            command (str): The doer's command.
+            file_name (str): The file the doer is run for.
+
+        Returns:
+            str: The key.
+        """
+        key = hashlib.sha256()
+        for part in (command, file_name):
+            key.update(part.encode('UTF-8', 'surrogateescape') + b'\0')
+
+        return key.hexdigest()
+
+    def hash_file(self, file_name):
+        """Get the digest of a file's contents.
+
+        Parameters:
+            file_name (str): The file to hash.
+
+        Returns:
+            str: The digest, or ``None`` if the file couldn't be read.
+        """
+        try:
+            digest = self._hasher.hash_file(file_name)
+        except OSError:
+            return None
+
+        return '{}:{}'.format(self._hasher.algorithm, digest)
+
+    def get(self, key, digest):
+        """Get a result, if the doer last succeeded for the same contents.
+
+        Parameters:
+            key (str): The key of the result, see :meth:`get_key`.
+            digest (str): The digest of the file's contents, see
+                :meth:`hash_file`.
+
+        Returns:
+            list: The output of the doer (empty if output isn't being stored),
+            or ``None`` if there's no result for the contents.
+        """
+        if digest is None:
+            return None
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] != digest:
+                return None
+
+            self._entries.move_to_end(key)
+            self._dirty = True
+
+        return entry[1]
+
+    def put(self, key, digest, output):
+        """Store the result of a successful doer run, replacing the previous
+        result.
+
+        Parameters:
+            key (str): The key of the result, see :meth:`get_key`.
+            digest (str): The digest of the file's contents, see
+                :meth:`hash_file`. If it's ``None`` the previous result is
+                removed instead.
+            output (list): The output of the doer, only stored if
+                :attr:`replay` is set.
+        """
+        if digest is None:
+            self.remove(key)
+            return
+
+        with self._lock:
+            self._entries[key] = (digest, list(output) if self.replay else [])
+            self._entries.move_to_end(key)
+
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+            self._dirty = True
+
+    def remove(self, key):
+        """Remove a result, i.e. after the doer failed.
+
+        Parameters:
+            key (str): The key of the result, see :meth:`get_key`.
+        """
+        with self._lock:
+            if self._entries.pop(key, None) is not None:
+                self._dirty = True
+
+    def save(self):
+        """Save the results.
+
+        The file is replaced atomically, so it's never left partially written.
+
+        Raises:
+            OSError: If the results couldn't be written.
+        """
+        if self.file_name is None:
+            return
+
+        with self._lock:
+            entries = [[key, digest, output]
+                       for key, (digest, output) in self._entries.items()]
+            self._dirty = False
+
+        try:
+            with atomic_write(self.file_name,
+                              prefix='.watch-do-results-') as handle:
+                json.dump({'version': _VERSION, 'replay': self.replay,
+                           'entries': entries}, handle)
+        except BaseException:
+            self._dirty = True
+            raise
+
+    def _load(self):
+        """Load the stored results, ignoring the file if it's missing or
+        damaged.
+        """
+        try:
+            with open(self.file_name, encoding='UTF-8') as handle:
+                data = json.load(handle)
+        except (OSError, ValueError):
+            return
+
+        if not isinstance(data, dict) or data.get('version') != _VERSION:
+            return
+
+        # Results stored without their output can't be replayed
+        if self.replay and not data.get('replay'):
+            return
+
+        for entry in data.get('entries', []):
+            try:
+                key, digest, output = entry
+            except (TypeError, ValueError):
+                continue
+
+            if (isinstance(key, str) and isinstance(digest, str)
+                    and isinstance(output, list)):
+                self._entries[key] = (digest, output if self.replay else [])
+
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
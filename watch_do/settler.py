@@ -0,0 +1,151 @@
+"""The :class:`.Settler` class waits for changed files to stop being written
+to before the doers are run.
+
+Once a change has been detected, only the changed files are polled (using
+their size and modification time) at a short interval, until none of them
+have been modified for a quiet period. The files are then checked for changes
+once more by the :class:`.WatcherManager`, so any other files that changed in
+the meantime are folded into the same batch rather than triggering the doers
+again straight away.
+
+As an example, the following code would wait for the changed files to go
+unmodified for half a second, waiting no longer than 10 seconds.
+
+>>> settler = Settler(0.5, 10)
+>>> changed_files = settler.settle(
+...     watcher_manager.get_changed_files(), watcher_manager)
+"""
+
+import os
+import time
+
+from .change import merge_changes
+
+
+class Settler:
+    """This class waits for changed files to stop changing.
+    """
+
+    def __init__(self, quiet_period, max_wait, poll_interval=0.05):
+        """Initialise the :class:`.Settler`.
+
+        Parameters:
+            quiet_period (float): The time (in seconds) the files must go
+                unmodified for.
+            max_wait (float): The maximum time (in seconds) to wait, the
+                files are returned after this even if they're still changing.
+            poll_interval (float): The time (in seconds) between each poll of
+                the changed files.
+        """
+        self._quiet_period = quiet_period
+        self._max_wait = max_wait
+        self._poll_interval = poll_interval
+
+    @property
+    def quiet_period(self):
+        """float: The time (in seconds) the files must go unmodified for.
+        """
+        return self._quiet_period
+
+    @property
+    def max_wait(self):
+        """float: The maximum time (in seconds) to wait.
+        """
+        return self._max_wait
+
+    @property
+    def poll_interval(self):
+        """float: The time (in seconds) between each poll of the files.
+        """
+        return self._poll_interval
+
+    def settle(self, changed_files, watcher_manager):
+        """Wait for the changed files to stop changing.
+
+        Parameters:
+            changed_files (set): The files that have changed.
+            watcher_manager (:class:`.WatcherManager`): The manager used to
+                check for any other files that changed while waiting.
+
+        Returns:
+            set: The changed files, including any that changed while waiting.
+            Files that changed again while waiting are combined with their
+            earlier change (see :meth:`.Change.merge`), so a file that was
+            modified and then removed is reported as removed.
+        """
+        if self.quiet_period <= 0 or not changed_files:
+            return set(changed_files)
+
+        changes = {str(change): change for change in changed_files}
+
+        deadline = time.time() + self.max_wait
+        while True:
+            self._wait_until_quiet(set(changes), deadline)
+
+            # Read any events reported while waiting (without blocking), so
+            # event driven watchers see the writes made during the burst
+            watcher_manager.watcher.wait(0)
+
+            try:
+                later_changes = watcher_manager.get_changed_files()
+            except FileNotFoundError:
+                # The file will be reported when it's next checked
+                break
+
+            new_files = False
+            for change in later_changes:
+                file_name = str(change)
+                new_files = new_files or file_name not in changes
+                changes[file_name] = merge_changes(changes.get(file_name),
+                                                   change)
+
+            if not new_files or time.time() >= deadline:
+                break
+
+        return set(changes.values())
+
+    def _wait_until_quiet(self, files, deadline):
+        """Poll files until none of them have been modified for the quiet
+        period, or the deadline has passed.
+
+        Parameters:
+            files (set): The files to poll.
+            deadline (float): The time (as a unix timestamp) to stop waiting.
+        """
+        stats = self._get_stats(files)
+        quiet_since = time.time()
+
+        while True:
+            now = time.time()
+            if now - quiet_since >= self.quiet_period or now >= deadline:
+                return
+
+            time.sleep(min(self.poll_interval,
+                           self.quiet_period - (now - quiet_since),
+                           max(deadline - now, 0)))
+
+            new_stats = self._get_stats(files)
+            if new_stats != stats:
+                stats = new_stats
+                quiet_since = time.time()
+
+    @staticmethod
+    def _get_stats(files):
+        """Get the size and modification time of files.
+
+        Parameters:
+            files (set): The files to stat.
+
+        Returns:
+            dict: The ``(size, mtime)`` tuple of each file, or ``None`` if
+            the file doesn't exist.
+        """
+        stats = {}
+        for file_name in files:
+            try:
+                stat = os.stat(file_name)
+                stats[file_name] = (stat.st_size, stat.st_mtime_ns)
+            except OSError:
+                stats[file_name] = None
+
+        return stats
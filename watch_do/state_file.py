@@ -0,0 +1,190 @@
+"""The :class:`.StateFile` class stores the value of each watcher, so that
+changes made while Watch Do wasn't running can be detected when it's started
+again.
+
+The file is a log of JSON lines, the first line identifies the watcher that
+the values came from and each following line records a file's value (or its
+removal). Changes are appended to the end of the file, it's only rewritten
+once the log has grown to be much larger than the state it describes.
+
+As an example, the following code would load the state of the :class:`.MD5`
+watchers and then record a change.
+
+>>> state_file = StateFile('.watch-do-state', 'MD5')
+>>> values = state_file.load()
+>>> state_file.update({'main.py': '8b1a9953c4611296a827abf8c47804d7'}, set())
+"""
+
+import json
+
+from .atomic_file import atomic_write
+
+
+_VERSION = 1
+
+# The log is compacted once it contains more than this many records, and more
+# records than there are files
+_MIN_COMPACT_RECORDS = 1024
+
+
+class StateFile:
+    """This class loads and saves the values of the watchers.
+    """
+
+    def __init__(self, file_name, watcher_name):
+        """Initialise the :class:`.StateFile`.
+
+        Parameters:
+            file_name (str): The path of the file the state is stored in.
+            watcher_name (str): The name of the watcher the values come from,
+                values from other watchers are never loaded.
+        """
+        self._file_name = file_name
+        self._watcher_name = watcher_name
+
+        self._values = {}
+        self._records = 0
+        self._damaged = False
+
+    @property
+    def file_name(self):
+        """str: The path of the file the state is stored in.
+        """
+        return self._file_name
+
+    @property
+    def watcher_name(self):
+        """str: The name of the watcher the values come from.
+        """
+        return self._watcher_name
+
+    def load(self):
+        """Load the values of the watchers.
+
+        A truncated final record (i.e. if Watch Do was killed while writing
+        it) is ignored.
+
+        Returns:
+            dict: The value of each file, or ``None`` if there isn't a state
+            for this watcher.
+        """
+        try:
+            with open(self.file_name, encoding='UTF-8') as handle:
+                header = self._parse(handle.readline())
+                if (not isinstance(header, dict) or
+                        header.get('version') != _VERSION or
+                        header.get('watcher') != self.watcher_name):
+                    return None
+
+                values = {}
+                records = 0
+                damaged = False
+                for line in handle:
+                    record = self._parse(line)
+                    if not isinstance(record, list) or not record:
+                        damaged = True
+                        continue
+
+                    records += 1
+                    if len(record) == 1:
+                        values.pop(record[0], None)
+                    else:
+                        # JSON has no tuples, they're read back as lists
+                        value = record[1]
+                        if isinstance(value, list):
+                            value = tuple(value)
+
+                        values[record[0]] = value
+        except OSError:
+            return None
+
+        self._values = values
+        self._records = records
+        self._damaged = damaged
+
+        return dict(values)
+
+    def save(self, values):
+        """Replace the stored state with the given values.
+
+        Parameters:
+            values (dict): The value of each file.
+
+        Raises:
+            OSError: If the state couldn't be written.
+        """
+        self._values = dict(values)
+        self._compact()
+
+    def update(self, values, removed):
+        """Record changes to the stored state.
+
+        The changes are appended to the file, which is compacted if the log
+        has grown too large.
+
+        Parameters:
+            values (dict): The new value of each changed or added file.
+            removed (set): The files that are no longer being watched.
+
+        Raises:
+            OSError: If the state couldn't be written.
+        """
+        removed = [file_name for file_name in removed
+                   if file_name in self._values]
+        if not values and not removed:
+            return
+
+        lines = []
+        for file_name in removed:
+            del self._values[file_name]
+            lines.append(json.dumps([file_name]))
+
+        for file_name, value in values.items():
+            self._values[file_name] = value
+            lines.append(json.dumps([file_name, value]))
+
+        # Appending to a damaged file could join the new records onto a
+        # partially written one, so it's rewritten instead
+        self._records += len(lines)
+        if (self._damaged or
+                self._records > max(_MIN_COMPACT_RECORDS,
+                                    len(self._values) * 2)):
+            self._compact()
+            return
+
+        with open(self.file_name, 'a', encoding='UTF-8') as handle:
+            handle.write('\n'.join(lines) + '\n')
+
+    def _compact(self):
+        """Rewrite the file so that it contains a single record per file.
+
+        The file is replaced atomically, so it's never left partially written.
+
+        Raises:
+            OSError: If the state couldn't be written.
+        """
+        header = {'version': _VERSION, 'watcher': self.watcher_name}
+
+        with atomic_write(self.file_name,
+                          prefix='.watch-do-state-') as handle:
+            handle.write(json.dumps(header) + '\n')
+            for file_name, value in self._values.items():
+                handle.write(json.dumps([file_name, value]) + '\n')
+
+        self._records = len(self._values)
+        self._damaged = False
+
+    @staticmethod
+    def _parse(line):
+        """Parse a line of the file.
+
+        Parameters:
+            line (str): The line to parse.
+
+        Returns:
+            object: The parsed record, or ``None`` if it isn't valid JSON.
+        """
+        try:
+            return json.loads(line)
+        except ValueError:
+            return None
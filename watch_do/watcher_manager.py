@@ -20,8 +20,56 @@ constructor).
 All of the changed files can be retrieved by calling :meth:`get_changed_files`.
 
 >>> manager.get_changed_files()
+
+Each changed file is a :class:`.Change`, recording whether the file was
+created, modified, removed or renamed. Removed and created files are paired up
+as renames using :meth:`.Watcher.get_identity`, i.e. by their hash or inode,
+or by the identity fields stored in the :class:`.WatcherTable` (see
+:attr:`.Watcher.identity_fields`). Watchers that can't identify files report
+renames as a removed and a created file.
+
+>>> manager.get_changes()
+{Change('src/new.py', 'renamed', 'src/old.py')}
+
+On file systems where each check is slow (i.e. network file systems), the
+watchers can be checked in parallel by a pool of threads, for example, the
+following would check the files using 16 threads.
+
+>>> manager = WatcherManager(
+...     ModificationTime, glob_manager, True, True, workers=16)
+
+The value of each watcher can be persisted using a :class:`.StateFile`, the
+first call to :meth:`get_changed_files` then reports the files that were
+changed, added or removed while Watch Do wasn't running. The state is only
+saved by :meth:`save_state`, which should be called once the doers have run
+for the reported changes, so changes that were never handled (i.e. Watch Do
+was killed while the doers were running) are reported again.
+
+>>> manager = WatcherManager(
+...     ModificationTime, glob_manager, True, True,
+...     state_file=StateFile('.watch-do-state', 'ModificationTime'))
+>>> manager.get_changed_files()
+>>> manager.save_state()
+
+Watchers that declare their :attr:`.Watcher.stat_fields` (i.e.
+:class:`.ModificationTime`) aren't created as objects, their state is stored
+compactly in a :class:`.WatcherTable` instead.
 """
 
+from concurrent.futures import ThreadPoolExecutor
+
+from .change import Change
+from .change import CREATED
+from .change import MODIFIED
+from .change import REMOVED
+from .change import RENAMED
+from .watcher_table import WatcherTable
+
+
+# The number of chunks each worker's share of the watchers is split into,
+# which evens out the work when some files are slower to check than others
+_CHUNKS_PER_WORKER = 4
+
 
 class WatcherManager:
     """This class creates and manages watchers.
@@ -31,7 +79,8 @@ class WatcherManager:
     required watchers that can be used to detect changes.
     """
 
-    def __init__(self, watcher, glob_manager, reglob, changed_on_remove):
+    def __init__(self, watcher, glob_manager, reglob, changed_on_remove,
+                 workers=1, state_file=None):
         """Initialise the :class:`.WatcherManager`.
 
         Parameters:
@@ -44,16 +93,37 @@ class WatcherManager:
                globs when :meth:`get_changed_files` is called.
             changed_on_remove (bool): A boolean value indicating whether to
               consider the removal of a file a change.
+            workers (int): The number of threads used to check the watchers,
+              the watchers are checked in the calling thread if this is 1.
+            state_file (:class:`.StateFile`): The file the watchers' values
+              are saved to and restored from, if any.
         """
         self._watcher = watcher
         self._glob_manager = glob_manager
         self._reglob = reglob
         self._changed_on_remove = changed_on_remove
+        self._workers = workers
+        self._state_file = state_file
+        self._executor = None
 
         self._first_call_to_changed_files = True
         self._files = set()
+        self._files_generation = 0
         self._watchers = {}
 
+        # The changes that haven't been saved to the state file yet
+        self._save_all = False
+        self._unsaved_files = set()
+        self._unsaved_removed_files = set()
+
+        # Only the class declaring the fields is stored in a table, as
+        # subclasses may have overridden how the value is worked out
+        self._table = None
+        stat_fields = vars(watcher).get('stat_fields')
+        if stat_fields:
+            self._table = WatcherTable(
+                stat_fields, vars(watcher).get('identity_fields', ()))
+
     @property
     def watcher(self):
         """:class:`.Watcher`: A reference to the :class:`.Watcher` class that
@@ -81,6 +151,19 @@ class WatcherManager:
         """
         return self._changed_on_remove
 
+    @property
+    def workers(self):
+        """int: The number of threads used to check the watchers.
+        """
+        return self._workers
+
+    @property
+    def state_file(self):
+        """:class:`.StateFile`: The file the watchers' values are saved to, or
+        ``None``.
+        """
+        return self._state_file
+
     @property
     def files(self):
         """set: The ``set`` of file names (relative to the current directory)
@@ -88,19 +171,44 @@ class WatcherManager:
         """
         return self._files
 
+    @property
+    def files_generation(self):
+        """int: A number that's increased each time files are added to or
+        removed from :attr:`files`, so copies of it only need to be made when
+        it changes.
+        """
+        return self._files_generation
+
     def get_changed_files(self):
         """Get a ``set`` containing the changed files since the last call.
 
         This method determines which files have changed since the last time
         this method was called. Added files, changed files (determined by the
         type of watcher) and removed files (if `changed_on_remove` is True) are
-        all counted as changed files.
+        all counted as changed files. A renamed file is only reported under
+        its new name.
 
         The watchers are stored and managed internally to this class.
 
+        If there's a saved state, the first call reports the files that
+        changed while Watch Do wasn't running, otherwise it reports nothing.
+
         Returns:
             set: A ``set`` of files that have changed since the last time this
-            method was called.
+            method was called, each is a :class:`.Change` describing how the
+            file changed.
+        """
+        return self.get_changes()
+
+    def get_changes(self):
+        """Get the changes made to the files since the last call.
+
+        Files that are removed and created in the same call are paired up as
+        renames, if the watcher can identify them (see
+        :meth:`.Watcher.get_identity`) and the pairing is unambiguous.
+
+        Returns:
+            set: A ``set`` of :class:`.Change`'s, one for each changed file.
         """
         # Keep track of added and removed files
         added_files = set()
@@ -109,40 +217,273 @@ class WatcherManager:
         # Update the list of files we should be watching. Only do this if
         # this is the first time, or if reglob is set to True
         if self.reglob or self._first_call_to_changed_files:
-            new_files = self.glob_manager.get_files()
+            added_files, removed_files = self.glob_manager.get_changes()
 
-            added_files = new_files - self._files
-            removed_files = self._files - new_files
+            self._files -= removed_files
+            self._files |= added_files
 
-            self._files = new_files
+            if added_files or removed_files:
+                self._files_generation += 1
 
-        changed_files = set()
+        changes = {}
+
+        saved_values = None
+        if self._first_call_to_changed_files and self.state_file is not None:
+            saved_values = self.state_file.load()
 
         # Create watchers for newly found files
         for file_name in added_files:
-            self._watchers[file_name] = self.watcher(file_name)
+            self._add_watcher(file_name)
 
-            if not self._first_call_to_changed_files:
-                changed_files.add(file_name)
+            if saved_values is not None:
+                # Files with a saved value are checked against it, files
+                # without one were created while we weren't running
+                if file_name in saved_values:
+                    self._restore_watcher(file_name, saved_values[file_name])
+                else:
+                    changes[file_name] = Change(file_name, CREATED)
+            elif not self._first_call_to_changed_files:
+                changes[file_name] = Change(file_name, CREATED)
 
-        # Remove watchers for non existent files
+        # Remove watchers for non existent files, keeping their last values
+        # so they can be paired with the files they were renamed to
+        removed_values = {}
         for file_name in removed_files:
-            del self._watchers[file_name]
+            removed_values[file_name] = self._get_last_value(file_name)
+            self._remove_watcher(file_name)
 
-            if self.changed_on_remove:
-                changed_files.add(file_name)
+        # Files with a saved value that no longer exist were removed while we
+        # weren't running
+        if saved_values is not None:
+            for file_name in set(saved_values) - self._files:
+                removed_values[file_name] = saved_values[file_name]
 
         # Check for changed files
-        for watcher in self._watchers:
+        for file_name in self._check_watchers():
+            changes.setdefault(file_name, Change(file_name, MODIFIED))
+
+        created_files = [file_name for file_name, change in changes.items()
+                         if change.type == CREATED]
+        for old_file_name, file_name in self._pair_renames(
+                removed_values, created_files):
+            changes[file_name] = Change(file_name, RENAMED, old_file_name)
+            del removed_values[old_file_name]
+
+        if self.changed_on_remove:
+            for file_name in removed_values:
+                changes[file_name] = Change(file_name, REMOVED)
+
+        if self.state_file is not None:
+            self._save_all = (self._save_all or
+                              self._first_call_to_changed_files)
+            self._unsaved_files |= set(changes)
+            self._unsaved_removed_files -= added_files
+            self._unsaved_removed_files |= removed_files
+
+        self._first_call_to_changed_files = False
+
+        return set(changes.values())
+
+    def _pair_renames(self, removed_values, created_files):
+        """Pair removed files with the created files they were renamed to.
+
+        Files are paired by their identity, pairs are only made when exactly
+        one removed and one created file share an identity.
+
+        Parameters:
+            removed_values (dict): The last value of each removed file.
+            created_files (list): The created files.
+
+        Returns:
+            list: An ``(old_file_name, file_name)`` tuple for each rename.
+        """
+        if not removed_values or not created_files:
+            return []
+
+        get_identity = (self.watcher.get_identity if self._table is None
+                        else self._table.get_identity)
+
+        def group(values):
+            """Group file names by the identity of their values.
+            """
+            groups = {}
+            for file_name, value in values:
+                identity = (None if value is None
+                            else get_identity(value))
+                try:
+                    if identity is not None:
+                        groups.setdefault(identity, []).append(file_name)
+                except TypeError:
+                    # The identity isn't hashable
+                    pass
+
+            return groups
+
+        removed = group(removed_values.items())
+        created = group((file_name, self._get_last_value(file_name))
+                        for file_name in created_files)
+
+        return [(removed[identity][0], file_names[0])
+                for identity, file_names in created.items()
+                if len(file_names) == 1 and
+                len(removed.get(identity, ())) == 1]
+
+    def save_state(self):
+        """Save the values of the watchers to the state file, if there is
+        one.
+
+        The whole state is saved the first time, after that only the values
+        of the files that changed since the last save are recorded. This
+        should only be called once the doers have run for the changes, and
+        mustn't be called while the files are being checked.
+
+        Raises:
+            OSError: If the state couldn't be written.
+        """
+        if self.state_file is None:
+            return
+
+        if self._save_all:
+            self.state_file.save({
+                file_name: self._get_last_value(file_name)
+                for file_name in self._files})
+        else:
+            self.state_file.update({
+                file_name: self._get_last_value(file_name)
+                for file_name in self._unsaved_files
+                if file_name in self._files
+            }, self._unsaved_removed_files)
+
+        self._save_all = False
+        self._unsaved_files = set()
+        self._unsaved_removed_files = set()
+
+    def _add_watcher(self, file_name):
+        """Start watching a file.
+
+        Parameters:
+            file_name (str): The file to watch.
+        """
+        if self._table is not None:
+            self._table.add(file_name)
+        else:
+            self._watchers[file_name] = self.watcher(file_name)
+
+    def _remove_watcher(self, file_name):
+        """Stop watching a file.
+
+        Parameters:
+            file_name (str): The file to stop watching.
+        """
+        if self._table is not None:
+            self._table.remove(file_name)
+        else:
+            self._watchers.pop(file_name).close()
+
+    def _restore_watcher(self, file_name, value):
+        """Restore the value of a file's watcher from a previous run.
+
+        Parameters:
+            file_name (str): The file being watched.
+            value: The value of the file from the previous run.
+        """
+        if self._table is not None:
+            self._table.restore(file_name, value)
+        else:
+            self._watchers[file_name].restore(value)
+
+    def _get_last_value(self, file_name):
+        """Get the value of a file the last time it was checked.
+
+        Parameters:
+            file_name (str): The file being watched.
+
+        Returns:
+            The value, or ``None`` if the file hasn't been checked yet.
+        """
+        if self._table is not None:
+            return self._table.get_value(file_name)
+
+        return self._watchers[file_name].last_value
+
+    def _check_watchers(self):
+        """Check all of the watchers for changes.
+
+        If more than one worker has been requested, the watchers (or the rows
+        of the table) are split into chunks that are checked in parallel.
+
+        Returns:
+            set: A ``set`` of files that have changed.
+        """
+        if self._table is not None:
+            watchers = range(len(self._table))
+            check_chunk = self._check_rows
+        else:
+            watchers = list(self._watchers.values())
+            check_chunk = self._check_chunk
+
+        if self.workers <= 1 or len(watchers) <= 1:
+            return check_chunk(watchers)
+
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.workers)
+
+        chunk_size = -(-len(watchers) // (self.workers * _CHUNKS_PER_WORKER))
+        futures = [
+            self._executor.submit(check_chunk,
+                                  watchers[index:index+chunk_size])
+            for index in range(0, len(watchers), chunk_size)]
+
+        # Wait for every chunk to finish before re-raising any exception, so
+        # the watchers aren't left being checked in the background
+        changed_files = set()
+        exception = None
+        for future in futures:
             try:
-                if self._watchers[watcher].has_changed():
-                    changed_files.add(self._watchers[watcher].file_name)
+                changed_files |= future.result()
+            except FileNotFoundError as ex:
+                exception = exception or ex
+
+        if exception is not None:
+            raise exception
+
+        return changed_files
+
+    def _check_rows(self, rows):
+        """Check a chunk of the table's rows for changes.
+
+        Parameters:
+            rows (range): The rows to check.
+
+        Raises:
+            FileNotFoundError: If a file is missing and reglobbing is enabled.
+
+        Returns:
+            set: A ``set`` of files that have changed.
+        """
+        return self._table.check(rows, ignore_missing=not self.reglob)
+
+    def _check_chunk(self, watchers):
+        """Check a chunk of watchers for changes.
+
+        Parameters:
+            watchers (list): The watchers to check.
+
+        Raises:
+            FileNotFoundError: If a file is missing and reglobbing is enabled.
+
+        Returns:
+            set: A ``set`` of files that have changed.
+        """
+        changed_files = set()
+        for watcher in watchers:
+            try:
+                if watcher.has_changed():
+                    changed_files.add(watcher.file_name)
             except FileNotFoundError as ex:
                 # Handle FileNotFoundError exceptions only if reglobbing is
                 # False, otherwise re-raise it
                 if self.reglob:
                     raise ex
 
-        self._first_call_to_changed_files = False
-
         return changed_files
@@ -0,0 +1,241 @@
+"""The :class:`.WatcherTable` class stores the state of a large number of stat
+based watchers compactly.
+
+Rather than creating a :class:`.Watcher` object for each file, the fields of
+each file's stat are stored in a column of an :class:`array.array`, with a
+row per file. This takes a few dozen bytes per file, rather than the hundreds
+taken by an object and its value.
+
+A :class:`.Watcher` can be stored in a table by listing the ``os.stat_result``
+fields that make up its value in :attr:`.Watcher.stat_fields`. As an example,
+the following code would create a table for the :class:`.ModificationTime`
+watcher and check a file twice.
+
+>>> table = WatcherTable(ModificationTime.stat_fields)
+>>> table.add('main.py')
+>>> table.check(range(len(table)))
+set()
+>>> table.check(range(len(table)))
+{'main.py'}
+
+As with the watchers, the first check of a file never reports a change.
+
+Fields that identify a file (i.e. its device and inode) can be stored along
+with its value, without a change to them counting as a change to the file, so
+that a removed file can be paired with the file it was renamed to.
+
+>>> table = WatcherTable(('st_mtime',), ('st_dev', 'st_ino'))
+>>> table.add('main.py')
+>>> table.check(range(len(table)))
+set()
+>>> table.get_identity(table.get_value('main.py'))
+(2049, 1234567)
+"""
+
+import os
+from array import array
+
+
+# The array type code used to store each stat field, any other field is
+# stored as a signed 64 bit integer
+_TYPE_CODES = {
+    'st_atime': 'd',
+    'st_mtime': 'd',
+    'st_ctime': 'd',
+    'st_ino': 'Q',
+    'st_dev': 'Q'
+}
+
+# The states of a row
+_UNCHECKED = 0
+_CHECKED = 1
+
+
+class WatcherTable:
+    """This class stores the stat fields of files in columns.
+
+    Files are added to and removed from the table by name, they're checked
+    by row number so that the rows can be split between threads.
+    """
+
+    def __init__(self, stat_fields, identity_fields=()):
+        """Initialise an empty :class:`.WatcherTable`.
+
+        Parameters:
+            stat_fields (tuple): The names of the ``os.stat_result`` fields
+                that make up the value of each file.
+            identity_fields (tuple): The names of the ``os.stat_result``
+                fields that identify each file, they're stored at the end of
+                its value but changes to them aren't reported.
+        """
+        self._stat_fields = tuple(stat_fields)
+        self._identity_fields = tuple(identity_fields)
+
+        self._file_names = []
+        self._rows = {}
+        self._states = bytearray()
+        self._columns = [
+            array(_TYPE_CODES.get(field, 'q'))
+            for field in self._stat_fields + self._identity_fields]
+
+    @property
+    def stat_fields(self):
+        """tuple: The names of the stat fields that are stored.
+        """
+        return self._stat_fields
+
+    @property
+    def identity_fields(self):
+        """tuple: The names of the stat fields that identify each file.
+        """
+        return self._identity_fields
+
+    def __len__(self):
+        return len(self._file_names)
+
+    def __contains__(self, file_name):
+        return file_name in self._rows
+
+    def add(self, file_name):
+        """Add a file to the table.
+
+        Parameters:
+            file_name (str): The file to add.
+        """
+        if file_name in self._rows:
+            return
+
+        self._rows[file_name] = len(self._file_names)
+        self._file_names.append(file_name)
+        self._states.append(_UNCHECKED)
+        for column in self._columns:
+            column.append(0)
+
+    def remove(self, file_name):
+        """Remove a file from the table.
+
+        The last row is moved into the removed file's row, so the order of
+        the rows isn't preserved.
+
+        Parameters:
+            file_name (str): The file to remove.
+        """
+        row = self._rows.pop(file_name)
+        last_row = len(self._file_names) - 1
+
+        if row != last_row:
+            moved_file_name = self._file_names[last_row]
+            self._file_names[row] = moved_file_name
+            self._rows[moved_file_name] = row
+            self._states[row] = self._states[last_row]
+            for column in self._columns:
+                column[row] = column[last_row]
+
+        self._file_names.pop()
+        self._states.pop()
+        for column in self._columns:
+            column.pop()
+
+    def get_value(self, file_name):
+        """Get the value of a file the last time it was checked.
+
+        Parameters:
+            file_name (str): The file.
+
+        Returns:
+            tuple: The stat fields of the file followed by its identity
+            fields, or ``None`` if it hasn't been checked yet.
+        """
+        row = self._rows[file_name]
+        if self._states[row] == _UNCHECKED:
+            return None
+
+        return tuple(column[row] for column in self._columns)
+
+    def get_identity(self, value):
+        """Get the identity of a file from its value.
+
+        Parameters:
+            value (tuple): The value of the file, as returned by
+                :meth:`get_value`.
+
+        Returns:
+            tuple: The identity fields of the file, or ``None`` if they
+            aren't stored (or weren't part of a value from a previous run).
+        """
+        if not self._identity_fields or not isinstance(value, tuple):
+            return None
+
+        identity = value[len(self._stat_fields):]
+        if len(identity) != len(self._identity_fields) or not any(identity):
+            return None
+
+        return identity
+
+    def restore(self, file_name, value):
+        """Restore the value of a file from a previous run.
+
+        The next check compares the file against this value, rather than
+        never reporting a change.
+
+        Parameters:
+            file_name (str): The file.
+            value (tuple): The value, as returned by :meth:`get_value`.
+        """
+        row = self._rows[file_name]
+        try:
+            for column, field in zip(self._columns, value):
+                column[row] = field
+        except (TypeError, OverflowError):
+            # The value isn't from a table with the same fields
+            return
+
+        self._states[row] = _CHECKED
+
+    def check(self, rows, ignore_missing=True):
+        """Check a range of rows for changes.
+
+        Parameters:
+            rows (range): The rows to check.
+            ignore_missing (bool): Whether to skip missing files rather than
+                raising an exception.
+
+        Raises:
+            FileNotFoundError: If a file is missing and ``ignore_missing`` is
+                False.
+
+        Returns:
+            set: A ``set`` of files that have changed.
+        """
+        changed_files = set()
+        file_names = self._file_names
+        states = self._states
+        columns = list(zip(self._columns, self._stat_fields))
+        identity_columns = list(zip(self._columns[len(self._stat_fields):],
+                                    self._identity_fields))
+
+        for row in rows:
+            file_name = file_names[row]
+            try:
+                stat = os.stat(file_name)
+            except FileNotFoundError:
+                if ignore_missing:
+                    continue
+                raise
+
+            changed = False
+            for column, field in columns:
+                value = getattr(stat, field)
+                if column[row] != value:
+                    column[row] = value
+                    changed = True
+
+            for column, field in identity_columns:
+                column[row] = getattr(stat, field)
+
+            if states[row] == _UNCHECKED:
+                states[row] = _CHECKED
+            elif changed:
+                changed_files.add(file_name)
+
+        return changed_files
@@ -7,10 +7,24 @@ implement core functionality.
 
 from .watcher import Watcher
 from .hash import MD5
+from .hash import SHA1
+from .hash import Blake2
+from .hash import CRC32
+from .hash import HybridMD5
+from .hash import HybridBlake2
 from .stat import ModificationTime
+from .stat import CompositeStat
+from .inotify import Inotify
 
 __all__ = [
     'Watcher',
     'MD5',
-    'ModificationTime'
+    'SHA1',
+    'Blake2',
+    'CRC32',
+    'HybridMD5',
+    'HybridBlake2',
+    'ModificationTime',
+    'CompositeStat',
+    'Inotify'
 ]
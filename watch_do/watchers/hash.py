@@ -1,33 +1,213 @@
 """Hash based watchers.
+
+The hashing itself is performed by a :class:`.Hasher`, each watcher selects
+the algorithm that is used. The ``Hybrid`` watchers only re-hash a file when
+its size, modification time or inode has changed.
+
+A :class:`.HashCache` can be shared by all of the hash based watchers using
+:func:`set_cache`, so files that haven't changed since they were last hashed
+(even by a previous run) don't have to be read again.
 """
 
-import hashlib
+import os
+import time
 
 from . import Watcher
+from ..hasher import Hasher
+
+
+# Files modified within this many seconds of being hashed are hashed again
+# next time, as further writes may not alter their modification time
+_RACY_WINDOW = 2
+
+
+def set_cache(cache):
+    """Set the cache shared by all of the hash based watchers.
+
+    Parameters:
+        cache (:class:`.HashCache`): The cache to use, or ``None`` to stop
+            using a cache.
+    """
+    _HashWatcher.cache = cache
+
+
+class _HashWatcher(Watcher):
+    """The base of the hash based watchers, hashing the file's contents with
+    the class's :attr:`hasher`.
+    """
+    __slots__ = ()
+
+    #: :class:`.Hasher`: The hasher used to hash the file's contents.
+    hasher = None
+
+    #: :class:`.HashCache`: The cache shared by all of the hash based
+    #: watchers, set using :func:`set_cache`.
+    cache = None
+
+    @classmethod
+    def get_identity(cls, value):
+        """Get the hash of a file from its value, renaming a file doesn't
+        change its contents.
+
+        Parameters:
+            value (str): The value of the file.
+
+        Returns:
+            str: The hash of the file.
+        """
+        return value
+
+    def _get_value(self):
+        """Get the current hash value of the file.
+
+        Raises:
+            FileNotFoundError: If the file could not be found.
+
+        Returns:
+            str: A string representation of the hash of the file.
+        """
+        return self._hash()
+
+    def _hash(self, stat=None):
+        """Hash the file, using the cache if there is one.
+
+        Parameters:
+            stat (os.stat_result): The current stat of the file, if it's
+                already known.
+
+        Raises:
+            FileNotFoundError: If the file could not be found.
+
+        Returns:
+            str: A string representation of the hash of the file.
+        """
+        cache = self.cache
+        if cache is None:
+            return self.hasher.hash_file(self.file_name)
+
+        if stat is None:
+            stat = os.stat(self.file_name)
+
+        digest = cache.get(stat, self.hasher.algorithm)
+        if digest is None:
+            digest = self.hasher.hash_file(self.file_name)
+
+            # Only cache the hash if the file wasn't changed while it was
+            # being hashed
+            after = os.stat(self.file_name)
+            if ((after.st_size, after.st_mtime_ns, after.st_ino) ==
+                    (stat.st_size, stat.st_mtime_ns, stat.st_ino)):
+                cache.put(self.file_name, stat, self.hasher.algorithm, digest)
 
+        return digest
 
-class MD5(Watcher):
+
+class MD5(_HashWatcher):
     """MD5 hash based change detection.
 
     This class uses MD5 hashes based on the files contents to enable change
     detection.
     """
+    __slots__ = ()
+
+    hasher = Hasher('md5')
+
+
+class SHA1(_HashWatcher):
+    """SHA-1 hash based change detection.
+
+    This class uses SHA-1 hashes based on the files contents to enable change
+    detection.
+    """
+    __slots__ = ()
+
+    hasher = Hasher('sha1')
+
+
+class Blake2(_HashWatcher):
+    """BLAKE2 hash based change detection.
+
+    This class uses BLAKE2b hashes based on the files contents to enable
+    change detection.
+    """
+    __slots__ = ()
+
+    hasher = Hasher('blake2b')
+
+
+class CRC32(_HashWatcher):
+    """CRC32 checksum based change detection.
+
+    This class uses CRC32 checksums based on the files contents to enable
+    change detection. It's the fastest of the content based watchers, but
+    isn't a cryptographic hash.
+    """
+    __slots__ = ()
+
+    hasher = Hasher('crc32')
+
+
+class _HybridHashWatcher(_HashWatcher):
+    """The base of the hash based watchers that only re-hash the file when its
+    size, modification time or inode has changed.
+    """
+    __slots__ = ('_stat', '_digest')
+
+    def __init__(self, file_name):
+        """Initialise the watcher.
+
+        Parameters:
+            file_name (str): The file path that the watcher should detect
+                changes for.
+        """
+        super(_HybridHashWatcher, self).__init__(file_name)
+
+        self._stat = None
+        self._digest = None
 
     def _get_value(self):
-        """Get the current MD5 hash value of the file.
+        """Get the hash of the file, re-hashing it only if its size,
+        modification time or inode has changed.
 
         Raises:
             FileNotFoundError: If the file could not be found.
 
         Returns:
-            str: A string representation of the MD5 hash of the file.
+            str: A string representation of the hash of the file.
         """
-        md5_hash = hashlib.md5()
+        stat = os.stat(self.file_name)
+        key = (stat.st_size, stat.st_mtime_ns, stat.st_ino)
+
+        if key != self._stat:
+            self._digest = self._hash(stat)
+            self._stat = key
+
+            # The file may be written to again without its modification time
+            # changing, so make sure it's hashed again next time
+            if stat.st_mtime_ns / 1e9 > time.time() - _RACY_WINDOW:
+                self._stat = None
 
-        with open(self.file_name, 'rb') as file_handle:
-            chunk = file_handle.read(4096)
-            while chunk:
-                md5_hash.update(chunk)
-                chunk = file_handle.read(4096)
+        return self._digest
+
+
+class HybridMD5(_HybridHashWatcher):
+    """MD5 hash based change detection with a stat based pre-filter.
+
+    The file's size, modification time and inode are checked first, the file
+    is only re-hashed if one of them has changed. Changes are still only
+    reported if the file's contents have changed, so touching a file won't
+    trigger the doers.
+    """
+    __slots__ = ()
+
+    hasher = MD5.hasher
+
+
+class HybridBlake2(_HybridHashWatcher):
+    """BLAKE2 hash based change detection with a stat based pre-filter.
+
+    This is the same as :class:`.HybridMD5`, using BLAKE2b hashes.
+    """
+    __slots__ = ()
 
-        return md5_hash.hexdigest()
+    hasher = Blake2.hasher
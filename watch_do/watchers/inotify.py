@@ -0,0 +1,228 @@
+"""Event based watchers.
+"""
+
+import os
+import errno
+import select
+import threading
+
+from . import Watcher
+from ..notifier import Notifier
+
+
+class _Registry:
+    """The state shared by all of the :class:`.Inotify` watchers.
+
+    Watchers are checked from several threads at once (see ``--workers``), so
+    the state is only accessed while holding :attr:`lock`.
+    """
+
+    def __init__(self):
+        self.lock = threading.RLock()
+        self.notifier = None
+        self.directories = {}
+        self.files = {}
+        self.unwatchable = set()
+        self.pending = set()
+        self.generation = 0
+
+    def get_notifier(self):
+        """Get the shared :class:`.Notifier`, creating it if required.
+
+        Returns:
+            :class:`.Notifier`: The notifier, or ``None`` if inotify isn't
+            available.
+        """
+        with self.lock:
+            if self.notifier is None:
+                try:
+                    self.notifier = Notifier()
+                except OSError:
+                    self.notifier = False
+
+            return self.notifier or None
+
+    def add(self, file_name, directory):
+        """Register a watched file and its directory.
+
+        Parameters:
+            file_name (str): The watched file.
+            directory (str): The directory containing the file.
+        """
+        with self.lock:
+            self.files[file_name] = self.files.get(file_name, 0) + 1
+            self.directories[directory] = (
+                self.directories.get(directory, 0) + 1)
+
+    def remove(self, file_name, directory):
+        """Unregister a watched file, no longer watching its directory if no
+        other files need it.
+
+        Parameters:
+            file_name (str): The watched file.
+            directory (str): The directory containing the file.
+        """
+        with self.lock:
+            count = self.files.pop(file_name, 1) - 1
+            if count:
+                self.files[file_name] = count
+            else:
+                self.pending.discard(file_name)
+
+            count = self.directories.pop(directory, 1) - 1
+            if count:
+                self.directories[directory] = count
+                return
+
+            notifier = self.get_notifier()
+            if notifier is not None and notifier.is_watching(directory):
+                notifier.remove_watch(directory)
+
+                # A watch descriptor has been freed, retry the polled
+                # directories
+                self.unwatchable.clear()
+
+    def watch(self, directory):
+        """Ensure that a directory is being watched.
+
+        Parameters:
+            directory (str): The directory to watch.
+
+        Returns:
+            bool: False if the directory can't be watched and its files have
+            to be polled.
+        """
+        with self.lock:
+            notifier = self.get_notifier()
+            if notifier is None or directory in self.unwatchable:
+                return False
+
+            if not notifier.is_watching(directory):
+                try:
+                    notifier.add_watch(directory)
+                except OSError as ex:
+                    # Only remember directories that can't be watched because
+                    # of the watch limit, missing directories may reappear
+                    if ex.errno in (errno.ENOSPC, errno.ENOMEM):
+                        self.unwatchable.add(directory)
+                    return False
+
+            return True
+
+    def take_pending(self, file_name):
+        """Check if the kernel has reported an event for a file since it was
+        last checked.
+
+        Parameters:
+            file_name (str): The watched file.
+
+        Returns:
+            tuple: A ``(pending, generation)`` tuple, where ``pending`` is
+            True if there was an event for the file and ``generation`` is
+            incremented whenever events are lost.
+        """
+        with self.lock:
+            pending = file_name in self.pending
+            self.pending.discard(file_name)
+
+            return pending, self.generation
+
+    def read_events(self, timeout):
+        """Wait for events and record the files they're for.
+
+        The lock isn't held while waiting, so files can still be checked.
+
+        Parameters:
+            timeout (float): The maximum time (in seconds) to wait.
+        """
+        notifier = self.get_notifier()
+        select.select([notifier], [], [], timeout)
+
+        with self.lock:
+            for path, _ in notifier.read_events(0):
+                if path is None:
+                    # Events were lost, every file has to be checked
+                    self.generation += 1
+                elif path in self.files:
+                    self.pending.add(path)
+
+
+class Inotify(Watcher):
+    """An inotify (kernel event) based watcher.
+
+    The directories containing the watched files are registered with a shared
+    :class:`.Notifier`, files are only checked (using their modification time)
+    when the kernel reports an event for them. This means that the cost of
+    checking for changes doesn't grow with the number of files being watched.
+
+    If inotify isn't available, or the watch descriptor limit has been
+    reached, the affected files fall back to being polled.
+
+    .. note::
+        Events are collected while :meth:`wait` is blocking, it should be
+        called between each check for changed files.
+    """
+
+    __slots__ = ('_directory', '_mtime', '_watched', '_seen_generation')
+
+    _registry = _Registry()
+
+    def __init__(self, file_name):
+        """Initialise the :class:`.Inotify` watcher.
+
+        Parameters:
+            file_name (str): The file path that the watcher should detect
+                changes for.
+        """
+        super(Inotify, self).__init__(file_name)
+
+        self._directory = os.path.dirname(file_name)
+        self._mtime = None
+        self._watched = False
+        self._seen_generation = Inotify._registry.generation
+
+        Inotify._registry.add(file_name, self._directory)
+
+    def close(self):
+        """Stop watching the file's directory if no other watchers need it.
+        """
+        Inotify._registry.remove(self.file_name, self._directory)
+
+    def _get_value(self):
+        """Get the modification time of the file.
+
+        The file is only stat'd if it's the first call, the kernel reported an
+        event for it or its directory couldn't be watched.
+
+        Raises:
+            FileNotFoundError: If the file could not be found.
+
+        Returns:
+            int: The modification time of the file in nanoseconds.
+        """
+        watched = Inotify._registry.watch(self._directory)
+        pending, generation = Inotify._registry.take_pending(self.file_name)
+
+        # Events could have been missed if the directory wasn't being watched
+        # last time, or if the kernel's event queue overflowed
+        if (pending or not watched or not self._watched or
+                self._seen_generation != generation):
+            self._seen_generation = generation
+            self._mtime = os.stat(self.file_name).st_mtime_ns
+
+        self._watched = watched
+
+        return self._mtime
+
+    @classmethod
+    def wait(cls, timeout):
+        """Block until the kernel reports a change or ``timeout`` elapses.
+
+        Parameters:
+            timeout (float): The maximum time (in seconds) to wait.
+        """
+        if Inotify._registry.get_notifier() is None:
+            super(Inotify, cls).wait(timeout)
+            return
+
+        Inotify._registry.read_events(timeout)
@@ -2,15 +2,28 @@
 """
 
 import os
+import time
 
 from . import Watcher
+from ..hasher import Hasher
+
+
+# Files modified within this many seconds of being checked are "racy", they
+# could be written to again without their stat changing
+_RACY_WINDOW = 2
 
 
 class ModificationTime(Watcher):
     """A modification time based watcher.
 
     This class uses the files modification time to enable change detection.
+    Its state is stored in a :class:`.WatcherTable` along with each file's
+    device and inode, which are used to pair up renamed files.
     """
+    __slots__ = ()
+
+    stat_fields = ('st_mtime',)
+    identity_fields = ('st_dev', 'st_ino')
 
     def _get_value(self):
         """Get the modification time of the file.
@@ -23,3 +36,78 @@ class ModificationTime(Watcher):
         """
         mtime = os.stat(self.file_name).st_mtime
         return str(mtime)
+
+
+class CompositeStat(Watcher):
+    """A watcher comparing the file's modification time and change time (in
+    nanoseconds), size, device and inode.
+
+    A file could be rewritten within the resolution of the file system's
+    timestamps without any of these changing. To catch this, the contents of
+    "racy" files (those modified just before being checked) are also
+    checksummed, the checksum is then compared until the file's stat changes.
+    """
+    __slots__ = ('_stat', '_checksum', '_racy')
+
+    hasher = Hasher('crc32')
+
+    def __init__(self, file_name):
+        """Initialise the watcher.
+
+        Parameters:
+            file_name (str): The file path that the watcher should detect
+                changes for.
+        """
+        super(CompositeStat, self).__init__(file_name)
+
+        self._stat = None
+        self._checksum = None
+        self._racy = False
+
+    @classmethod
+    def get_identity(cls, value):
+        """Get the device and inode of a file from its value, renaming a file
+        changes its change time but not its inode.
+
+        Parameters:
+            value (tuple): The value of the file.
+
+        Returns:
+            tuple: The device and inode of the file, or ``None`` if there's no
+            value.
+        """
+        if not value:
+            return None
+
+        return value[3:5]
+
+    def _get_value(self):
+        """Get the stat of the file, along with its checksum if it's racy.
+
+        Raises:
+            FileNotFoundError: If the file could not be found.
+
+        Returns:
+            tuple: The modification time and change time (in nanoseconds),
+            size, device, inode and either the checksum of the file or
+            ``None``.
+        """
+        check_time = time.time()
+        stat = os.stat(self.file_name)
+        key = (stat.st_mtime_ns, stat.st_ctime_ns, stat.st_size, stat.st_dev,
+               stat.st_ino)
+
+        is_racy = stat.st_mtime_ns / 1e9 > check_time - _RACY_WINDOW
+
+        # A file that was racy when last checked is checksummed again, as it
+        # could have been rewritten without its stat changing
+        if key != self._stat:
+            self._checksum = (self.hasher.hash_file(self.file_name)
+                              if is_racy else None)
+        elif self._racy:
+            self._checksum = self.hasher.hash_file(self.file_name)
+
+        self._stat = key
+        self._racy = is_racy
+
+        return key + (self._checksum,)
@@ -10,6 +10,7 @@ The watchers are typically created and managed by an instance of a
     :meth:`_get_value` can be instantiated.
 """
 
+import time
 from abc import ABCMeta
 from abc import abstractmethod
 
@@ -23,7 +24,26 @@ class Watcher(metaclass=ABCMeta):
     .. note::
         The file state is only checked when the :meth:`has_changed` method is
         called.
+
+    Watchers are created for every watched file, so they use ``__slots__``
+    to keep their size down. Subclasses should declare the ``__slots__`` for
+    any attributes they add.
     """
+    __slots__ = ('_file_name', '_last_value', '_first_call_to_has_changed')
+
+    #: tuple: The names of the ``os.stat_result`` fields that make up the
+    #: value of the file, if the value is based solely on them. A
+    #: :class:`.WatcherManager` stores the state of watchers that set this in
+    #: a :class:`.WatcherTable` rather than creating an object for each file.
+    #: It's only honoured on the class that sets it, not on its subclasses.
+    stat_fields = None
+
+    #: tuple: The names of the ``os.stat_result`` fields that identify the
+    #: file (i.e. ``st_dev`` and ``st_ino``). A :class:`.WatcherTable` stores
+    #: them along with :attr:`stat_fields`, so that renamed files can be
+    #: paired up. Like :attr:`stat_fields`, it's only honoured on the class
+    #: that sets it.
+    identity_fields = ()
 
     def __init__(self, file_name):
         """Initialise the :class:`.Watcher`.
@@ -43,12 +63,32 @@ class Watcher(metaclass=ABCMeta):
         """
         return self._file_name
 
+    @property
+    def last_value(self):
+        """The value of the file the last time it was checked, or ``None`` if
+        it hasn't been checked yet.
+        """
+        return self._last_value
+
+    def restore(self, value):
+        """Restore the value of the file from a previous run.
+
+        The next call to :meth:`has_changed` compares the file against this
+        value, rather than always returning False.
+
+        Parameters:
+            value: The value, as returned by :attr:`last_value`.
+        """
+        self._last_value = value
+        self._first_call_to_has_changed = False
+
     def has_changed(self):
         """Determine if the file has changed since the last call to this
         method.
 
         .. warning::
-            The first call to this method will **always** return False.
+            The first call to this method will **always** return False, unless
+            a previous value was restored using :meth:`restore`.
 
         Returns:
             bool: A boolean, indicating if the watched file has changed.
@@ -66,6 +106,44 @@ class Watcher(metaclass=ABCMeta):
 
         return changed
 
+    @classmethod
+    def get_identity(cls, value):  # pylint: disable=unused-argument
+        """Get a value identifying a file from its value, so that a removed
+        file can be paired with a created one when it has been renamed.
+
+        The base implementation can't identify files, so renames are reported
+        as a removed and a created file. Watchers whose value identifies a
+        file (i.e. by its hash or inode) should override this, a value that
+        other files could share (i.e. a modification time) mustn't be used.
+
+        Parameters:
+            value: The value of the file, as returned by :attr:`last_value`.
+
+        Returns:
+            object: A hashable value identifying the file, or ``None`` if it
+            can't be identified.
+        """
+        return None
+
+    def close(self):
+        """Release any resources held by the watcher.
+
+        This is called when the file is no longer being watched. The base
+        implementation doesn't hold any resources so does nothing.
+        """
+
+    @classmethod
+    def wait(cls, timeout):
+        """Block until the watched files should next be checked.
+
+        The base implementation simply sleeps for ``timeout`` seconds, event
+        driven watchers may return as soon as a change is reported.
+
+        Parameters:
+            timeout (float): The maximum time (in seconds) to wait.
+        """
+        time.sleep(timeout)
+
     @abstractmethod
     def _get_value(self):
         """Get the current value of the watched file.